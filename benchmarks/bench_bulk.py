@@ -0,0 +1,48 @@
+"""Compares one-at-a-time calls with the bulk APIs for a nightly-import sized batch.
+
+Run from the repository root:
+    python -m benchmarks.bench_bulk [row count]
+"""
+import datetime
+import sys
+import time
+
+from data_model import FitnessManagementSystem, MEMBERSHIP_TYPE, FITNESS_GOAL, SPECIALIZATION
+
+
+def timed(label, count, action):
+    started = time.perf_counter()
+    action()
+    elapsed = time.perf_counter() - started
+    print(f"  {label:<28} {count / elapsed:12.0f} rows/s")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    start = datetime.datetime(2025, 1, 1)
+    member_rows = [(f"Member {i}", 18 + i % 60, MEMBERSHIP_TYPE(i % 3 + 1), FITNESS_GOAL(i % 3 + 1))
+                   for i in range(count)]
+    class_times = [start + datetime.timedelta(minutes=(i * 7919) % (count * 10)) for i in range(count)]
+
+    for label, bulk in (("single", False), ("bulk", True)):
+        print(f"{label} ({count} rows):")
+        fms = FitnessManagementSystem()
+        trainer = fms.add_trainer("Trainer", SPECIALIZATION.CARDIO)
+        if bulk:
+            timed("register_members", count, lambda: fms.register_members(member_rows))
+            members = list(fms.members.values())
+            timed("schedule_classes", count,
+                  lambda: fms.schedule_classes(("Class", trainer, 30, when) for when in class_times))
+            timed("process_payments", count,
+                  lambda: fms.process_payments((m, 25, MEMBERSHIP_TYPE.BASIC, start) for m in members))
+        else:
+            timed("register_member", count, lambda: [fms.register_member(*row) for row in member_rows])
+            members = list(fms.members.values())
+            timed("schedule_class", count, lambda: [fms.schedule_class("Class", trainer, 30, when)
+                                                    for when in class_times])
+            timed("process_payment", count, lambda: [fms.process_payment(m, 25, MEMBERSHIP_TYPE.BASIC, start)
+                                                     for m in members])
+
+
+if __name__ == "__main__":
+    main()
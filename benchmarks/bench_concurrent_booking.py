@@ -0,0 +1,67 @@
+"""Multi-threaded booking stress test: throughput and capacity violations.
+
+Hundreds of clients hit one popular class the moment it opens, then the same
+clients book spread across many classes.
+
+Run from the repository root:
+    python -m benchmarks.bench_concurrent_booking
+"""
+import datetime
+import sys
+import threading
+import time
+
+from data_model import FitnessManagementSystem, MEMBERSHIP_TYPE, FITNESS_GOAL, SPECIALIZATION
+
+CLIENTS = 400
+CAPACITY = 30
+CLASSES = 2_000
+BOOKINGS_PER_CLIENT = 200
+
+
+def run_clients(target, clients):
+    barrier = threading.Barrier(len(clients))
+
+    def client(member):
+        barrier.wait()
+        target(member)
+
+    threads = [threading.Thread(target=client, args=(m,)) for m in clients]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return time.perf_counter() - started
+
+
+def main():
+    sys.setswitchinterval(1e-5)
+    fms = FitnessManagementSystem()
+    trainer = fms.add_trainer("Trainer", SPECIALIZATION.CARDIO)
+    start = datetime.datetime(2025, 1, 1, 7)
+    popular = fms.schedule_class("Popular", trainer, CAPACITY, start - datetime.timedelta(hours=1))
+    classes = [fms.schedule_class(f"Class {i}", trainer, CAPACITY, start + datetime.timedelta(hours=i))
+               for i in range(CLASSES)]
+    members = [fms.register_member(f"Member {i}", 30, MEMBERSHIP_TYPE.BASIC, FITNESS_GOAL.ENDURANCE)
+               for i in range(CLIENTS)]
+
+    elapsed = run_clients(popular.enroll_member, members)
+    print(f"popular class: {CLIENTS} clients, {popular.CurrentEnrollments}/{CAPACITY} booked, "
+          f"{elapsed * 1000:.1f} ms")
+
+    def book_many(member):
+        for k in range(BOOKINGS_PER_CLIENT):
+            classes[(member.ID * 7 + k) % CLASSES].enroll_member(member)
+
+    elapsed = run_clients(book_many, members)
+    attempts = CLIENTS * BOOKINGS_PER_CLIENT
+    violations = sum(1 for cl in classes + [popular] if cl.CurrentEnrollments > cl.Capacity)
+    indexed = sum(len(m.ClassBooking) for m in members)
+    booked = sum(cl.CurrentEnrollments for cl in classes + [popular])
+    print(f"spread bookings: {attempts / elapsed:10.0f} attempts/s, capacity violations: {violations}, "
+          f"index consistent: {indexed == booked}")
+
+
+if __name__ == "__main__":
+    main()
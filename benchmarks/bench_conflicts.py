@@ -0,0 +1,71 @@
+"""Trainer conflict detection: per-trainer interval index vs. pairwise comparison.
+
+Times the O(log n) check done on every schedule/assign, and a whole-timetable
+conflict report against the naive all-pairs scan.
+
+Run from the repository root:
+    python -m benchmarks.bench_conflicts
+"""
+import datetime
+import random
+import time
+
+from data_model import FitnessManagementSystem, FitnessClass, SPECIALIZATION
+
+TRAINERS = 50
+CLASS_COUNTS = (1_000, 10_000, 50_000)
+START = datetime.datetime(2025, 1, 1)
+
+
+def build(count: int):
+    """Attaches classes without checks (as loading old data does), with a few overlaps."""
+    rng = random.Random(count)
+    fms = FitnessManagementSystem()
+    trainers = [fms.add_trainer(f"Trainer {i}", SPECIALIZATION.CARDIO) for i in range(TRAINERS)]
+    for i in range(count):
+        start = START + datetime.timedelta(hours=2 * (i // TRAINERS), minutes=rng.choice((0, 0, 0, 0, 90)))
+        fms.attach_class(FitnessClass(fms, f"Class {i}", trainers[i % TRAINERS], 20, start,
+                                      duration=datetime.timedelta(hours=1)))
+    return fms, trainers
+
+
+def pairwise(fms):
+    classes = list(fms.classes.values())
+    conflicts = []
+    for i, a in enumerate(classes):
+        for b in classes[i + 1:]:
+            if a.trainer == b.trainer and a.Slot[0] < b.Slot[1] and b.Slot[0] < a.Slot[1]:
+                conflicts.append((a, b))
+    return conflicts
+
+
+def run(count: int):
+    fms, trainers = build(count)
+
+    checks = 10_000
+    started = time.perf_counter()
+    for i in range(checks):
+        fms.trainer_conflict(trainers[i % TRAINERS], START + datetime.timedelta(minutes=37 * i),
+                             datetime.timedelta(hours=1))
+    check = (time.perf_counter() - started) / checks
+
+    started = time.perf_counter()
+    found = fms.schedule_conflicts()
+    indexed = time.perf_counter() - started
+
+    line = (f"{count:>7} classes: check {check * 1e6:6.2f} us, report {indexed * 1e3:8.2f} ms "
+            f"({len(found)} conflicts)")
+    if count <= 10_000:
+        started = time.perf_counter()
+        naive = pairwise(fms)
+        line += f", pairwise {(time.perf_counter() - started) * 1e3:9.2f} ms ({len(naive)} conflicts)"
+    print(line)
+
+
+def main():
+    for count in CLASS_COUNTS:
+        run(count)
+
+
+if __name__ == "__main__":
+    main()
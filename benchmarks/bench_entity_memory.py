@@ -0,0 +1,108 @@
+"""Reports bytes per entity for the slotted entities against the previous __dict__-based layout.
+
+Measures Member, Trainer, FitnessClass and Transaction, each next to a
+replica of its pre-__slots__ layout built with the same arguments.
+
+Run from the repository root:
+    python -m benchmarks.bench_entity_memory [count per entity]
+"""
+import datetime
+import sys
+import time
+import tracemalloc
+
+from data_model import (FitnessManagementSystem, Member, Trainer, FitnessClass, Transaction, MEMBERSHIP_TYPE,
+                        FITNESS_GOAL, SPECIALIZATION)
+from id_generator import next_id
+
+SCHEDULE = datetime.datetime(2025, 6, 2, 9)
+DURATION = datetime.timedelta(minutes=45)
+
+
+class DictMember:
+    """Replica of the pre-__slots__ Member layout: every attribute in a per-instance __dict__."""
+    def __init__(self, fms, name, age, membership_type, fitness_goals):
+        self.uuid = next_id()
+        self.fms = fms
+        self.name = name
+        self.age = age
+        self.membership_type = membership_type
+        self.fitness_goals = fitness_goals
+        self.progresses = {}
+        self.measurements = None
+
+
+class DictTrainer:
+    """Replica of the pre-__slots__ Trainer layout."""
+    def __init__(self, fms, name, specialization):
+        self.uuid = next_id()
+        self.fms = fms
+        self.name = name
+        self.specialization = specialization
+
+
+class DictFitnessClass:
+    """Replica of the pre-__slots__ FitnessClass layout."""
+    def __init__(self, fms, name, trainer, capacity, schedule, duration=datetime.timedelta(0)):
+        self.uuid = next_id()
+        self.fms = fms
+        self.name = name
+        self.trainer = trainer
+        self.capacity = capacity
+        self.schedule = schedule
+        self.duration = duration
+        self.members = set()
+
+
+class DictTransaction:
+    """Replica of the pre-__slots__ Transaction layout."""
+    def __init__(self, fms, member, amount_paid, payment_date, membership_type):
+        self.uuid = next_id()
+        self.fms = fms
+        self.member = member
+        self.amount_paid = amount_paid
+        self.payment_date = payment_date
+        self.membership_type = membership_type
+
+
+def entity_kinds(fms):
+    """(entity, __dict__ replica, slotted class, make(cls, name)) for every measured entity."""
+    member = Member(fms, "Ali", 30, MEMBERSHIP_TYPE.BASIC, FITNESS_GOAL.ENDURANCE)
+    trainer = Trainer(fms, "Lena", SPECIALIZATION.YOGA)
+    return [
+        ("Member", DictMember, Member,
+         lambda cls, name: cls(fms, name, 30, MEMBERSHIP_TYPE.BASIC, FITNESS_GOAL.ENDURANCE)),
+        ("Trainer", DictTrainer, Trainer, lambda cls, name: cls(fms, name, SPECIALIZATION.YOGA)),
+        ("FitnessClass", DictFitnessClass, FitnessClass,
+         lambda cls, name: cls(fms, name, trainer, 20, SCHEDULE, duration=DURATION)),
+        ("Transaction", DictTransaction, Transaction,
+         lambda cls, name: cls(fms, member, 49.5, SCHEDULE, MEMBERSHIP_TYPE.BASIC)),
+    ]
+
+
+def measure(make, entity_cls, count):
+    names = [f"Entity {i}" for i in range(count)]
+    tracemalloc.start()
+    started = time.perf_counter()
+    entities = {}
+    for name in names:
+        entity = make(entity_cls, name)
+        entities[entity.uuid] = entity
+    elapsed = time.perf_counter() - started
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size / count, elapsed
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    fms = FitnessManagementSystem()
+    for entity, dict_cls, slotted_cls, make in entity_kinds(fms):
+        print(f"{entity} ({count} each):")
+        for label, entity_cls in (("__dict__ layout", dict_cls), ("__slots__ layout", slotted_cls)):
+            per_entity, elapsed = measure(make, entity_cls, count)
+            print(f"  {label:>16}: {per_entity:7.1f} bytes/entity, load {elapsed:6.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Measures journaled payment throughput and recovery time against journal length.
+
+Run from the repository root:
+    python -m benchmarks.bench_journal
+"""
+import os
+import tempfile
+import time
+
+from data_model import MEMBERSHIP_TYPE, FITNESS_GOAL
+from storage import SQLiteBackend
+from journal import Journal, DurableStore
+
+LOG_LENGTHS = (10_000, 100_000, 500_000)
+MEMBER_COUNT = 1_000
+
+
+def open_store(directory: str, group_size: int):
+    return DurableStore(SQLiteBackend(os.path.join(directory, "fms.db")),
+                        Journal(os.path.join(directory, "fms.journal"), group_size=group_size))
+
+
+def run(log_length: int, group_size: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        store = open_store(tmp, group_size)
+        fms = store.recover()
+        members = [fms.register_member(f"Member {i}", 30, MEMBERSHIP_TYPE.BASIC, FITNESS_GOAL.ENDURANCE)
+                   for i in range(MEMBER_COUNT)]
+
+        started = time.perf_counter()
+        for i in range(log_length - MEMBER_COUNT):
+            fms.process_payment(members[i % MEMBER_COUNT], 25, MEMBERSHIP_TYPE.BASIC)
+        store.journal.sync()
+        write_rate = (log_length - MEMBER_COUNT) / (time.perf_counter() - started)
+        store.close()
+
+        store = open_store(tmp, group_size)
+        started = time.perf_counter()
+        restored = store.recover()
+        recovery = time.perf_counter() - started
+        store.close()
+
+    print(f"{log_length:>8} records  group {group_size:>4}  payments {write_rate:10.0f}/s  "
+          f"recovery {recovery:6.2f} s ({len(restored.transatcions)} transactions)")
+
+
+def main():
+    for log_length in LOG_LENGTHS:
+        run(log_length, group_size=256)
+    run(LOG_LENGTHS[0], group_size=1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Compares memory per transaction of a dict of Transaction objects and the columnar TransactionLedger.
+
+Run from the repository root:
+    python -m benchmarks.bench_ledger_memory [transaction count]
+"""
+import datetime
+import sys
+import time
+import tracemalloc
+
+from data_model import FitnessManagementSystem, Transaction, TransactionLedger, MEMBERSHIP_TYPE, FITNESS_GOAL
+
+MEMBER_COUNT = 1_000
+
+
+def measure(build):
+    tracemalloc.start()
+    started = time.perf_counter()
+    store = build()
+    elapsed = time.perf_counter() - started
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return store, size, elapsed
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    fms = FitnessManagementSystem()
+    members = [fms.register_member(f"Member {i}", 30, MEMBERSHIP_TYPE.BASIC, FITNESS_GOAL.ENDURANCE)
+               for i in range(MEMBER_COUNT)]
+    start = datetime.datetime(2020, 1, 1)
+
+    def rows():
+        for i in range(count):
+            yield (members[i % MEMBER_COUNT], 10 + i % 90, start + datetime.timedelta(minutes=i),
+                   MEMBERSHIP_TYPE(i % 3 + 1))
+
+    def build_objects():
+        store = {}
+        for member, amount, date, mem_type in rows():
+            txn = Transaction(fms, member, amount, date, mem_type)
+            store[txn.ID] = txn
+        return store
+
+    def build_ledger():
+        ledger = TransactionLedger(fms)
+        for member, amount, date, mem_type in rows():
+            txn = Transaction(fms, member, amount, date, mem_type)
+            ledger.append(txn)
+        return ledger
+
+    objects, objects_size, _ = measure(build_objects)
+    ledger, ledger_size, _ = measure(build_ledger)
+    print(f"{count} transactions")
+    print(f"  dict of objects: {objects_size / count:8.1f} bytes/transaction")
+    print(f"  columnar ledger: {ledger_size / count:8.1f} bytes/transaction")
+
+    started = time.perf_counter()
+    ledger.revenue_by_type()
+    ledger.revenue_by_month()
+    ledger.top_payers(10)
+    print(f"  column reports:  {time.perf_counter() - started:8.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Times Member.ClassBooking and cancel_membership while the class count grows.
+
+Run from the repository root:
+    python -m benchmarks.bench_member_bookings
+"""
+import datetime
+import time
+
+from data_model import FitnessManagementSystem, MEMBERSHIP_TYPE, FITNESS_GOAL, SPECIALIZATION
+
+CLASS_COUNTS = (1_000, 10_000, 100_000)
+BOOKINGS_PER_MEMBER = 10
+REPEATS = 1_000
+
+
+def build_system(class_count: int):
+    fms = FitnessManagementSystem()
+    trainer = fms.add_trainer("Trainer", SPECIALIZATION.YOGA)
+    start = datetime.datetime(2025, 1, 1, 7, 0)
+    classes = [fms.schedule_class(f"Class {i}", trainer, 30, start + datetime.timedelta(hours=i))
+               for i in range(class_count)]
+    return fms, classes
+
+
+def run(class_count: int):
+    fms, classes = build_system(class_count)
+    step = max(1, class_count // BOOKINGS_PER_MEMBER)
+    members = []
+    for i in range(REPEATS):
+        member = fms.register_member(f"Member {i}", 30, MEMBERSHIP_TYPE.BASIC, FITNESS_GOAL.ENDURANCE)
+        for k in range(BOOKINGS_PER_MEMBER):
+            member.book_class(classes[(i + k * step) % class_count])
+        members.append(member)
+
+    started = time.perf_counter()
+    for member in members:
+        member.ClassBooking
+    booking_us = (time.perf_counter() - started) / REPEATS * 1e6
+
+    started = time.perf_counter()
+    for member in members:
+        fms.cancel_membership(member)
+    cancel_us = (time.perf_counter() - started) / REPEATS * 1e6
+
+    print(f"{class_count:>8} classes  ClassBooking {booking_us:8.2f} us  cancel_membership {cancel_us:8.2f} us")
+
+
+def main():
+    for class_count in CLASS_COUNTS:
+        run(class_count)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""First-page latency and peak memory of member listing: view_members() copy vs. keyset pages.
+
+Run from the repository root:
+    python -m benchmarks.bench_member_pages [member count]
+"""
+import sys
+import time
+import tracemalloc
+
+from data_model import FitnessManagementSystem, MEMBERSHIP_TYPE, FITNESS_GOAL
+
+PAGE = 20
+
+
+def measure(label, listing):
+    tracemalloc.start()
+    started = time.perf_counter()
+    listing()
+    elapsed = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"{label:>28}: {elapsed * 1e3:9.3f} ms, peak {peak / 1024:9.1f} KiB")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    fms = FitnessManagementSystem()
+    fms.register_members((f"Member {i}", 20 + i % 50, MEMBERSHIP_TYPE(i % 3 + 1), FITNESS_GOAL.ENDURANCE)
+                         for i in range(count))
+    middle = fms.member_index.ids[count // 2]
+    vip = fms.query_members().of_type(MEMBERSHIP_TYPE.VIP)
+
+    print(f"{count} members, pages of {PAGE}:")
+    measure("view_members()[:page]", lambda: fms.view_members()[:PAGE])
+    measure("members_page, first", lambda: fms.members_page(PAGE))
+    measure("members_page, mid-list", lambda: fms.members_page(PAGE, middle))
+    measure("members_page, VIP filter", lambda: fms.members_page(PAGE, middle, vip))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Member search through the secondary indexes vs. a full scan of view_members().
+
+Run from the repository root:
+    python -m benchmarks.bench_member_query [member count]
+"""
+import random
+import sys
+import time
+
+from data_model import FitnessManagementSystem, MEMBERSHIP_TYPE, FITNESS_GOAL
+
+NAMES = ("Ali", "Sara", "John", "Kate", "Omar", "Lena", "Tom", "Mia", "Yusuf", "Nora")
+REPEAT = 20
+
+
+def timed(query):
+    started = time.perf_counter()
+    for _ in range(REPEAT):
+        found = query()
+    return (time.perf_counter() - started) / REPEAT, len(found)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    rng = random.Random(7)
+    fms = FitnessManagementSystem()
+    started = time.perf_counter()
+    fms.register_members((f"{rng.choice(NAMES)} {i}", rng.randrange(16, 80), MEMBERSHIP_TYPE(rng.randrange(1, 4)),
+                          FITNESS_GOAL(rng.randrange(1, 4))) for i in range(count))
+    print(f"Registered and indexed {count} members in {time.perf_counter() - started:.2f} s")
+
+    cases = {
+        "VIP, ENDURANCE, 30-40": (
+            lambda: fms.query_members().of_type(MEMBERSHIP_TYPE.VIP).with_goal(FITNESS_GOAL.ENDURANCE)
+                    .aged(30, 40).ids(),
+            lambda: [m.ID for m in fms.view_members() if m.MembershipType == MEMBERSHIP_TYPE.VIP
+                     and m.FitnessGoals == FITNESS_GOAL.ENDURANCE and 30 <= m.Age <= 40]),
+        "name prefix 'yusuf 12'": (
+            lambda: fms.query_members().named("yusuf 12").ids(),
+            lambda: [m.ID for m in fms.view_members() if m.Name.casefold().startswith("yusuf 12")]),
+        "age 77": (
+            lambda: fms.query_members().aged(77, 77).ids(),
+            lambda: [m.ID for m in fms.view_members() if m.Age == 77]),
+    }
+    for label, (indexed, scan) in cases.items():
+        (indexed_time, found), (scan_time, scanned) = timed(indexed), timed(scan)
+        assert found == scanned
+        print(f"{label:>24}: {found:>6} found, index {indexed_time * 1e3:8.3f} ms, scan {scan_time * 1e3:8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""Cost of the instrumentation: hot paths on a plain system versus an instrumented one.
+
+Run from the repository root:
+    python -m benchmarks.bench_metrics [operation count]
+"""
+import datetime
+import sys
+import time
+
+from data_model import FitnessManagementSystem, MEMBERSHIP_TYPE, FITNESS_GOAL, SPECIALIZATION
+from metrics import instrument, uninstrument
+
+
+def workload(fms: FitnessManagementSystem, count: int) -> float:
+    trainer = fms.add_trainer("Trainer", SPECIALIZATION.YOGA)
+    start = datetime.datetime(2025, 1, 1, 7)
+    classes = [fms.schedule_class(f"Class {i}", trainer, 20, start + datetime.timedelta(hours=i))
+               for i in range(count // 10 or 1)]
+    started = time.perf_counter()
+    for i in range(count):
+        member = fms.register_member(f"Member {i}", 30, MEMBERSHIP_TYPE.BASIC, FITNESS_GOAL.ENDURANCE)
+        classes[i % len(classes)].enroll_member(member)
+        fms.process_payment(member, 25, MEMBERSHIP_TYPE.BASIC, start)
+    return (time.perf_counter() - started) / count * 1e6
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    plain = workload(FitnessManagementSystem(), count)
+
+    fms = FitnessManagementSystem()
+    instrument(fms)
+    measured = workload(fms, count)
+
+    fms = FitnessManagementSystem()
+    instrument(fms)
+    uninstrument(fms)
+    detached = workload(fms, count)
+
+    print(f"{count} x (register, book, pay):")
+    print(f"  never instrumented: {plain:8.2f}us")
+    print(f"  instrumented:       {measured:8.2f}us ({measured / plain - 1:+.1%})")
+    print(f"  uninstrumented:     {detached:8.2f}us ({detached / plain - 1:+.1%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Automatic trainer assignment over a synthetic multi-site month.
+
+Run from the repository root:
+    python -m benchmarks.bench_optimizer
+"""
+import datetime
+import random
+import time
+
+from data_model import FitnessManagementSystem, SPECIALIZATION
+from optimizer import assign_trainers
+
+SITES = (1, 5, 10)
+TRAINERS_PER_SITE = 12
+CLASSES_PER_DAY = 30    # per site
+DAYS = 30
+START = datetime.datetime(2025, 6, 1)
+NAMES = {SPECIALIZATION.YOGA: "Yoga", SPECIALIZATION.CARDIO: "Cardio Blast",
+         SPECIALIZATION.STRENGTH_TRAINING: "Strength Training"}
+
+
+def run(sites: int):
+    rng = random.Random(sites)
+    fms = FitnessManagementSystem()
+    availability = {}
+    for i in range(sites * TRAINERS_PER_SITE):
+        trainer = fms.add_trainer(f"Trainer {i}", SPECIALIZATION(i % 3 + 1))
+        # Each trainer works one of two shifts every day.
+        shift = (6, 15) if i % 2 else (12, 22)
+        availability[trainer.ID] = [(START + datetime.timedelta(days=day, hours=shift[0]),
+                                     START + datetime.timedelta(days=day, hours=shift[1])) for day in range(DAYS)]
+    rows = []
+    for _ in range(sites):
+        for day in range(DAYS):
+            for _ in range(CLASSES_PER_DAY):
+                start = START + datetime.timedelta(days=day, hours=rng.randrange(6, 21), minutes=rng.choice((0, 30)))
+                rows.append((NAMES[SPECIALIZATION(rng.randrange(1, 4))], None, 20, start,
+                             datetime.timedelta(minutes=rng.choice((45, 60, 90)))))
+    fms.schedule_classes(rows)
+
+    started = time.perf_counter()
+    plan = assign_trainers(fms, availability=availability)
+    elapsed = time.perf_counter() - started
+    loads = [load.total_seconds() / 3600 for load in plan.load.values()]
+    print(f"{sites:>3} sites, {len(rows):>6} classes, {len(fms.trainers):>4} trainers: {elapsed:6.2f} s, "
+          f"{len(plan.assignments)} assigned, {len(plan.unassigned)} unassigned, "
+          f"hours per trainer {min(loads):.1f}-{max(loads):.1f}, conflicts {len(fms.schedule_conflicts())}")
+
+
+def main():
+    for sites in SITES:
+        run(sites)
+
+
+if __name__ == "__main__":
+    main()
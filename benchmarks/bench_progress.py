@@ -0,0 +1,68 @@
+"""Memory and trend-query cost of years of daily weigh-ins: free-form track_progress vs. typed measurements.
+
+Run from the repository root:
+    python -m benchmarks.bench_progress
+"""
+import datetime
+import time
+import tracemalloc
+
+from data_model import FitnessManagementSystem, MEMBERSHIP_TYPE, FITNESS_GOAL, METRIC
+
+YEARS = (1, 3, 10)
+START = datetime.datetime(2015, 1, 5, 7)
+
+
+def log_days(member, days: int, typed: bool):
+    for day in range(days):
+        at = START + datetime.timedelta(days=day)
+        weight = 90 - day / 500
+        if typed:
+            member.record_measurement(METRIC.WEIGHT, weight, at)
+        else:
+            member.track_progress({"date": at, "weight": weight}, FITNESS_GOAL.WEIGHT_LOSS)
+
+
+def weekly_trend(logs, start, end):
+    """What charting free-form logs takes: scan every entry and group by week."""
+    weeks = {}
+    for entry in logs:
+        if start <= entry["date"] < end:
+            weeks.setdefault((entry["date"] - start).days // 7, []).append(entry["weight"])
+    return [sum(values) / len(values) for _, values in sorted(weeks.items())]
+
+
+def run(years: int):
+    days = 365 * years
+    fms = FitnessManagementSystem()
+    results = {}
+    for typed in (False, True):
+        member = fms.register_member("Member", 40, MEMBERSHIP_TYPE.BASIC, FITNESS_GOAL.WEIGHT_LOSS)
+        tracemalloc.start()
+        log_days(member, days, typed)
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        # Chart the last quarter.
+        end = START + datetime.timedelta(days=days)
+        start = end - datetime.timedelta(weeks=13)
+        started = time.perf_counter()
+        for _ in range(100):
+            if typed:
+                member.Measurements[METRIC.WEIGHT].trend(start, end)
+            else:
+                weekly_trend(member.progresses[FITNESS_GOAL.WEIGHT_LOSS], start, end)
+        results[typed] = (size, (time.perf_counter() - started) / 100)
+
+    (raw_size, raw_query), (typed_size, typed_query) = results[False], results[True]
+    print(f"{years:>3} years ({days} logs): free-form {raw_size / 1024:8.1f} KiB, {raw_query * 1e3:6.3f} ms/trend; "
+          f"typed {typed_size / 1024:6.1f} KiB, {typed_query * 1e3:6.3f} ms/trend")
+
+
+def main():
+    for years in YEARS:
+        run(years)
+
+
+if __name__ == "__main__":
+    main()
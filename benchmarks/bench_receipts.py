@@ -0,0 +1,57 @@
+"""Receipts per second on a million-transaction ledger.
+
+Compares materializing each Transaction and calling generate_receipt(), the
+batch generator over the ledger columns, and repeated lookups served by the
+receipt LRU cache.
+
+Run from the repository root:
+    python -m benchmarks.bench_receipts [transaction count]
+"""
+import datetime
+import io
+import sys
+import time
+
+from data_model import FitnessManagementSystem, MEMBERSHIP_TYPE, FITNESS_GOAL
+from transfer import write_receipts
+
+MEMBERS = 10_000
+START = datetime.datetime(2024, 1, 1)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    fms = FitnessManagementSystem()
+    members = [fms.members[uuid] for uuid in fms.register_members(
+        (f"Member {i}", 30, MEMBERSHIP_TYPE(i % 3 + 1), FITNESS_GOAL.ENDURANCE) for i in range(MEMBERS)).ids]
+    fms.process_payments((members[i % MEMBERS], 20 + i % 80 + (i % 2) / 2, MEMBERSHIP_TYPE(i % 3 + 1),
+                          START + datetime.timedelta(minutes=i)) for i in range(count))
+    ledger = fms.transatcions
+
+    sample = min(count, 200_000)
+    started = time.perf_counter()
+    for uuid in ledger.uuids[:sample]:
+        ledger[uuid].generate_receipt()
+    per_object = sample / (time.perf_counter() - started)
+
+    started = time.perf_counter()
+    written = write_receipts(fms, io.StringIO())
+    batch = written / (time.perf_counter() - started)
+
+    hot = ledger.uuids[:ledger.receipt_cache_size]
+    for uuid in hot:
+        ledger.receipt(uuid)
+    started = time.perf_counter()
+    for _ in range(10):
+        for uuid in hot:
+            ledger.receipt(uuid)
+    cached = 10 * len(hot) / (time.perf_counter() - started)
+
+    print(f"{count} transactions:")
+    print(f"  Transaction.generate_receipt: {per_object:>10,.0f} receipts/s")
+    print(f"  batch write_receipts:         {batch:>10,.0f} receipts/s ({written} written)")
+    print(f"  cached ledger.receipt:        {cached:>10,.0f} receipts/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Analytics report time on a synthetic ledger, serial versus a process pool.
+
+The ledger columns are filled directly, as storage.load does, so building a
+10-million-row dataset does not dominate the run.
+
+Run from the repository root:
+    python -m benchmarks.bench_reports [transaction count]
+"""
+import datetime
+import multiprocessing
+import random
+import sys
+import time
+
+from data_model import (FitnessManagementSystem, MEMBERSHIP_TYPE, FITNESS_GOAL, SPECIALIZATION,
+                        to_epoch_us, US_PER_DAY)
+from reports import analytics_report
+
+MEMBERS = 100_000
+TRAINERS = 200
+CLASSES = 20_000
+START = datetime.datetime(2023, 1, 1)
+
+
+def build(count: int) -> FitnessManagementSystem:
+    rng = random.Random(23)
+    fms = FitnessManagementSystem()
+    ids = fms.register_members((f"Member {i}", 18 + i % 60, MEMBERSHIP_TYPE(i % 3 + 1), FITNESS_GOAL(i % 3 + 1))
+                               for i in range(MEMBERS)).ids
+    members = [fms.members[uuid] for uuid in ids]
+    trainers = [fms.add_trainer(f"Trainer {i}", SPECIALIZATION(i % 3 + 1)) for i in range(TRAINERS)]
+    fms.schedule_classes((f"Class {i}", trainers[i % TRAINERS], 20, START + datetime.timedelta(hours=i))
+                         for i in range(CLASSES))
+    for cls in fms.classes.values():
+        for member in rng.sample(members, rng.randrange(21)):
+            cls.enroll_member(member)
+
+    ledger = fms.transatcions
+    for member in members:
+        ledger.payers[member.ID] = member
+    start, span = to_epoch_us(START), 540 * US_PER_DAY
+    ledger.uuids.extend(range(10 ** 9, 10 ** 9 + count))
+    ledger.member_ids.extend(ids[rng.randrange(MEMBERS)] for _ in range(count))
+    ledger.amounts.extend(20 + rng.randrange(80) for _ in range(count))
+    ledger.dates.extend(start + rng.randrange(span) for _ in range(count))
+    ledger.types.extend(rng.randrange(1, 4) for _ in range(count))
+    for member in members[::10]:
+        fms.cancel_membership(member)
+    return fms
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    fms = build(count)
+    as_of = START + datetime.timedelta(days=540)
+
+    started = time.perf_counter()
+    serial = analytics_report(fms, workers=0, as_of=as_of)
+    baseline = time.perf_counter() - started
+    print(f"{count} transactions, {MEMBERS} members, {CLASSES} classes:")
+    print(f"  serial:     {baseline:8.2f}s")
+
+    workers = 2
+    while workers <= max(2, multiprocessing.cpu_count()):
+        started = time.perf_counter()
+        report = analytics_report(fms, workers=workers, as_of=as_of)
+        elapsed = time.perf_counter() - started
+        assert report == serial
+        print(f"  {workers:>2} workers: {elapsed:8.2f}s ({baseline / elapsed:.1f}x)")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
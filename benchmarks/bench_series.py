@@ -0,0 +1,57 @@
+"""A year of daily classes for many trainers: one-off classes vs. recurring series.
+
+Compares object count and the cost of a one-week timetable query.
+
+Run from the repository root:
+    python -m benchmarks.bench_series
+"""
+import datetime
+import time
+import tracemalloc
+
+from data_model import FitnessManagementSystem, MEMBERSHIP_TYPE, FITNESS_GOAL, SPECIALIZATION, RECURRENCE
+
+TRAINERS = 500
+DAYS = 365
+START = datetime.datetime(2025, 1, 1, 7)
+WEEK = (datetime.datetime(2025, 6, 2), datetime.datetime(2025, 6, 9))
+
+
+def build(use_series: bool):
+    fms = FitnessManagementSystem()
+    trainers = [fms.add_trainer(f"Trainer {i}", SPECIALIZATION.CARDIO) for i in range(TRAINERS)]
+    member = fms.register_member("Ali", 30, MEMBERSHIP_TYPE.BASIC, FITNESS_GOAL.ENDURANCE)
+    if use_series:
+        for trainer in trainers:
+            series = fms.schedule_series("Daily", trainer, 20, START, RECURRENCE.DAILY,
+                                         until=START + datetime.timedelta(days=DAYS - 1))
+            series.book(member, datetime.datetime(2025, 6, 3, 7))
+    else:
+        fms.schedule_classes(("Daily", trainer, 20, START + datetime.timedelta(days=day))
+                             for trainer in trainers for day in range(DAYS))
+    return fms
+
+
+def run(use_series: bool):
+    label = "series" if use_series else "one-off"
+    tracemalloc.start()
+    started = time.perf_counter()
+    fms = build(use_series)
+    built = time.perf_counter() - started
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    started = time.perf_counter()
+    timetable = fms.occurrences_between(*WEEK)
+    query = time.perf_counter() - started
+    print(f"{label:>8}: {len(fms.classes):>7} classes, {memory / 2**20:7.1f} MiB, built in {built:6.2f} s, "
+          f"one week ({len(timetable)} entries) in {query * 1e3:7.2f} ms")
+
+
+def main():
+    run(False)
+    run(True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Throughput of a sharded chain from 1 to N worker processes.
+
+The same mixed workload (registrations, classes, bookings, payments) is
+spread over the sites and sent to the shards in batches; each shard works
+on its part in parallel.
+
+Run from the repository root:
+    python -m benchmarks.bench_sharding [max shards]
+"""
+import datetime
+import os
+import sys
+import time
+
+from sharding import ShardedSystem
+
+SITES = 16
+MEMBERS_PER_SITE = 4_000
+CLASSES_PER_SITE = 100
+BATCH = 5_000
+START = datetime.datetime(2025, 6, 2, 6)
+
+
+def by_shard(chain, requests_by_site):
+    grouped = {}
+    for site, requests in requests_by_site.items():
+        grouped.setdefault(chain.site_shard(site), []).extend(requests)
+    return grouped
+
+
+def run_phase(chain, by_shard):
+    """Sends each shard its requests, BATCH at a time, all shards at once."""
+    replies = {shard: [] for shard in by_shard}
+    for offset in range(0, max(len(r) for r in by_shard.values()), BATCH):
+        chunk = {shard: requests[offset:offset + BATCH] for shard, requests in by_shard.items()
+                 if requests[offset:offset + BATCH]}
+        for shard, results in chain.batch(chunk).items():
+            replies[shard].extend(results)
+    return replies, sum(len(r) for r in by_shard.values())
+
+
+def run(shards: int):
+    with ShardedSystem(shards) as chain:
+        started = time.perf_counter()
+        operations = 0
+        register = {site: [("register", {"name": f"Member {site}-{i}", "age": 30, "membership_type": "BASIC",
+                                         "fitness_goal": "ENDURANCE"}) for i in range(MEMBERS_PER_SITE)]
+                    for site in range(SITES)}
+        trainers = {site: [("add_trainer", {"name": f"Trainer {site}", "specialization": "CARDIO"})]
+                    for site in range(SITES)}
+        member_replies, count = run_phase(chain, by_shard(chain, register))
+        operations += count
+        trainer_replies, count = run_phase(chain, by_shard(chain, trainers))
+        operations += count
+
+        member_ids = {shard: [r["result"]["id"] for r in replies] for shard, replies in member_replies.items()}
+        trainer_ids = {shard: [r["result"]["id"] for r in replies] for shard, replies in trainer_replies.items()}
+        schedule = {shard: [("schedule", {"name": "Spin", "trainer_id": ids[i % len(ids)], "capacity": 50,
+                                          "schedule": (START + datetime.timedelta(hours=i)).isoformat()})
+                            for i in range(CLASSES_PER_SITE * SITES // shards)]
+                    for shard, ids in trainer_ids.items()}
+        class_replies, count = run_phase(chain, schedule)
+        operations += count
+        class_ids = {shard: [r["result"]["id"] for r in replies] for shard, replies in class_replies.items()}
+
+        book_and_pay = {shard: [request for i, member_id in enumerate(ids) for request in (
+            ("book", {"member_id": member_id, "class_id": class_ids[shard][i % len(class_ids[shard])]}),
+            ("pay", {"member_id": member_id, "amount": 50, "membership_type": "BASIC"}))]
+            for shard, ids in member_ids.items()}
+        _, count = run_phase(chain, book_and_pay)
+        operations += count
+        report = chain.generate_revenue_report()
+        elapsed = time.perf_counter() - started
+    print(f"{shards:>3} shards: {operations} operations in {elapsed:6.2f} s = {operations / elapsed:>9,.0f} ops/s "
+          f"(revenue {report['total']})")
+
+
+def main():
+    max_shards = int(sys.argv[1]) if len(sys.argv) > 1 else os.cpu_count() or 1
+    shards = 1
+    while shards <= max_shards:
+        run(shards)
+        shards *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Compares opening a memory-mapped snapshot with a full SQLite load.
+
+Run from the repository root:
+    python -m benchmarks.bench_snapshot [member count]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+from benchmarks.bench_storage import build_system
+from snapshot import write_snapshot, MappedSnapshot
+from storage import SQLiteBackend
+
+LOOKUPS = 1_000
+
+
+def main():
+    member_count = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    fms = build_system(member_count)
+    member_ids = random.Random(7).sample(sorted(fms.members), LOOKUPS)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "fms.db")
+        snap_path = os.path.join(tmp, "fms.snap")
+        backend = SQLiteBackend(db_path)
+        backend.save(fms)
+        write_snapshot(fms, snap_path)
+        print(f"{member_count} members, snapshot {os.path.getsize(snap_path) / 2**20:.1f} MiB")
+
+        started = time.perf_counter()
+        restored = backend.load()
+        print(f"  SQLite full load:      {time.perf_counter() - started:8.3f} s")
+        backend.close()
+        del restored
+
+        started = time.perf_counter()
+        snapshot = MappedSnapshot(snap_path)
+        opened = time.perf_counter() - started
+        for member_id in member_ids:
+            snapshot.Members.get(member_id).ClassBooking
+        looked_up = time.perf_counter() - started - opened
+        print(f"  mmap snapshot open:    {opened:8.3f} s")
+        print(f"  {LOOKUPS} lazy lookups:    {looked_up:8.3f} s")
+        snapshot.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Times a full SQLite save and warm restart (load) of a large club.
+
+Run from the repository root:
+    python -m benchmarks.bench_storage [member count]
+"""
+import datetime
+import os
+import sys
+import tempfile
+import time
+
+from data_model import FitnessManagementSystem, MEMBERSHIP_TYPE, FITNESS_GOAL, SPECIALIZATION
+from storage import SQLiteBackend
+
+
+def build_system(member_count: int):
+    fms = FitnessManagementSystem()
+    members = [fms.register_member(f"Member {i}", 18 + i % 60, MEMBERSHIP_TYPE(i % 3 + 1), FITNESS_GOAL(i % 3 + 1))
+               for i in range(member_count)]
+    trainers = [fms.add_trainer(f"Trainer {i}", SPECIALIZATION(i % 3 + 1)) for i in range(100)]
+    start = datetime.datetime(2025, 1, 1, 7)
+    classes = [fms.schedule_class(f"Class {i}", trainers[i % 100], 30, start + datetime.timedelta(hours=i))
+               for i in range(member_count // 50)]
+    for i, member in enumerate(members):
+        member.book_class(classes[i % len(classes)])
+        fms.process_payment(member, 50 + i % 3 * 25, member.membership_type, start + datetime.timedelta(minutes=i))
+    return fms
+
+
+def main():
+    member_count = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    fms = build_system(member_count)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "fms.db")
+        backend = SQLiteBackend(path)
+
+        started = time.perf_counter()
+        backend.save(fms)
+        print(f"save {member_count} members: {time.perf_counter() - started:6.2f} s")
+
+        started = time.perf_counter()
+        restored = backend.load()
+        print(f"load {len(restored.members)} members: {time.perf_counter() - started:6.2f} s")
+        backend.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Streaming export/import throughput in rows per second for CSV and JSONL.
+
+Run from the repository root:
+    python -m benchmarks.bench_transfer [member count]
+"""
+import datetime
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from data_model import FitnessManagementSystem, MEMBERSHIP_TYPE, FITNESS_GOAL
+from transfer import export_members, export_transactions, import_members, import_transactions, read_rows, FORMATS
+
+
+def import_all(fmt, members_path, ledger_path):
+    target = FitnessManagementSystem()
+    id_map = {}
+    with open(members_path, newline="") as source:
+        import_members(target, source, fmt, id_map=id_map)
+    with open(ledger_path, newline="") as source:
+        import_transactions(target, source, fmt, id_map=id_map)
+    return target
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    fms = FitnessManagementSystem()
+    fms.register_members((f"Member {i}", 18 + i % 60, MEMBERSHIP_TYPE(i % 3 + 1), FITNESS_GOAL(i % 3 + 1))
+                         for i in range(count))
+    start = datetime.datetime(2024, 1, 1)
+    fms.process_payments((m, 25 + m.ID % 50, m.membership_type, start + datetime.timedelta(minutes=m.ID))
+                         for m in fms.members.values())
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for fmt in FORMATS:
+            members_path = os.path.join(tmp, f"members.{fmt}")
+            ledger_path = os.path.join(tmp, f"ledger.{fmt}")
+
+            started = time.perf_counter()
+            with open(members_path, "w", newline="") as out:
+                export_members(fms, out, fmt)
+            with open(ledger_path, "w", newline="") as out:
+                export_transactions(fms, out, fmt)
+            export_rate = 2 * count / (time.perf_counter() - started)
+
+            started = time.perf_counter()
+            import_all(fmt, members_path, ledger_path)
+            import_rate = 2 * count / (time.perf_counter() - started)
+
+            # Parsing alone must stay flat in memory; the imported system itself grows with the data.
+            tracemalloc.start()
+            with open(ledger_path, newline="") as source:
+                for _ in read_rows(source, fmt):
+                    pass
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            print(f"{fmt:>5}: export {export_rate:10.0f} rows/s  import {import_rate:10.0f} rows/s  "
+                  f"parse peak {peak / 2**10:.0f} KiB ({os.path.getsize(ledger_path) / 2**20:.1f} MiB ledger)")
+
+
+if __name__ == "__main__":
+    main()
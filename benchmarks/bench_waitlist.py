@@ -0,0 +1,46 @@
+"""Promotion latency from cancel_booking on classes with thousands of waitlisted members.
+
+Run from the repository root:
+    python -m benchmarks.bench_waitlist
+"""
+import datetime
+import time
+
+from data_model import FitnessManagementSystem, MEMBERSHIP_TYPE, FITNESS_GOAL, SPECIALIZATION
+
+WAITLIST_SIZES = (1_000, 10_000, 100_000)
+CAPACITY = 30
+
+
+def run(waiting: int):
+    fms = FitnessManagementSystem()
+    trainer = fms.add_trainer("Trainer", SPECIALIZATION.CARDIO)
+    cls = fms.schedule_class("Popular", trainer, CAPACITY, datetime.datetime(2025, 1, 1, 7))
+    booked = fms.register_members((f"Booked {i}", 30, MEMBERSHIP_TYPE.BASIC, FITNESS_GOAL.ENDURANCE)
+                                  for i in range(CAPACITY))
+    for member_id in booked.ids:
+        cls.enroll_member(fms.members[member_id])
+    queued = fms.register_members((f"Waiting {i}", 30, MEMBERSHIP_TYPE(i % 3 + 1), FITNESS_GOAL.ENDURANCE)
+                                  for i in range(waiting))
+    for member_id in queued.ids:
+        cls.join_waitlist(fms.members[member_id])
+    # Every tenth waiter gives up, leaving stale entries the promotion has to skip.
+    for member_id in queued.ids[::10]:
+        cls.leave_waitlist(fms.members[member_id])
+
+    cancellations = min(10_000, cls.Waitlisted)
+    started = time.perf_counter()
+    for _ in range(cancellations):
+        cls.cancel_booking(next(iter(cls.members)))
+    elapsed = time.perf_counter() - started
+    print(f"{waiting:>8} waitlisted: {elapsed / cancellations * 1e6:7.2f} us per cancel + promotion "
+          f"({cls.CurrentEnrollments}/{CAPACITY} booked, {cls.Waitlisted} still waiting)")
+
+
+def main():
+    for waiting in WAITLIST_SIZES:
+        run(waiting)
+
+
+if __name__ == "__main__":
+    main()
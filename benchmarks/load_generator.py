@@ -0,0 +1,96 @@
+"""Load generator for the JSON line server: requests per second and latency percentiles.
+
+Starts `server.py` in a subprocess unless --port points at a running server.
+
+Run from the repository root:
+    python -m benchmarks.load_generator --clients 100 --requests 200
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+async def open_client(host, port):
+    reader, writer = await asyncio.open_connection(host, port)
+
+    async def call(op, **args):
+        writer.write(json.dumps({"op": op, "args": args}).encode() + b"\n")
+        await writer.drain()
+        reply = json.loads(await reader.readline())
+        if not reply["ok"]:
+            raise RuntimeError(reply["error"])
+        return reply["result"]
+
+    return call, writer
+
+
+async def client(host, port, class_ids, requests, latencies, index):
+    call, writer = await open_client(host, port)
+    member = await call("register", name=f"Load {index}", age=30, membership_type="BASIC", fitness_goal="ENDURANCE")
+    for i in range(requests):
+        started = time.perf_counter()
+        kind = i % 4
+        if kind == 0:
+            await call("book", member_id=member["id"], class_id=class_ids[(index + i) % len(class_ids)])
+        elif kind == 1:
+            await call("pay", member_id=member["id"], amount=25, membership_type="BASIC")
+        elif kind == 2:
+            await call("report")
+        else:
+            await call("progress", member_id=member["id"])
+        latencies.append(time.perf_counter() - started)
+    writer.close()
+
+
+async def run(host, port, clients, requests):
+    call, writer = await open_client(host, port)
+    trainer = await call("add_trainer", name="Load Trainer", specialization="CARDIO")
+    class_ids = []
+    for i in range(200):
+        cls = await call("schedule", name=f"Load Class {i}", trainer_id=trainer["id"], capacity=30,
+                         schedule=f"2025-07-{i // 12 + 1:02d}T{i % 12 + 7:02d}:00:00")
+        class_ids.append(cls["id"])
+    writer.close()
+
+    latencies = []
+    started = time.perf_counter()
+    await asyncio.gather(*(client(host, port, class_ids, requests, latencies, i) for i in range(clients)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2] * 1000
+    p99 = latencies[int(len(latencies) * 0.99)] * 1000
+    print(f"{clients} clients x {requests} requests: {len(latencies) / elapsed:10.0f} req/s  "
+          f"p50 {p50:6.2f} ms  p99 {p99:6.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, help="target a running server instead of starting one")
+    parser.add_argument("--clients", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    process = None
+    port = args.port
+    if port is None:
+        process = subprocess.Popen([sys.executable, os.path.join(ROOT, "server.py"), "--port", "0"],
+                                   cwd=ROOT, stdout=subprocess.PIPE, text=True)
+        port = int(process.stdout.readline().rsplit(":", 1)[1])
+    try:
+        asyncio.run(run(args.host, port, args.clients, args.requests))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""Benchmark suite for the data model hot paths on synthetic workloads.
+
+Each case runs `rounds` rounds of `batch` operations against a system built
+by benchmarks.workload and reports per-operation statistics in the style of
+pytest-benchmark (min, max, mean, median, stddev, ops/s). Results are written
+as JSON; --compare prints the change against an earlier results file.
+
+Run from the repository root:
+    python -m benchmarks.suite --scales 1000 100000 1000000 --output results.json
+    python -m benchmarks.suite --scales 1000 --compare results.json
+"""
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+
+from data_model import MEMBERSHIP_TYPE, FITNESS_GOAL
+from benchmarks.workload import WorkloadSpec, build_workload
+
+ROUNDS = 5
+BATCH = 1_000
+
+
+def measure(operation, batch: int, rounds: int) -> dict:
+    """Times `rounds` calls of operation(batch); statistics are per operation, in seconds."""
+    per_op = []
+    for round_index in range(rounds):
+        started = time.perf_counter()
+        operation(round_index, batch)
+        per_op.append((time.perf_counter() - started) / batch)
+    mean = statistics.fmean(per_op)
+    return {
+        "rounds": rounds, "batch": batch,
+        "min": min(per_op), "max": max(per_op), "mean": mean, "median": statistics.median(per_op),
+        "stddev": statistics.stdev(per_op) if rounds > 1 else 0.0,
+        "ops": 1 / mean if mean else float("inf"),
+    }
+
+
+def cases(workload, rng: random.Random):
+    """(name, operation, batch, rounds) for every hot path; operation(round, count) runs `count` operations."""
+    fms, members, trainers, classes = workload.fms, workload.members, workload.trainers, workload.classes
+    batch = min(BATCH, len(members) // (ROUNDS + 1) or 1)
+
+    def register_member(round_index, count):
+        for i in range(count):
+            fms.register_member(f"Bench {round_index}.{i}", 30, MEMBERSHIP_TYPE.BASIC, FITNESS_GOAL.ENDURANCE)
+
+    def enroll_member(round_index, count):
+        for member, cls in zip(rng.sample(members, count), rng.choices(classes, k=count)):
+            cls.enroll_member(member)
+
+    def class_booking(round_index, count):
+        for member in rng.sample(members, count):
+            member.ClassBooking
+
+    def assigned_classes(round_index, count):
+        for trainer in rng.choices(trainers, k=count):
+            trainer.AssignedClasses
+
+    # Cancelled members are taken off the end so the other cases keep sampling active ones.
+    leaving = members[len(members) - batch * ROUNDS:]
+
+    def cancel_membership(round_index, count):
+        for member in leaving[round_index * count:(round_index + 1) * count]:
+            fms.cancel_membership(member)
+
+    def revenue_report(round_index, count):
+        for _ in range(count):
+            fms.generate_revenue_report()
+
+    return [
+        ("register_member", register_member, batch, ROUNDS),
+        ("enroll_member", enroll_member, batch, ROUNDS),
+        ("ClassBooking", class_booking, batch, ROUNDS),
+        ("AssignedClasses", assigned_classes, batch, ROUNDS),
+        ("generate_revenue_report", revenue_report, 1, ROUNDS),
+        ("cancel_membership", cancel_membership, batch, ROUNDS),
+    ]
+
+
+def run_scale(scale: int, seed: int) -> dict:
+    spec = WorkloadSpec.scaled(scale, seed)
+    started = time.perf_counter()
+    workload = build_workload(spec)
+    results = {"spec": spec._asdict(), "build_seconds": time.perf_counter() - started, "benchmarks": {}}
+    rng = random.Random(seed)
+    for name, operation, batch, rounds in cases(workload, rng):
+        results["benchmarks"][name] = measure(operation, batch, rounds)
+    return results
+
+
+def compare(results: dict, baseline: dict):
+    for scale, current in results["scales"].items():
+        previous = baseline.get("scales", {}).get(scale)
+        if previous is None:
+            continue
+        print(f"{scale} members vs baseline:")
+        for name, stats in current["benchmarks"].items():
+            before = previous["benchmarks"].get(name)
+            if before is not None:
+                change = (stats["median"] / before["median"] - 1) * 100
+                print(f"  {name:<24} {before['median'] * 1e6:>10.2f}us -> {stats['median'] * 1e6:>10.2f}us "
+                      f"({change:+.1f}%)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", type=int, nargs="+", default=[1_000, 100_000, 1_000_000])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="JSON results of an earlier run to compare against")
+    args = parser.parse_args(argv)
+
+    results = {"python": sys.version.split()[0], "platform": platform.platform(), "seed": args.seed,
+               "scales": {}}
+    for scale in args.scales:
+        current = results["scales"][str(scale)] = run_scale(scale, args.seed)
+        print(f"{scale} members (built in {current['build_seconds']:.1f}s):")
+        for name, stats in current["benchmarks"].items():
+            print(f"  {name:<24} median {stats['median'] * 1e6:>10.2f}us  "
+                  f"stddev {stats['stddev'] * 1e6:>8.2f}us  {stats['ops']:>12,.0f} ops/s")
+
+    if args.output:
+        with open(args.output, "w") as out:
+            json.dump(results, out, indent=2)
+    if args.compare:
+        with open(args.compare) as baseline:
+            compare(results, json.load(baseline))
+
+
+if __name__ == "__main__":
+    main()
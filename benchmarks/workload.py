@@ -0,0 +1,66 @@
+"""Deterministic synthetic workloads for the data model.
+
+The same seed and scale always produce the same members, trainers, classes,
+bookings, payments and progress logs (entity IDs come from the process-wide
+counter, so only they may differ between runs).
+
+    from benchmarks.workload import WorkloadSpec, build_workload
+    workload = build_workload(WorkloadSpec.scaled(100_000, seed=7))
+"""
+import datetime
+import random
+from collections import namedtuple
+
+from data_model import FitnessManagementSystem, MEMBERSHIP_TYPE, FITNESS_GOAL, SPECIALIZATION
+
+START = datetime.datetime(2024, 1, 1, 6, 0)
+FIRST_NAMES = ("Ali", "Sara", "Omar", "Lena", "Maya", "Jon", "Ana", "Kai", "Noor", "Eli", "Ivy", "Sam")
+CLASS_NAMES = {SPECIALIZATION.YOGA: ("Morning Yoga", "Yoga Flow", "Power Yoga"),
+               SPECIALIZATION.STRENGTH_TRAINING: ("Strength Training", "Kettlebells", "Lifting Basics"),
+               SPECIALIZATION.CARDIO: ("Cardio Blast", "Spinning", "HIIT Cardio")}
+
+
+class WorkloadSpec(namedtuple("WorkloadSpec", "seed members trainers classes capacity bookings payments progress")):
+    """Entity counts of a synthetic workload; `bookings`, `payments` and `progress` are totals, not per member."""
+
+    @classmethod
+    def scaled(cls, members: int, seed: int = 0) -> "WorkloadSpec":
+        """A gym with `members` members: one trainer per 100 members, one class per 10, two bookings,
+        three payments and one progress log per member."""
+        return cls(seed=seed, members=members, trainers=max(1, members // 100), classes=max(1, members // 10),
+                   capacity=30, bookings=2 * members, payments=3 * members, progress=members)
+
+
+Workload = namedtuple("Workload", "spec fms members trainers classes")
+
+
+def member_rows(rng: random.Random, count: int):
+    for i in range(count):
+        yield (f"{rng.choice(FIRST_NAMES)} {i}", rng.randint(16, 80),
+               rng.choice(list(MEMBERSHIP_TYPE)), rng.choice(list(FITNESS_GOAL)))
+
+
+def build_workload(spec: WorkloadSpec, fms: FitnessManagementSystem = None) -> Workload:
+    """Fills `fms` (a new system by default) with the entities described by `spec`."""
+    rng = random.Random(spec.seed)
+    fms = fms if fms is not None else FitnessManagementSystem()
+
+    members = [fms.members[uuid] for uuid in fms.register_members(member_rows(rng, spec.members)).ids]
+    trainers = [fms.add_trainer(f"Trainer {i}", rng.choice(list(SPECIALIZATION))) for i in range(spec.trainers)]
+    # Each trainer teaches one class an hour, so the timetable is conflict free by construction.
+    rows = []
+    for i in range(spec.classes):
+        trainer = trainers[i % spec.trainers]
+        rows.append((rng.choice(CLASS_NAMES[trainer.specialization]), trainer, spec.capacity,
+                     START + datetime.timedelta(hours=i // spec.trainers), datetime.timedelta(minutes=45)))
+    classes = [fms.classes[uuid] for uuid in fms.schedule_classes(rows).ids]
+
+    if members and classes:
+        fms.enroll_members((rng.choice(members), rng.choice(classes)) for _ in range(spec.bookings))
+        fms.process_payments((rng.choice(members), rng.randint(10, 200), rng.choice(list(MEMBERSHIP_TYPE)),
+                              START + datetime.timedelta(minutes=rng.randrange(365 * 24 * 60)))
+                             for _ in range(spec.payments))
+        for i in range(spec.progress):
+            member = rng.choice(members)
+            member.track_progress(f"Session {i}: {rng.randint(1, 120)} minutes", member.fitness_goals)
+    return Workload(spec, fms, members, trainers, classes)
@@ -1,11 +1,13 @@
 from data_model import *
+from optimizer import assign_trainers
 from view import *
 
 
 class SystemController:
-    def __init__(self):
-        # Initializes the fitness management system instance.
-        self.system = FitnessManagementSystem()
+    def __init__(self, storage=None):
+        # Initializes the fitness management system instance, restoring it from storage when given.
+        self.storage = storage
+        self.system = storage.load() if storage is not None else FitnessManagementSystem()
 
     def register_member(self):
         # Collects member information and registers a new member.
@@ -18,11 +20,30 @@ class SystemController:
         print(f"Member {name} registered successfully with ID {new_member.ID}")
 
 
-    def view_members(self):
-        # Displays all registered members.
+    def view_members(self, page_size: int = 20):
+        # Displays registered members one page at a time, optionally filtered.
+        query = self.system.query_members()
+        prefix = SystemView.get_optional_string("Filter by name prefix")
+        if prefix:
+            query.named(prefix)
+        mem_type = SystemView.get_int_input(0, len(MEMBERSHIP_TYPE), "Filter by membership type (0: any, "
+                                            + ", ".join(f"{t.value}: {t.name}" for t in MEMBERSHIP_TYPE) + ")")
+        if mem_type:
+            query.of_type(MEMBERSHIP_TYPE(mem_type))
+
         print("Registered Members:")
-        for member in self.system.view_members():
-            print(f"ID: {member.ID}, Name: {member.Name}")
+        cursor, shown = None, 0
+        while True:
+            page, cursor = self.system.members_page(page_size, cursor, query)
+            for member in page:
+                print(f"ID: {member.ID}, Name: {member.Name}")
+            shown += len(page)
+            if cursor is None:
+                break
+            if not SystemView.get_next_page():
+                break
+        if not shown:
+            print("No members found.")
 
 
     def register_new_trainer(self):
@@ -41,18 +62,50 @@ class SystemController:
         trainer = SystemView.get_trainer(self.system)
         capacity = SystemView.get_int_input(0, 30, "Enter the class capacity")
 
-        fitness_class = self.system.schedule_class(name, trainer, capacity, date)
+        try:
+            fitness_class = self.system.schedule_class(name, trainer, capacity, date)
+        except ValueError as e:
+            print(e)
+            return
         print(f"Fitness class {name} added successfully with ID {fitness_class.ID}")
 
 
+    def auto_assign_trainers(self):
+        # Gives every class without a trainer the least busy free trainer of its specialization.
+        plan = assign_trainers(self.system)
+        for cls, trainer in plan.assignments.items():
+            print(f"{cls.Schedule} ID: {cls.ID}, {cls.Name} -> {trainer.Name}")
+        for cls, reason in plan.unassigned:
+            print(f"{cls.Schedule} ID: {cls.ID}, {cls.Name}: {reason}")
+        if not plan.assignments and not plan.unassigned:
+            print("Every class already has a trainer.")
+
+    def view_timetable(self):
+        # Displays the classes scheduled on a selected day in time order.
+        day = SystemView.get_date_input("Enter a timetable date")
+        classes = self.system.classes_between(day, day + datetime.timedelta(days=1))
+        if not classes:
+            print("No classes scheduled.")
+            return
+        for cls in classes:
+            trainer = cls.Trainer.Name if cls.Trainer is not None else "-"
+            print(f"{cls.Schedule} ID: {cls.ID}, {cls.Name}, Trainer: {trainer}, "
+                  f"{cls.CurrentEnrollments}/{cls.Capacity}")
+
     def assign_member_to_class(self):
         # Assigns a member to a fitness class if space is available.
         member = SystemView.get_member(self.system)
         cls = SystemView.get_class(self.system)
         if cls.enroll_member(member) == True:
             print(f"Success. You have added the member {member.ID} to class {cls.ID}")
-        else:
-            print(f"Fail. Selected class is full")
+            return
+
+        print(f"Fail. Selected class is full")
+        if SystemView.get_int_input(1, 2, "Join the waitlist? (1: Yes, 2: No)") == 1:
+            if cls.join_waitlist(member):
+                print(f"Member {member.ID} is waitlisted for class {cls.ID} ({cls.Waitlisted} waiting)")
+            else:
+                print(f"Member {member.ID} is already booked or waiting for class {cls.ID}")
     
     def process_payment(self):
         # Processes a payment from a member and generates a receipt.
@@ -74,18 +127,23 @@ class SystemController:
         # Generates and displays total revenue from all transactions.
         total = self.system.generate_revenue_report()
         print(f"Total Revenue: ${total}")
+        for mem_type, amount in self.system.revenue_by_membership_type().items():
+            print(f"  {mem_type}: ${amount}")
 
     def view_member_progress(self):
         # Shows progress logs for a selected member.
         member = SystemView.get_member(self.system)
         progress = self.system.view_member_progress(member.ID)
-        if not progress:
+        if not progress and not member.Measurements:
             print("No progress found.")
             return
-        for goal, logs in progress.items():
+        for goal, logs in (progress or {}).items():
             print(f"Goal: {goal.name}")
             for entry in logs:
                 print(f"  {entry}")
+        for metric, series in member.Measurements.items():
+            at, value = series.latest()
+            print(f"{metric}: {value} on {at:%Y-%m-%d} ({len(series)} measurements)")
 
     def main_interface(self):
         commands = [
@@ -93,6 +151,8 @@ class SystemController:
             {'descr': "View All Members", 'method': self.view_members},
             {'descr': "Register new trainer'", 'method': self.register_new_trainer},
             {'descr': "Schedule new class'", 'method': self.schedule_new_class},
+            {'descr': "View Timetable", 'method': self.view_timetable},
+            {'descr': "Assign trainers automatically", 'method': self.auto_assign_trainers},
             {'descr': "Assign member to class'", 'method': self.assign_member_to_class},
             {'descr': "Process Payment", 'method': self.process_payment},
             {'descr': "Cancel Membership", 'method': self.cancel_membership},
@@ -112,12 +172,16 @@ class SystemController:
             comm_number = SystemView.get_int_input(1, exit_number, "Enter a command number")
             
             if comm_number == exit_number:
+                if self.storage is not None:
+                    self.storage.save(self.system)
                 print("Good bye!")
                 return
             
             try:
                 selected_cmd = commands[comm_number - 1]
                 selected_cmd['method']()
+                if self.storage is not None:
+                    self.storage.maybe_checkpoint(self.system)
             except IndexError:
                 print("Invalid command number. Try again.")
             except Exception as e:
@@ -1,6 +1,14 @@
 from enum import Enum
+from array import array
+from collections import OrderedDict, deque, namedtuple
+from collections.abc import Mapping
+import bisect
 import datetime
-from id_generator import next_id
+import heapq
+import math
+import threading
+from types import MappingProxyType
+from id_generator import next_id, reserve_ids
 
 # ------------------------- Enums section --------------------------------------
 
@@ -45,12 +53,92 @@ class SPECIALIZATION(Enum):
         }
         return names[self]
     
+
+class RECURRENCE(Enum):
+    DAILY = 1
+    WEEKLY = 2
+
+    def __str__(self):
+        names = {
+            RECURRENCE.DAILY: "Daily",
+            RECURRENCE.WEEKLY: "Weekly"
+        }
+        return names[self]
+
+
+class METRIC(Enum):
+    WEIGHT = 1      # kg
+    REPS = 2
+    DISTANCE = 3    # km
+
+    def __str__(self):
+        names = {
+            METRIC.WEIGHT: "Weight",
+            METRIC.REPS: "Reps",
+            METRIC.DISTANCE: "Distance"
+        }
+        return names[self]
+
+# ------------------------- Helpers section --------------------------------------
+
+EPOCH = datetime.datetime(1970, 1, 1)
+MICROSECOND = datetime.timedelta(microseconds=1)
+# Classes scheduled without a length; they only clash with classes starting at the same moment.
+DEFAULT_DURATION = datetime.timedelta(0)
+
+
+def schedule_key(schedule) -> datetime.datetime:
+    """Normalizes a class schedule so plain dates and datetimes sort together."""
+    if isinstance(schedule, datetime.datetime):
+        return schedule
+    return datetime.datetime.combine(schedule, datetime.time.min)
+
+
+def to_epoch_us(moment) -> int:
+    """Converts a date/datetime to integer microseconds since the epoch (naive values are taken as is)."""
+    moment = schedule_key(moment)
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return (moment - EPOCH) // MICROSECOND
+
+
+def from_epoch_us(value: int) -> datetime.datetime:
+    return EPOCH + datetime.timedelta(microseconds=value)
+
+
+def duration_seconds(duration: datetime.timedelta) -> int:
+    """Whole seconds of a class duration, as stored in the journal and on disk."""
+    return duration // datetime.timedelta(seconds=1)
+
+
+def format_amount(amount) -> str:
+    """Renders an amount for a receipt: integral amounts without decimals, whether paid as int or float."""
+    if isinstance(amount, float) and amount.is_integer():
+        amount = int(amount)
+    return str(amount)
+
+
+RECEIPT = ("Receipt for Transaction #{}\n"
+           "Member: {}\n"
+           "Membership: {} (${})\n"
+           "Date: {}\n"
+           "Amount Paid: ${}")
+
+
+def parse_schedule(value: str):
+    """Parses an isoformat() schedule back into the date or datetime it came from."""
+    if len(value) == 10:
+        return datetime.date.fromisoformat(value)
+    return datetime.datetime.fromisoformat(value)
+
 # ------------------------- Classes section --------------------------------------
 
 class Base:
     """Base class for common ID and system reference."""
-    def __init__(self, fms: "FitnessManagementSystem"):
-        self.uuid = next_id()
+    __slots__ = ("uuid", "fms")
+
+    def __init__(self, fms: "FitnessManagementSystem", uuid: int = None):
+        self.uuid = next_id() if uuid is None else uuid
         self.fms = fms
     
     def __eq__(self, other):
@@ -64,16 +152,24 @@ class Base:
         return self.uuid
 
 
+# Measurements of a member who has none; most members never record any.
+NO_MEASUREMENTS = MappingProxyType({})
+
+
 class Member(Base):
     """Represents a fitness club member."""
+    __slots__ = ("name", "age", "membership_type", "fitness_goals", "progresses", "measurements")
+
     def __init__(self, fms: "FitnessManagementSystem", name: str,  age: int, 
-                 membership_type: MEMBERSHIP_TYPE, fitness_goals: FITNESS_GOAL):  
-        super().__init__(fms)   
+                 membership_type: MEMBERSHIP_TYPE, fitness_goals: FITNESS_GOAL, uuid: int = None):  
+        super().__init__(fms, uuid)   
         self.name = name
         self.age = age
         self.membership_type = membership_type
         self.fitness_goals = fitness_goals
         self.progresses = {}
+        # METRIC -> ProgressSeries of typed, timestamped measurements; None until the first one.
+        self.measurements = None
 
     @property
     def Name(self):
@@ -91,12 +187,33 @@ class Member(Base):
     def FitnessGoals(self):
         return self.fitness_goals
 
+    @property
+    def Measurements(self):
+        return self.measurements if self.measurements is not None else NO_MEASUREMENTS
+
     @property
     def ClassBooking(self):
-        return [cl for cl in self.fms.classes.values() if self in cl.members]
+        return list(self.fms.member_bookings.get(self.uuid, {}).values())
     
+    def rename(self, new_name: str):
+        if not isinstance(new_name, str) or not new_name:
+            raise ValueError("The name should be a non empty string")
+        with self.fms.write_lock:
+            active = self.fms.members.get(self.uuid) is self
+            if active:
+                self.fms.member_index.remove(self)
+            self.name = new_name
+            if active:
+                self.fms.member_index.add(self)
+            self.fms.log("rename_member", self.uuid, new_name)
+
     def update_membership(self, new_type): 
-        self.membership_type = new_type
+        with self.fms.write_lock:
+            old_type = self.membership_type
+            self.membership_type = new_type
+            if self.fms.members.get(self.uuid) is self:
+                self.fms.member_index.retype(self, old_type)
+            self.fms.log("update_membership", self.uuid, new_type.value)
     
     def book_class(self, class_obj: "FitnessClass"):
         return class_obj.enroll_member(self)
@@ -105,12 +222,30 @@ class Member(Base):
         if goals not in self.progresses:
             self.progresses[goals] = []
         self.progresses[goals].append(progress_data)
+        self.fms.log("track_progress", self.uuid, goals.value, progress_data)
+
+    def measurement_series(self, metric: METRIC) -> "ProgressSeries":
+        """The member's series for `metric`, created on first use."""
+        if self.measurements is None:
+            self.measurements = {}
+        series = self.measurements.get(metric)
+        if series is None:
+            series = self.measurements[metric] = ProgressSeries()
+        return series
+
+    def record_measurement(self, metric: METRIC, value: float, at: datetime = None):
+        at = at if at is not None else datetime.datetime.now()
+        self.measurement_series(metric).add(at, value)
+        self.fms.log("record_measurement", self.uuid, metric.value, value, to_epoch_us(at))
 
 
 class Trainer(Base):
     """Represents a fitness trainer."""
-    def __init__(self, fms: "FitnessManagementSystem", name: str, specialization: SPECIALIZATION):
-        super().__init__(fms)
+    __slots__ = ("name", "specialization")
+
+    def __init__(self, fms: "FitnessManagementSystem", name: str, specialization: SPECIALIZATION,
+                 uuid: int = None):
+        super().__init__(fms, uuid)
         self.name = name
         self.specialization = specialization
     
@@ -124,21 +259,25 @@ class Trainer(Base):
     
     @property
     def AssignedClasses(self):
-        return [cl for cl in self.fms.classes.values() if cl.trainer == self]
+        return list(self.fms.trainer_classes.get(self.uuid, {}).values())
     
     def assign_class(self, class_obj: "FitnessClass"):
-        class_obj.trainer = self
+        class_obj.Trainer = self
 
 
 class FitnessClass(Base):
     """Represents a scheduled fitness class."""
+    __slots__ = ("name", "trainer", "capacity", "schedule", "duration", "members")
+
     def __init__(self, fms: "FitnessManagementSystem", name: str, trainer: Trainer, 
-                 capacity: int, schedule: datetime):
-        super().__init__(fms)
+                 capacity: int, schedule: datetime, uuid: int = None,
+                 duration: datetime.timedelta = DEFAULT_DURATION):
+        super().__init__(fms, uuid)
         self.name = name
         self.trainer = trainer
         self.capacity = capacity
         self.schedule = schedule
+        self.duration = duration
         self.members = set()
     
     @property
@@ -151,7 +290,16 @@ class FitnessClass(Base):
     
     @Trainer.setter
     def Trainer(self, value):
-        self.trainer = value
+        # Raises ValueError, leaving the class unchanged, if the new trainer teaches at an overlapping time.
+        with self.fms.write_lock:
+            if value is not None and value != self.trainer:
+                self.fms.check_trainer_free(value, self)
+            if self.trainer is not None:
+                self.fms.unindex_trainer(self)
+            self.trainer = value
+            if value is not None:
+                self.fms.index_trainer(self)
+        self.fms.log("assign_trainer", self.uuid, value.ID if value is not None else None)
        
     @property
     def Capacity(self):
@@ -164,23 +312,255 @@ class FitnessClass(Base):
     @property
     def Schedule(self):
         return self.schedule
+
+    @property
+    def Duration(self):
+        return self.duration
+
+    @property
+    def Timed(self):
+        """True for a start time with a positive duration; only such classes are checked for trainer conflicts."""
+        return self.duration > DEFAULT_DURATION and isinstance(self.schedule, datetime.datetime)
+
+    @property
+    def Slot(self):
+        """(start, end, ID) of the time the class occupies; a class without duration still takes a moment."""
+        start = schedule_key(self.schedule)
+        return start, start + max(self.duration, MICROSECOND), self.uuid
+    
+    @property
+    def Waitlisted(self):
+        waitlist = self.fms.waitlists.get(self.uuid)
+        return len(waitlist) if waitlist is not None else 0
     
     def enroll_member(self, member: Member):
-        if len(self.members) + 1 > self.capacity:
-            return False
-        
+        # The capacity check and the insert must be atomic, or concurrent bookings overbook the class.
+        with self.fms.class_lock(self.uuid):
+            if len(self.members) + 1 > self.capacity:
+                if self.fms.metrics is not None:
+                    self.fms.metrics.count("bookings_rejected_full")
+                return False
+            
+            self.admit(member)
+            self.fms.log("enroll_member", self.uuid, member.ID)
+            return True
+
+    def admit(self, member: Member):
+        """Adds the member to the class and the booking index; the caller holds the class lock."""
         self.members.add(member)
-        return True
+        with self.fms.member_lock(member.ID):
+            self.fms.member_bookings.setdefault(member.ID, {})[self.uuid] = self
     
     def cancel_booking(self, member: Member):
-        self.members.discard(member)
+        with self.fms.class_lock(self.uuid):
+            if member in self.members:
+                self.members.discard(member)
+                self.fms.log("cancel_booking", self.uuid, member.ID)
+                self.promote_waitlisted()
+
+            with self.fms.member_lock(member.ID):
+                bookings = self.fms.member_bookings.get(member.ID)
+                if bookings is not None:
+                    bookings.pop(self.uuid, None)
+                    if not bookings:
+                        del self.fms.member_bookings[member.ID]
+
+    # ----- Waitlist -----
+    def join_waitlist(self, member: Member, lane: MEMBERSHIP_TYPE = None):
+        """Queues a member for a full class in the lane of their membership type.
+
+        Returns False if the member is already booked or waiting, or if the class
+        still has room (book it with enroll_member instead).
+        """
+        with self.fms.class_lock(self.uuid):
+            if member in self.members or len(self.members) < self.capacity:
+                return False
+
+            waitlist = self.fms.waitlists.get(self.uuid)
+            if waitlist is None:
+                waitlist = self.fms.waitlists[self.uuid] = Waitlist()
+            if not waitlist.add(member, lane):
+                return False
+            with self.fms.member_lock(member.ID):
+                self.fms.member_waitlists.setdefault(member.ID, set()).add(self.uuid)
+            self.fms.log("join_waitlist", self.uuid, member.ID, waitlist.waiting[member.ID][0].value)
+            return True
+
+    def leave_waitlist(self, member: Member):
+        with self.fms.class_lock(self.uuid):
+            waitlist = self.fms.waitlists.get(self.uuid)
+            if waitlist is None or not waitlist.remove(member):
+                return
+            if not waitlist:
+                del self.fms.waitlists[self.uuid]
+            self.forget_waitlisted(member)
+            self.fms.log("leave_waitlist", self.uuid, member.ID)
+
+    def promote_waitlisted(self):
+        """Books the next waiting member into a freed spot; the caller holds the class lock."""
+        waitlist = self.fms.waitlists.get(self.uuid)
+        if waitlist is None or len(self.members) >= self.capacity:
+            return None
+
+        member = waitlist.pop()
+        if not waitlist:
+            del self.fms.waitlists[self.uuid]
+        if member is not None:
+            self.forget_waitlisted(member)
+            self.admit(member)
+        return member
+
+    def forget_waitlisted(self, member: Member):
+        with self.fms.member_lock(member.ID):
+            waiting = self.fms.member_waitlists.get(member.ID)
+            if waiting is not None:
+                waiting.discard(self.uuid)
+                if not waiting:
+                    del self.fms.member_waitlists[member.ID]
  
 
+# One entry of a timetable: a one-off class, or an occurrence of a series (fitness_class is None until booked).
+Occurrence = namedtuple("Occurrence", "schedule series fitness_class")
+
+
+class ClassSeries(Base):
+    """A recurring class (daily or weekly, every `interval` days/weeks) with optional end and skipped dates.
+
+    Occurrences are computed on demand for a queried date range; a FitnessClass
+    is only created for an occurrence once somebody books it.
+    """
+    __slots__ = ("name", "trainer", "capacity", "start", "frequency", "interval", "until", "exceptions",
+                 "duration", "occurrences")
+
+    def __init__(self, fms: "FitnessManagementSystem", name: str, trainer: Trainer, capacity: int,
+                 start: datetime, frequency: RECURRENCE, interval: int = 1, until: datetime = None,
+                 exceptions=(), uuid: int = None, duration: datetime.timedelta = DEFAULT_DURATION):
+        super().__init__(fms, uuid)
+        if interval < 1:
+            raise ValueError("The interval should be a positive number")
+        self.name = name
+        self.trainer = trainer
+        self.capacity = capacity
+        self.start = schedule_key(start)
+        self.frequency = frequency
+        self.interval = interval
+        # Kept as given: a plain date in `until` or `exceptions` stands for that whole day.
+        self.until = until
+        self.exceptions = set(exceptions)
+        self.duration = duration
+        # Occurrence datetime -> FitnessClass, only for the materialized (booked) occurrences.
+        self.occurrences = {}
+
+    @property
+    def Name(self):
+        return self.name
+
+    @property
+    def Trainer(self):
+        return self.trainer
+
+    @property
+    def Capacity(self):
+        return self.capacity
+
+    @property
+    def step(self) -> datetime.timedelta:
+        if self.frequency == RECURRENCE.DAILY:
+            return datetime.timedelta(days=self.interval)
+        return datetime.timedelta(weeks=self.interval)
+
+    @property
+    def last_start(self):
+        """The latest moment an occurrence may start at (None when the series never ends)."""
+        if self.until is None or isinstance(self.until, datetime.datetime):
+            return self.until
+        return datetime.datetime.combine(self.until, datetime.time.max)
+
+    def is_skipped(self, moment: datetime.datetime) -> bool:
+        return moment in self.exceptions or moment.date() in self.exceptions
+
+    def occurrence_times(self, start, end):
+        """Yields the occurrence datetimes in [start, end); the cost is proportional to the window."""
+        start, end = schedule_key(start), schedule_key(end)
+        step = self.step
+        moment = self.start
+        last = self.last_start
+        if start > moment:
+            moment += step * -((self.start - start) // step)
+        while moment < end and (last is None or moment <= last):
+            if not self.is_skipped(moment):
+                yield moment
+            moment += step
+
+    @property
+    def Timed(self):
+        """Like FitnessClass.Timed: only series with a duration are checked for trainer conflicts."""
+        return self.duration > DEFAULT_DURATION
+
+    def overlapping(self, start, end):
+        """Returns the first occurrence overlapping [start, end), or None."""
+        return next(self.occurrence_times(schedule_key(start) - self.duration + MICROSECOND, end), None)
+
+    def conflicting_occurrence(self, other: "ClassSeries"):
+        """Returns an occurrence of this series overlapping one of `other`, or None.
+
+        Two recurrences repeat their relative timing every lcm of their steps,
+        so past the later start and the last skipped date one such period
+        (plus a step of margin) covers every case.
+        """
+        period = datetime.timedelta(days=math.lcm(self.step.days, other.step.days))
+        begin = max(self.start, other.start - self.duration)
+        end = max([begin, *map(schedule_key, self.exceptions), *map(schedule_key, other.exceptions)]) \
+            + period + self.step
+        for moment in self.occurrence_times(begin, end):
+            if other.overlapping(moment, moment + self.duration) is not None:
+                return moment
+        return None
+
+    def is_occurrence(self, moment) -> bool:
+        moment = schedule_key(moment)
+        return next(self.occurrence_times(moment, moment + MICROSECOND), None) == moment
+
+    def materialize(self, moment) -> "FitnessClass":
+        """Returns the class for one occurrence, scheduling it on first use."""
+        moment = schedule_key(moment)
+        cls = self.occurrences.get(moment)
+        if cls is not None:
+            return cls
+        # Concurrent first bookings of an occurrence must create a single class.
+        with self.fms.series_lock:
+            cls = self.occurrences.get(moment)
+            if cls is None:
+                if not self.is_occurrence(moment):
+                    raise ValueError(f"{self.name} has no occurrence at {moment}")
+                cls = FitnessClass(self.fms, self.name, self.trainer, self.capacity, moment, duration=self.duration)
+                self.fms.add_class(cls, series=self)
+                self.attach_occurrence(cls)
+                self.fms.log("materialize_occurrence", self.uuid, cls.ID)
+        return cls
+
+    def attach_occurrence(self, cls: "FitnessClass"):
+        self.occurrences[schedule_key(cls.schedule)] = cls
+
+    def book(self, member: Member, moment) -> bool:
+        return self.materialize(moment).enroll_member(member)
+
+    def skip(self, moment):
+        """Cancels one future occurrence (or, given a date, that day's); a booked occurrence keeps its class."""
+        self.exceptions.add(moment)
+        self.fms.log("skip_occurrence", self.uuid, moment.isoformat())
+
+    def occurrences_between(self, start, end):
+        return [Occurrence(moment, self, self.occurrences.get(moment)) for moment in self.occurrence_times(start, end)]
+
+
 class Transaction(Base):
     """Represents a payment transaction."""
+    __slots__ = ("member", "amount_paid", "payment_date", "membership_type")
+
     def __init__(self, fms: "FitnessManagementSystem", member: Member, amount_paid: float, 
-                 paymant_date: datetime, membership_type: MEMBERSHIP_TYPE):
-        super().__init__(fms)
+                 paymant_date: datetime, membership_type: MEMBERSHIP_TYPE, uuid: int = None):
+        super().__init__(fms, uuid)
         self.member = member
 
         if amount_paid <= 0:
@@ -191,39 +571,699 @@ class Transaction(Base):
         self.membership_type = membership_type
     
     def generate_receipt(self):
-        return (
-            f"Receipt for Transaction #{self.ID}\n"
-            f"Member: {self.member.Name}\n"
-            f"Membership: {self.membership_type.name} (${self.amount_paid})\n"
-            f"Date: {self.payment_date.strftime('%Y-%m-%d')}\n"
-            f"Amount Paid: ${self.amount_paid}"
-        )
+        amount = format_amount(self.amount_paid)
+        return RECEIPT.format(self.ID, self.member.Name, self.membership_type.name, amount,
+                              self.payment_date.strftime('%Y-%m-%d'), amount)
     
     @property
     def Member(self):
         return self.member
     
     @property
-    def Member(self):
+    def AmountPaid(self):
         return self.amount_paid
     
     @property
     def PaymantDate(self):
-        return self.paymant_date
+        return self.payment_date
     
     @property
     def MembershipType(self):
         return self.membership_type
 
 
+# Rendered receipts kept by TransactionLedger.receipt().
+RECEIPT_CACHE_SIZE = 10_000
+US_PER_DAY = 86_400_000_000
+TYPE_NAMES = {membership_type.value: membership_type.name for membership_type in MEMBERSHIP_TYPE}
+
+# Number of locks shared by all classes (and, separately, all members); an entity uses lock ID % stripes.
+LOCK_STRIPES = 64
+
+
+def member_error(name, age, membership_type, fitness_goals):
+    """Returns why the member fields are invalid, or None."""
+    if not isinstance(name, str) or not name:
+        return "The name should be a non empty string"
+    if not isinstance(age, int) or not 1 <= age <= 120:
+        return "The age should be an int from 1 to 120"
+    if not isinstance(membership_type, MEMBERSHIP_TYPE) or not isinstance(fitness_goals, FITNESS_GOAL):
+        return "Unknown membership type or fitness goal"
+    return None
+
+
+class BulkResult:
+    """Outcome of a bulk call: IDs of the rows that were applied and (row index, row, error) of those that were not."""
+    def __init__(self):
+        self.ids = []
+        self.failures = []
+
+    def fail(self, index: int, row, error: str):
+        self.failures.append((index, row, error))
+
+    @property
+    def ok(self):
+        return not self.failures
+
+
+class Waitlist:
+    """FIFO waitlist of one class with a lane per membership type: VIP is served before PREMIUM before BASIC.
+
+    Each lane is a deque, so joining and promotion are O(1). Leaving only drops
+    the member from `waiting`; their stale queue entry is skipped when reached.
+    """
+    PRIORITY = (MEMBERSHIP_TYPE.VIP, MEMBERSHIP_TYPE.PREMIUM, MEMBERSHIP_TYPE.BASIC)
+
+    def __init__(self):
+        self.lanes = {lane: deque() for lane in self.PRIORITY}
+        # Member ID -> (lane, ticket) of the live entry; the ticket tells a re-join from a stale entry.
+        self.waiting = {}
+        self.tickets = 0
+
+    def add(self, member: Member, lane: MEMBERSHIP_TYPE = None) -> bool:
+        if member.ID in self.waiting:
+            return False
+        lane = lane if lane is not None else member.membership_type
+        self.tickets += 1
+        self.waiting[member.ID] = (lane, self.tickets)
+        self.lanes[lane].append((self.tickets, member))
+        return True
+
+    def remove(self, member: Member) -> bool:
+        return self.waiting.pop(member.ID, None) is not None
+
+    def pop(self):
+        """Removes and returns the next member to promote, or None."""
+        for lane in self.PRIORITY:
+            queue = self.lanes[lane]
+            while queue:
+                ticket, member = queue.popleft()
+                if self.waiting.get(member.ID, (None, None))[1] == ticket:
+                    del self.waiting[member.ID]
+                    return member
+        return None
+
+    def entries(self):
+        """Yields (member, lane) of the live entries in promotion order."""
+        for lane in self.PRIORITY:
+            for ticket, member in self.lanes[lane]:
+                if self.waiting.get(member.ID, (None, None))[1] == ticket:
+                    yield member, lane
+
+    def __contains__(self, member: Member):
+        return member.ID in self.waiting
+
+    def __len__(self):
+        return len(self.waiting)
+
+
+class MemberIndex:
+    """Secondary indexes over the active members.
+
+    Hash indexes map membership type and fitness goal to member IDs; ages and
+    case-folded names are kept as sorted (key, ID) lists for range and prefix
+    lookups with bisect.
+    """
+    def __init__(self):
+        self.by_type = {}
+        self.by_goal = {}
+        self.ages = []
+        self.names = []
+        # Sorted member IDs, for keyset pagination.
+        self.ids = []
+
+    @staticmethod
+    def name_key(name: str) -> str:
+        return name.casefold()
+
+    def add(self, member: Member):
+        # Everything that can fail on a bad field runs before the first change.
+        name_key = self.name_key(member.name)
+        bisect.insort(self.ages, (member.age, member.ID))
+        self.by_type.setdefault(member.membership_type, set()).add(member.ID)
+        self.by_goal.setdefault(member.fitness_goals, set()).add(member.ID)
+        bisect.insort(self.names, (name_key, member.ID))
+        if not self.ids or member.ID > self.ids[-1]:
+            self.ids.append(member.ID)
+        else:
+            bisect.insort(self.ids, member.ID)
+
+    def add_many(self, members):
+        """Indexes a batch with one sort per list instead of an insort per member."""
+        for member in members:
+            self.by_type.setdefault(member.membership_type, set()).add(member.ID)
+            self.by_goal.setdefault(member.fitness_goals, set()).add(member.ID)
+            self.ages.append((member.age, member.ID))
+            self.names.append((self.name_key(member.name), member.ID))
+            self.ids.append(member.ID)
+        self.ages.sort()
+        self.names.sort()
+        self.ids.sort()
+
+    def remove(self, member: Member):
+        self.by_type.get(member.membership_type, set()).discard(member.ID)
+        self.by_goal.get(member.fitness_goals, set()).discard(member.ID)
+        for entries, entry in ((self.ages, (member.age, member.ID)),
+                               (self.names, (self.name_key(member.name), member.ID)), (self.ids, member.ID)):
+            pos = bisect.bisect_left(entries, entry)
+            if pos < len(entries) and entries[pos] == entry:
+                del entries[pos]
+
+    def retype(self, member: Member, old_type: MEMBERSHIP_TYPE):
+        self.by_type.get(old_type, set()).discard(member.ID)
+        self.by_type.setdefault(member.membership_type, set()).add(member.ID)
+
+    def age_range(self, low=None, high=None):
+        """(lo, hi) positions in `ages` of the members aged low..high, both inclusive."""
+        lo = bisect.bisect_left(self.ages, (low,)) if low is not None else 0
+        hi = bisect.bisect_left(self.ages, (high + 1,)) if high is not None else len(self.ages)
+        return lo, hi
+
+    def prefix_range(self, prefix: str):
+        """(lo, hi) positions in `names` of the names starting with `prefix`, ignoring case."""
+        prefix = self.name_key(prefix)
+        return bisect.bisect_left(self.names, (prefix,)), bisect.bisect_left(self.names, (prefix + "\U0010ffff",))
+
+
+class MemberQuery:
+    """Composable member search: each method narrows the query and returns it.
+
+    Running the query reads the candidates from the most selective index and
+    checks the remaining conditions on those members only, e.g.
+    fms.query_members().of_type(VIP).with_goal(ENDURANCE).aged(30, 40).ids()
+    """
+    def __init__(self, fms: "FitnessManagementSystem"):
+        self.fms = fms
+        self.membership_type = None
+        self.fitness_goal = None
+        self.age = None
+        self.name_prefix = None
+
+    def of_type(self, membership_type: MEMBERSHIP_TYPE):
+        self.membership_type = membership_type
+        return self
+
+    def with_goal(self, fitness_goal: FITNESS_GOAL):
+        self.fitness_goal = fitness_goal
+        return self
+
+    def aged(self, low: int = None, high: int = None):
+        self.age = (low, high)
+        return self
+
+    def named(self, prefix: str):
+        self.name_prefix = prefix
+        return self
+
+    def candidates(self):
+        """Returns (estimated size, IDs) from the most selective index, or None if nothing is filtered."""
+        index = self.fms.member_index
+        options = []
+        if self.membership_type is not None:
+            ids = index.by_type.get(self.membership_type, ())
+            options.append((len(ids), lambda ids=ids: ids))
+        if self.fitness_goal is not None:
+            ids = index.by_goal.get(self.fitness_goal, ())
+            options.append((len(ids), lambda ids=ids: ids))
+        if self.age is not None:
+            lo, hi = index.age_range(*self.age)
+            options.append((hi - lo, lambda lo=lo, hi=hi: [uuid for _, uuid in index.ages[lo:hi]]))
+        if self.name_prefix is not None:
+            lo, hi = index.prefix_range(self.name_prefix)
+            options.append((hi - lo, lambda lo=lo, hi=hi: [uuid for _, uuid in index.names[lo:hi]]))
+        if not options:
+            return None
+        return min(options, key=lambda option: option[0])
+
+    def matches(self, member: Member) -> bool:
+        if self.membership_type is not None and member.membership_type != self.membership_type:
+            return False
+        if self.fitness_goal is not None and member.fitness_goals != self.fitness_goal:
+            return False
+        if self.age is not None:
+            low, high = self.age
+            if (low is not None and member.age < low) or (high is not None and member.age > high):
+                return False
+        if self.name_prefix is not None:
+            return MemberIndex.name_key(member.name).startswith(MemberIndex.name_key(self.name_prefix))
+        return True
+
+    def ids(self):
+        """Matching member IDs in ascending order."""
+        members = self.fms.members
+        best = self.candidates()
+        if best is None:
+            return sorted(members)
+        return sorted(uuid for uuid in best[1]() if self.matches(members[uuid]))
+
+    def __iter__(self):
+        members = self.fms.members
+        return (members[uuid] for uuid in self.ids())
+
+    def count(self) -> int:
+        return len(self.ids())
+
+
+class TrainerTimetable:
+    """One trainer's classes as (start, end, class ID) slots sorted by start time."""
+    __slots__ = ("slots",)
+
+    def __init__(self):
+        self.slots = []
+
+    def add(self, slot):
+        bisect.insort(self.slots, slot)
+
+    def remove(self, slot):
+        pos = bisect.bisect_left(self.slots, slot)
+        if pos < len(self.slots) and self.slots[pos] == slot:
+            del self.slots[pos]
+
+    def overlapping(self, start, end):
+        """Returns the ID of a class overlapping [start, end), or None.
+
+        Only the neighbours of the insertion point are checked, which is exact
+        as long as the timetable itself has no overlaps (what scheduling and
+        assignment maintain).
+        """
+        pos = bisect.bisect_left(self.slots, (start,))
+        if pos > 0 and self.slots[pos - 1][1] > start:
+            return self.slots[pos - 1][2]
+        if pos < len(self.slots) and self.slots[pos][0] < end:
+            return self.slots[pos][2]
+        return None
+
+    def conflicts(self):
+        """Yields (earlier ID, later ID) for every overlapping pair, sweeping the slots once."""
+        running = []    # heap of (end, class ID) of the classes still going on
+        for start, end, class_id in self.slots:
+            while running and running[0][0] <= start:
+                heapq.heappop(running)
+            for _, other in running:
+                yield other, class_id
+            heapq.heappush(running, (end, class_id))
+
+    def __len__(self):
+        return len(self.slots)
+
+
+class RevenueAggregates:
+    """Running revenue totals, updated on every processed payment."""
+    def __init__(self):
+        self.total = 0
+        self.by_type = {}
+        self.by_member = {}
+        self.by_day = {}
+        self.by_month = {}
+
+    def add(self, member_id: int, amount: float, payment_date: datetime, membership_type: MEMBERSHIP_TYPE):
+        day = payment_date.date() if isinstance(payment_date, datetime.datetime) else payment_date
+        month = (day.year, day.month)
+
+        self.total += amount
+        self.by_type[membership_type] = self.by_type.get(membership_type, 0) + amount
+        self.by_member[member_id] = self.by_member.get(member_id, 0) + amount
+        self.by_day[day] = self.by_day.get(day, 0) + amount
+        self.by_month[month] = self.by_month.get(month, 0) + amount
+
+    @classmethod
+    def rebuild(cls, transactions):
+        """Recomputes the aggregates from scratch over an iterable of transactions."""
+        aggregates = cls()
+        for txn in transactions:
+            aggregates.add(txn.member.ID, txn.amount_paid, txn.payment_date, txn.membership_type)
+        return aggregates
+
+    def __eq__(self, other):
+        return (isinstance(other, RevenueAggregates)
+                and self.total == other.total
+                and self.by_type == other.by_type
+                and self.by_member == other.by_member
+                and self.by_day == other.by_day
+                and self.by_month == other.by_month)
+
+
+# Aggregate of the measurements in one period; mean is None when the period is empty.
+Summary = namedtuple("Summary", "start count mean low high")
+
+# Measurements newer than this (relative to the latest one) are kept as recorded; older ones are
+# folded into per-week buckets (count, total, min, max), aligned to Mondays.
+RAW_RETENTION = datetime.timedelta(days=90)
+BUCKET_WIDTH = datetime.timedelta(weeks=1)
+BUCKET_ORIGIN = datetime.datetime(1970, 1, 5)
+
+
+class ProgressSeries:
+    """Timestamped values of one metric of one member, in typed arrays sorted by time.
+
+    Recent measurements are kept individually; older ones are downsampled to
+    weekly buckets as new data arrives, so years of daily logs take a few
+    kilobytes. Range queries bisect to the range and only read what is in it.
+    """
+    __slots__ = ("times", "values", "buckets", "counts", "totals", "lows", "highs")
+
+    def __init__(self):
+        self.times = array('q')     # epoch microseconds
+        self.values = array('d')
+        self.buckets = array('q')   # bucket start, epoch microseconds
+        self.counts = array('q')
+        self.totals = array('d')
+        self.lows = array('d')
+        self.highs = array('d')
+
+    @staticmethod
+    def bucket_of(stamp: int) -> int:
+        origin = to_epoch_us(BUCKET_ORIGIN)
+        width = BUCKET_WIDTH // MICROSECOND
+        return origin + (stamp - origin) // width * width
+
+    def cutoff(self):
+        """Start of the raw window: measurements before it live in buckets."""
+        if not self.times:
+            return None
+        return self.bucket_of(self.times[-1] - RAW_RETENTION // MICROSECOND)
+
+    def add(self, at, value: float):
+        stamp = to_epoch_us(at)
+        cutoff = self.cutoff()
+        if cutoff is not None and stamp < cutoff:
+            self.fold(stamp, value)
+            return
+        if not self.times or stamp >= self.times[-1]:
+            self.times.append(stamp)
+            self.values.append(value)
+        else:
+            pos = bisect.bisect_right(self.times, stamp)
+            self.times.insert(pos, stamp)
+            self.values.insert(pos, value)
+
+        cutoff = self.cutoff()
+        if self.times[0] < cutoff:
+            self.compact(cutoff)
+
+    def fold(self, stamp: int, value: float):
+        bucket = self.bucket_of(stamp)
+        pos = bisect.bisect_left(self.buckets, bucket)
+        if pos < len(self.buckets) and self.buckets[pos] == bucket:
+            self.counts[pos] += 1
+            self.totals[pos] += value
+            self.lows[pos] = min(self.lows[pos], value)
+            self.highs[pos] = max(self.highs[pos], value)
+        else:
+            for column, item in zip(self.bucket_columns(), (bucket, 1, value, value, value)):
+                column.insert(pos, item)
+
+    def compact(self, before: int):
+        """Folds the raw measurements taken before `before` into their buckets."""
+        n = bisect.bisect_left(self.times, before)
+        for stamp, value in zip(self.times[:n], self.values[:n]):
+            self.fold(stamp, value)
+        del self.times[:n]
+        del self.values[:n]
+
+    def raw_columns(self):
+        return (self.times, self.values)
+
+    def bucket_columns(self):
+        return (self.buckets, self.counts, self.totals, self.lows, self.highs)
+
+    def __len__(self):
+        return len(self.times) + sum(self.counts)
+
+    # ----- Queries -----
+    def latest(self):
+        if not self.times:
+            return None
+        return from_epoch_us(self.times[-1]), self.values[-1]
+
+    def raw_range(self, start, end):
+        start, end = to_epoch_us(start), to_epoch_us(end)
+        return bisect.bisect_left(self.times, start), bisect.bisect_left(self.times, end)
+
+    def bucket_range(self, start, end):
+        start, end = to_epoch_us(start), to_epoch_us(end)
+        return bisect.bisect_left(self.buckets, start), bisect.bisect_left(self.buckets, end)
+
+    def points(self, start, end):
+        """(datetime, value) of the individually kept measurements in [start, end)."""
+        lo, hi = self.raw_range(start, end)
+        return [(from_epoch_us(stamp), value) for stamp, value in zip(self.times[lo:hi], self.values[lo:hi])]
+
+    def trend(self, start, end, step: datetime.timedelta = BUCKET_WIDTH):
+        """Summary per `step` period of [start, end), for charting.
+
+        Downsampled data counts in the period its bucket starts in, so periods
+        shorter than a week only have full resolution in the raw window.
+        """
+        start_us, step_us = to_epoch_us(start), step // MICROSECOND
+        periods = {}
+
+        def merge(stamp, count, total, low, high):
+            key = (stamp - start_us) // step_us
+            current = periods.get(key)
+            if current is None:
+                periods[key] = [count, total, low, high]
+            else:
+                current[0] += count
+                current[1] += total
+                current[2] = min(current[2], low)
+                current[3] = max(current[3], high)
+
+        lo, hi = self.bucket_range(start, end)
+        for row in zip(*(column[lo:hi] for column in self.bucket_columns())):
+            merge(*row)
+        lo, hi = self.raw_range(start, end)
+        for stamp, value in zip(self.times[lo:hi], self.values[lo:hi]):
+            merge(stamp, 1, value, value, value)
+
+        return [Summary(from_epoch_us(start_us + key * step_us), count, total / count, low, high)
+                for key, (count, total, low, high) in sorted(periods.items())]
+
+    def summary(self, start, end) -> Summary:
+        """One Summary over [start, end)."""
+        length = schedule_key(end) - schedule_key(start)
+        periods = self.trend(start, end, length) if length > datetime.timedelta(0) else []
+        return periods[0] if periods else Summary(schedule_key(start), 0, None, None, None)
+
+    def rolling_mean(self, window: datetime.timedelta, start, end):
+        """(datetime, mean of the measurements in the preceding `window`) for each raw measurement in [start, end)."""
+        if window <= datetime.timedelta(0):
+            raise ValueError("The window should be a positive timedelta")
+        lo, hi = self.raw_range(start, end)
+        window_us = window // MICROSECOND
+        first = bisect.bisect_right(self.times, self.times[lo] - window_us) if lo < hi else lo
+        total = sum(self.values[first:lo])
+        means = []
+        for pos in range(lo, hi):
+            total += self.values[pos]
+            while self.times[first] <= self.times[pos] - window_us:
+                total -= self.values[first]
+                first += 1
+            means.append((from_epoch_us(self.times[pos]), total / (pos - first + 1)))
+        return means
+
+
+class TransactionLedger(Mapping):
+    """Column-wise transaction store: a mapping of transaction ID -> Transaction.
+
+    Rows live in typed arrays (ID, member ID, amount, payment date as epoch
+    microseconds, membership type code), sorted by transaction ID.
+    Transaction objects are only materialized when a row is looked up.
+    """
+    def __init__(self, fms: "FitnessManagementSystem"):
+        self.fms = fms
+        self.uuids = array('q')
+        self.member_ids = array('q')
+        self.amounts = array('d')
+        self.dates = array('q')
+        self.types = array('b')
+        # One reference per paying member, so rows of cancelled members still resolve.
+        self.payers = {}
+        # Transaction ID -> (member name, rendered receipt), least recently used first.
+        self.receipt_cache = OrderedDict()
+        self.receipt_cache_size = RECEIPT_CACHE_SIZE
+        self.receipt_lock = threading.Lock()
+
+    def append(self, transaction: "Transaction"):
+        self.add_row(transaction.ID, transaction.member, transaction.amount_paid,
+                     transaction.payment_date, transaction.membership_type)
+
+    def add_row(self, uuid: int, member: Member, amount: float, payment_date: datetime,
+                membership_type: MEMBERSHIP_TYPE):
+        self.payers[member.ID] = member
+        row = (uuid, member.ID, amount, to_epoch_us(payment_date), membership_type.value)
+
+        if not self.uuids or uuid > self.uuids[-1]:
+            for column, value in zip(self.columns(), row):
+                column.append(value)
+        else:
+            pos = bisect.bisect_left(self.uuids, uuid)
+            for column, value in zip(self.columns(), row):
+                column.insert(pos, value)
+
+    def columns(self):
+        return (self.uuids, self.member_ids, self.amounts, self.dates, self.types)
+
+    def find(self, uuid: int) -> int:
+        pos = bisect.bisect_left(self.uuids, uuid)
+        if pos < len(self.uuids) and self.uuids[pos] == uuid:
+            return pos
+        return -1
+
+    def row(self, pos: int) -> "Transaction":
+        amount = self.amounts[pos]
+        return Transaction(self.fms, self.payers[self.member_ids[pos]],
+                           int(amount) if amount.is_integer() else amount,
+                           from_epoch_us(self.dates[pos]), MEMBERSHIP_TYPE(self.types[pos]),
+                           uuid=self.uuids[pos])
+
+    def __getitem__(self, uuid: int) -> "Transaction":
+        pos = self.find(uuid)
+        if pos < 0:
+            raise KeyError(uuid)
+        return self.row(pos)
+
+    def __contains__(self, uuid):
+        return self.find(uuid) >= 0
+
+    def __iter__(self):
+        return iter(self.uuids)
+
+    def __len__(self):
+        return len(self.uuids)
+
+    # ----- Column reports -----
+    def total(self):
+        return sum(self.amounts)
+
+    def revenue_by_type(self):
+        totals = {}
+        for code, amount in zip(self.types, self.amounts):
+            totals[code] = totals.get(code, 0) + amount
+        return {MEMBERSHIP_TYPE(code): total for code, total in totals.items()}
+
+    def revenue_by_month(self):
+        us_per_day = 86_400_000_000
+        by_day = {}
+        for stamp, amount in zip(self.dates, self.amounts):
+            day = stamp // us_per_day
+            by_day[day] = by_day.get(day, 0) + amount
+
+        by_month = {}
+        for day, amount in by_day.items():
+            date = EPOCH + datetime.timedelta(days=day)
+            key = (date.year, date.month)
+            by_month[key] = by_month.get(key, 0) + amount
+        return dict(sorted(by_month.items()))
+
+    # ----- Receipts -----
+    def render(self, pos: int, day_texts: dict = None) -> str:
+        """Renders the receipt of a row straight from the columns; `day_texts` memoizes date strings."""
+        stamp = self.dates[pos]
+        day = stamp // US_PER_DAY
+        date_text = day_texts.get(day) if day_texts is not None else None
+        if date_text is None:
+            date_text = (EPOCH + datetime.timedelta(days=day)).strftime('%Y-%m-%d')
+            if day_texts is not None:
+                day_texts[day] = date_text
+        amount = format_amount(self.amounts[pos])
+        return RECEIPT.format(self.uuids[pos], self.payers[self.member_ids[pos]].name,
+                              TYPE_NAMES[self.types[pos]], amount, date_text, amount)
+
+    def receipt(self, uuid: int) -> str:
+        """The receipt of one transaction, from an LRU cache that is bypassed once the member is renamed."""
+        pos = self.find(uuid)
+        if pos < 0:
+            raise KeyError(uuid)
+        name = self.payers[self.member_ids[pos]].name
+        with self.receipt_lock:
+            cached = self.receipt_cache.get(uuid)
+            if cached is not None and cached[0] == name:
+                self.receipt_cache.move_to_end(uuid)
+                return cached[1]
+
+        text = self.render(pos)
+        with self.receipt_lock:
+            self.receipt_cache[uuid] = (name, text)
+            self.receipt_cache.move_to_end(uuid)
+            if len(self.receipt_cache) > self.receipt_cache_size:
+                self.receipt_cache.popitem(last=False)
+        return text
+
+    def receipts(self, start=None, end=None, member_ids=None):
+        """Yields (transaction ID, receipt) for payments in [start, end), optionally only of some members.
+
+        Meant for month-end runs: rows are rendered from the columns in ID
+        order without materializing Transactions or filling the LRU cache.
+        """
+        start_us = to_epoch_us(start) if start is not None else None
+        end_us = to_epoch_us(end) if end is not None else None
+        member_ids = set(member_ids) if member_ids is not None else None
+        day_texts = {}
+        for pos, (stamp, member_id) in enumerate(zip(self.dates, self.member_ids)):
+            if start_us is not None and stamp < start_us:
+                continue
+            if end_us is not None and stamp >= end_us:
+                continue
+            if member_ids is not None and member_id not in member_ids:
+                continue
+            yield self.uuids[pos], self.render(pos, day_texts)
+
+    def top_payers(self, n: int):
+        """Returns [(member, total paid)] for the n members who paid the most."""
+        totals = {}
+        for member_id, amount in zip(self.member_ids, self.amounts):
+            totals[member_id] = totals.get(member_id, 0) + amount
+        top = heapq.nlargest(n, totals.items(), key=lambda item: item[1])
+        return [(self.payers[member_id], total) for member_id, total in top]
+
+
 class FitnessManagementSystem:
     """Central management class for all members, trainers, classes, and transactions."""
     def __init__(self):
         self.members = {}
         self.trainers = {}
         self.classes = {}
-        self.transatcions = {}
+        self.transatcions = TransactionLedger(self)
+        # Reverse index: member ID -> {class ID: FitnessClass} of the classes the member is booked into.
+        self.member_bookings = {}
+        # Trainer ID -> {class ID: FitnessClass} of the classes the trainer teaches.
+        self.trainer_classes = {}
+        # Sorted list of (schedule, class ID) used for time range queries.
+        self.schedule_index = []
+        self.revenue = RevenueAggregates()
+        # Optional write-ahead journal (see journal.py); None keeps mutations unlogged.
+        self.journal = None
+        # Optional instrumentation (see metrics.py); None keeps the hot paths unmeasured.
+        self.metrics = None
+        # Striped booking locks: a class lock is taken before a member lock, never the other way round.
+        self.class_locks = [threading.Lock() for _ in range(LOCK_STRIPES)]
+        self.member_locks = [threading.Lock() for _ in range(LOCK_STRIPES)]
+        # Guards the shared schedule index, ledger and revenue aggregates.
+        self.write_lock = threading.Lock()
+        # Class ID -> Waitlist for full classes, and member ID -> IDs of the classes they wait for.
+        self.waitlists = {}
+        self.member_waitlists = {}
+        # Recurring class series by ID; their occurrences are expanded lazily.
+        self.series = {}
+        self.series_lock = threading.Lock()
+        # Trainer ID -> TrainerTimetable, for conflict checks.
+        self.trainer_timetables = {}
+        self.member_index = MemberIndex()
+
+    def class_lock(self, class_id: int) -> threading.Lock:
+        return self.class_locks[class_id % LOCK_STRIPES]
+
+    def member_lock(self, member_id: int) -> threading.Lock:
+        return self.member_locks[member_id % LOCK_STRIPES]
     
+    def log(self, op: str, *args):
+        """Records a mutation in the attached journal and counts it in the attached metrics, if any."""
+        if self.journal is not None:
+            self.journal.append(op, *args)
+        if self.metrics is not None:
+            self.metrics.mutation(op)
+
     # ----- Member Management -----
     @property
     def Members(self):
@@ -234,14 +1274,105 @@ class FitnessManagementSystem:
     
     def register_member(self, name: str,  age: int, 
                  membership_type: MEMBERSHIP_TYPE, fitness_goals: FITNESS_GOAL): 
+        error = member_error(name, age, membership_type, fitness_goals)
+        if error is not None:
+            raise ValueError(error)
         new_member = Member(self, name, age, membership_type, fitness_goals)
-        self.members[new_member.ID] = new_member
+        # Journal under the same lock, so no operation on the new member can be logged before it.
+        with self.write_lock:
+            self.index_member(new_member)
+            self.log("register_member", new_member.ID, name, age, membership_type.value, fitness_goals.value)
         return new_member
+
+    def register_members(self, rows) -> BulkResult:
+        """Registers (name, age, membership_type, fitness_goals) rows; invalid rows are reported, not raised."""
+        result = BulkResult()
+        valid = []
+        for index, row in enumerate(rows):
+            try:
+                name, age, membership_type, fitness_goals = row
+            except (TypeError, ValueError):
+                result.fail(index, row, "Expected (name, age, membership_type, fitness_goals)")
+                continue
+            error = member_error(name, age, membership_type, fitness_goals)
+            if error is not None:
+                result.fail(index, row, error)
+            else:
+                valid.append(row)
+
+        members = [Member(self, name, age, membership_type, fitness_goals, uuid=uuid)
+                   for uuid, (name, age, membership_type, fitness_goals) in zip(reserve_ids(len(valid)), valid)]
+        with self.write_lock:
+            self.index_members(members)
+            for member in members:
+                self.log("register_member", member.ID, member.name, member.age, member.membership_type.value,
+                         member.fitness_goals.value)
+                result.ids.append(member.ID)
+        return result
+
+    def attach_member(self, member: Member):
+        """Adds an already constructed member (new or restored from storage) to the system."""
+        with self.write_lock:
+            self.index_member(member)
+
+    def attach_members(self, members):
+        """attach_member for a batch, sorting the member indexes once."""
+        with self.write_lock:
+            self.index_members(members)
+
+    def index_member(self, member: Member):
+        # The caller holds the write lock.
+        self.member_index.add(member)
+        self.members[member.ID] = member
+
+    def index_members(self, members):
+        # The caller holds the write lock.
+        for member in members:
+            self.members[member.ID] = member
+        self.member_index.add_many(members)
+
+    def query_members(self) -> MemberQuery:
+        return MemberQuery(self)
+
+    def members_page(self, limit: int, after: int = None, query: MemberQuery = None):
+        """Returns up to `limit` members with IDs above `after`, in ID order, and the cursor for the next page.
+
+        Pages are keyed by member ID, so registrations and cancellations
+        between calls never shift or repeat entries. The cursor is None after
+        the last page. With a `query`, only matching members are returned.
+        """
+        if not isinstance(limit, int) or limit < 1:
+            raise ValueError("The limit should be a positive int")
+        ids = self.member_index.ids
+        pos = bisect.bisect_right(ids, after) if after is not None else 0
+        page = []
+        while pos < len(ids) and len(page) < limit:
+            member = self.members.get(ids[pos])
+            if member is not None and (query is None or query.matches(member)):
+                page.append(member)
+            pos += 1
+        cursor = page[-1].ID if page and pos < len(ids) else None
+        return page, cursor
+
+    def iter_members(self, query: MemberQuery = None, page_size: int = 1000):
+        """Streams members in ID order, one page at a time."""
+        cursor = None
+        while True:
+            page, cursor = self.members_page(page_size, cursor, query)
+            yield from page
+            if cursor is None:
+                return
     
     def cancel_membership(self, member: Member):
-        self.members.pop(member.ID)
-        for cls in self.classes.values():
+        with self.write_lock:
+            self.members.pop(member.ID)
+            self.member_index.remove(member)
+        # Leave the waitlists first, so freed spots elsewhere can't promote the leaving member.
+        for class_id in list(self.member_waitlists.get(member.ID, ())):
+            self.classes[class_id].leave_waitlist(member)
+        for cls in list(self.member_bookings.get(member.ID, {}).values()):
             cls.cancel_booking(member)
+        self.log("cancel_membership", member.ID)
     
     def view_member_progress(self, member_id):
         member = self.members.get(member_id)
@@ -256,14 +1387,21 @@ class FitnessManagementSystem:
 
     def add_trainer(self, name: str, specialization: SPECIALIZATION):
         new_trainer = Trainer(self, name, specialization)
-        self.trainers[new_trainer.ID] = new_trainer
+        self.attach_trainer(new_trainer)
+        self.log("add_trainer", new_trainer.ID, name, specialization.value)
         return new_trainer
+
+    def attach_trainer(self, trainer: Trainer):
+        self.trainers[trainer.ID] = trainer
     
     def remove_trainer(self, trainer: Trainer):
         self.trainers.pop(trainer.ID)
-        for cls in self.classes.values():
-            if cls.trainer == trainer:
-                 cls.trainer = None
+        for cls in list(self.trainer_classes.get(trainer.ID, {}).values()):
+            cls.Trainer = None
+        for series in self.series.values():
+            if series.trainer == trainer:
+                series.trainer = None
+        self.log("remove_trainer", trainer.ID)
     
     # ----- Class Management -----
     @property
@@ -271,23 +1409,312 @@ class FitnessManagementSystem:
         return self.classes
 
     def schedule_class(self, name: str, trainer: Trainer, 
-                 capacity: int, schedule: datetime):
-        new_class = FitnessClass(self, name, trainer, capacity, schedule)
-        self.classes[new_class.ID] = new_class
+                 capacity: int, schedule: datetime, duration: datetime.timedelta = DEFAULT_DURATION):
+        """Raises ValueError if the trainer already teaches a class or series overlapping the new one."""
+        if duration < datetime.timedelta(0):
+            raise ValueError("The duration should not be negative")
+        new_class = FitnessClass(self, name, trainer, capacity, schedule, duration=duration)
+        self.add_class(new_class)
         return new_class
+
+    def add_class(self, cls: FitnessClass, series: "ClassSeries" = None):
+        """Checks and indexes a new class; `series` is the series it is an occurrence of, if any."""
+        with self.write_lock:
+            if cls.trainer is not None:
+                self.check_trainer_free(cls.trainer, cls, series)
+            self.index_class(cls)
+            self.log("schedule_class", cls.ID, cls.name, cls.trainer.ID if cls.trainer is not None else None,
+                     cls.capacity, cls.schedule.isoformat(), duration_seconds(cls.duration))
+
+    def schedule_classes(self, rows) -> BulkResult:
+        """Schedules (name, trainer, capacity, schedule[, duration]) rows and merges them into the schedule index at once.
+
+        Rows whose trainer is already busy at that time, in the system or
+        earlier in the batch, are reported as failures.
+        """
+        result = BulkResult()
+        valid = []
+        for index, row in enumerate(rows):
+            try:
+                name, trainer, capacity, schedule, *rest = row
+                (duration,) = rest or (DEFAULT_DURATION,)
+            except (TypeError, ValueError):
+                result.fail(index, row, "Expected (name, trainer, capacity, schedule[, duration])")
+                continue
+            if not isinstance(name, str) or not name:
+                result.fail(index, row, "The name should be a non empty string")
+            elif trainer is not None and not isinstance(trainer, Trainer):
+                result.fail(index, row, "The trainer should be a Trainer or None")
+            elif not isinstance(capacity, int) or capacity < 0:
+                result.fail(index, row, "The capacity should be a non negative int")
+            elif not isinstance(schedule, datetime.date):
+                result.fail(index, row, "The schedule should be a date or datetime")
+            elif not isinstance(duration, datetime.timedelta) or duration < datetime.timedelta(0):
+                result.fail(index, row, "The duration should be a non negative timedelta")
+            else:
+                valid.append((index, row, duration))
+
+        keys = []
+        with self.write_lock:
+            for uuid, (index, row, duration) in zip(reserve_ids(len(valid)), valid):
+                name, trainer, capacity, schedule = row[:4]
+                new_class = FitnessClass(self, name, trainer, capacity, schedule, uuid=uuid, duration=duration)
+                if trainer is not None:
+                    try:
+                        self.check_trainer_free(trainer, new_class)
+                    except ValueError as e:
+                        result.fail(index, row, str(e))
+                        continue
+                    self.index_trainer(new_class)
+                self.classes[uuid] = new_class
+                keys.append((schedule_key(schedule), uuid))
+                self.log("schedule_class", uuid, name, trainer.ID if trainer is not None else None,
+                         capacity, schedule.isoformat(), duration_seconds(duration))
+                result.ids.append(uuid)
+
+            self.schedule_index.extend(keys)
+            self.schedule_index.sort()
+        return result
+
+    def attach_class(self, cls: FitnessClass):
+        """Adds an already validated class (loading, replay) without conflict checks."""
+        with self.write_lock:
+            self.index_class(cls)
+
+    def attach_classes(self, classes):
+        """attach_class for a batch, sorting the schedule index and the trainer timetables once."""
+        with self.write_lock:
+            timetables = set()
+            for cls in classes:
+                self.classes[cls.ID] = cls
+                self.schedule_index.append((schedule_key(cls.schedule), cls.ID))
+                if cls.trainer is not None:
+                    self.trainer_classes.setdefault(cls.trainer.ID, {})[cls.ID] = cls
+                    if cls.Timed:
+                        timetable = self.trainer_timetables.setdefault(cls.trainer.ID, TrainerTimetable())
+                        timetable.slots.append(cls.Slot)
+                        timetables.add(cls.trainer.ID)
+            self.schedule_index.sort()
+            for trainer_id in timetables:
+                self.trainer_timetables[trainer_id].slots.sort()
+
+    def index_class(self, cls: FitnessClass):
+        # The caller holds the write lock.
+        self.classes[cls.ID] = cls
+        if cls.trainer is not None:
+            self.index_trainer(cls)
+        bisect.insort(self.schedule_index, (schedule_key(cls.schedule), cls.ID))
+
+    # ----- Trainer conflicts -----
+    def index_trainer(self, cls: FitnessClass):
+        self.trainer_classes.setdefault(cls.trainer.ID, {})[cls.ID] = cls
+        if cls.Timed:
+            self.trainer_timetables.setdefault(cls.trainer.ID, TrainerTimetable()).add(cls.Slot)
+
+    def unindex_trainer(self, cls: FitnessClass):
+        assigned = self.trainer_classes.get(cls.trainer.ID)
+        if assigned is not None:
+            assigned.pop(cls.ID, None)
+            if not assigned:
+                del self.trainer_classes[cls.trainer.ID]
+        timetable = self.trainer_timetables.get(cls.trainer.ID) if cls.Timed else None
+        if timetable is not None:
+            timetable.remove(cls.Slot)
+            if not timetable:
+                del self.trainer_timetables[cls.trainer.ID]
+
+    def trainer_conflict(self, trainer: Trainer, start, duration: datetime.timedelta = DEFAULT_DURATION):
+        """Returns a class of `trainer` overlapping [start, start + duration), or None; O(log n).
+
+        Classes given only a date, or no duration, never conflict (see FitnessClass.Timed).
+        """
+        timetable = self.trainer_timetables.get(trainer.ID)
+        if timetable is None or duration <= DEFAULT_DURATION or not isinstance(start, datetime.datetime):
+            return None
+        class_id = timetable.overlapping(start, start + duration)
+        return self.classes[class_id] if class_id is not None else None
+
+    def series_conflict(self, trainer: Trainer, start, duration: datetime.timedelta = DEFAULT_DURATION,
+                        exclude: "ClassSeries" = None):
+        """Returns a series of `trainer` with an occurrence overlapping [start, start + duration), or None.
+
+        Looks at every series, so the cost is O(series) on top of trainer_conflict.
+        """
+        if duration <= DEFAULT_DURATION or not isinstance(start, datetime.datetime):
+            return None
+        for series in self.series.values():
+            if series.trainer == trainer and series is not exclude and series.Timed \
+                    and series.overlapping(start, start + duration) is not None:
+                return series
+        return None
+
+    def check_trainer_free(self, trainer: Trainer, cls: FitnessClass, series: "ClassSeries" = None):
+        other = self.trainer_conflict(trainer, cls.schedule, cls.duration)
+        if other is not None:
+            raise ValueError(f"Trainer {trainer.name} already teaches {other.name} at {other.schedule}")
+        recurring = self.series_conflict(trainer, cls.schedule, cls.duration, exclude=series)
+        if recurring is not None:
+            moment = recurring.overlapping(cls.schedule, cls.schedule + cls.duration)
+            raise ValueError(f"Trainer {trainer.name} already teaches {recurring.name} at {moment}")
+
+    def check_series_free(self, trainer: Trainer, series: "ClassSeries"):
+        """Raises ValueError if an occurrence of `series` overlaps a class or another series of the trainer."""
+        if not series.Timed:
+            return
+        timetable = self.trainer_timetables.get(trainer.ID)
+        for start, end, class_id in (timetable.slots if timetable is not None else ()):
+            if series.overlapping(start, end) is not None:
+                other = self.classes[class_id]
+                raise ValueError(f"Trainer {trainer.name} already teaches {other.name} at {other.schedule}")
+        for other in self.series.values():
+            if other.trainer == trainer and other.Timed:
+                moment = series.conflicting_occurrence(other)
+                if moment is not None:
+                    raise ValueError(f"Trainer {trainer.name} already teaches {other.name} at {moment}")
+
+    def schedule_conflicts(self):
+        """Returns (class, class) pairs that overlap for the same trainer, over the whole timetable.
+
+        Scheduling rejects conflicts, so these come from data stored before
+        classes had durations. Runs in O(n log n + conflicts).
+        """
+        return [(self.classes[a], self.classes[b]) for timetable in self.trainer_timetables.values()
+                for a, b in timetable.conflicts()]
+
+    def classes_between(self, start, end):
+        """Returns classes scheduled in [start, end), ordered by schedule."""
+        lo = bisect.bisect_left(self.schedule_index, (schedule_key(start),))
+        hi = bisect.bisect_left(self.schedule_index, (schedule_key(end),))
+        return [self.classes[class_id] for _, class_id in self.schedule_index[lo:hi]]
+
+    def upcoming(self, n: int, after=None, trainer: Trainer = None):
+        """Returns the next n classes scheduled at or after `after` (default: now), optionally for one trainer."""
+        after = schedule_key(after if after is not None else datetime.datetime.now())
+        if trainer is not None:
+            candidates = [cl for cl in trainer.AssignedClasses if schedule_key(cl.schedule) >= after]
+            return heapq.nsmallest(n, candidates, key=lambda cl: (schedule_key(cl.schedule), cl.ID))
+
+        lo = bisect.bisect_left(self.schedule_index, (after,))
+        return [self.classes[class_id] for _, class_id in self.schedule_index[lo:lo + n]]
     
+    def schedule_series(self, name: str, trainer: Trainer, capacity: int, start: datetime,
+                        frequency: RECURRENCE, interval: int = 1, until: datetime = None, exceptions=(),
+                        duration: datetime.timedelta = DEFAULT_DURATION):
+        """Raises ValueError if an occurrence would overlap another class or series of the trainer."""
+        new_series = ClassSeries(self, name, trainer, capacity, start, frequency, interval, until, exceptions,
+                                 duration=duration)
+        with self.write_lock:
+            if trainer is not None:
+                self.check_series_free(trainer, new_series)
+            self.series[new_series.ID] = new_series
+            self.log("schedule_series", new_series.ID, name, trainer.ID if trainer is not None else None, capacity,
+                     new_series.start.isoformat(), frequency.value, interval,
+                     new_series.until.isoformat() if new_series.until is not None else None,
+                     sorted(day.isoformat() for day in new_series.exceptions),
+                     duration_seconds(duration))
+        return new_series
+
+    def occurrences_between(self, start, end):
+        """Timetable for [start, end): one-off classes plus series occurrences, booked or not, in time order."""
+        timetable = [Occurrence(schedule_key(cls.schedule), None, cls) for cls in self.classes_between(start, end)]
+        materialized = set()
+        for series in self.series.values():
+            for occurrence in series.occurrences_between(start, end):
+                timetable.append(occurrence)
+                if occurrence.fitness_class is not None:
+                    materialized.add(occurrence.fitness_class.ID)
+        timetable = [o for o in timetable if o.series is not None or o.fitness_class.ID not in materialized]
+        timetable.sort(key=lambda o: (o.schedule, o.series.ID if o.series is not None else o.fitness_class.ID))
+        return timetable
+
     # ----- Transactions -----
     def Transactions(self):
         return self.transatcions
 
-    def process_payment(self, member: Member, amount_paid: float, service: MEMBERSHIP_TYPE): 
-        new_transaction = Transaction(self, member, amount_paid, datetime.datetime.now(), service)
-        self.transatcions[new_transaction.ID] = new_transaction
+    def process_payment(self, member: Member, amount_paid: float, service: MEMBERSHIP_TYPE,
+                        payment_date: datetime = None): 
+        if payment_date is None:
+            payment_date = datetime.datetime.now()
+        new_transaction = Transaction(self, member, amount_paid, payment_date, service)
+        with self.write_lock:
+            self.index_transaction(new_transaction)
+            self.log("process_payment", new_transaction.ID, member.ID, amount_paid,
+                     to_epoch_us(payment_date), service.value)
         return new_transaction
+
+    def process_payments(self, rows) -> BulkResult:
+        """Records (member, amount_paid, service[, payment_date]) rows; the IDs of the new transactions are returned."""
+        result = BulkResult()
+        valid = []
+        now = datetime.datetime.now()
+        for index, row in enumerate(rows):
+            try:
+                member, amount_paid, service, *rest = row
+                payment_date = rest[0] if rest else now
+            except (TypeError, ValueError):
+                result.fail(index, row, "Expected (member, amount_paid, service[, payment_date])")
+                continue
+            if not isinstance(member, Member):
+                result.fail(index, row, "Unknown member")
+            elif not isinstance(amount_paid, (int, float)) or amount_paid <= 0:
+                result.fail(index, row, "The paiment should be positive value")
+            elif not isinstance(service, MEMBERSHIP_TYPE):
+                result.fail(index, row, "Unknown membership type")
+            elif not isinstance(payment_date, datetime.date):
+                result.fail(index, row, "The payment date should be a date or datetime")
+            else:
+                valid.append((member, amount_paid, service, payment_date))
+
+        with self.write_lock:
+            for uuid, (member, amount_paid, service, payment_date) in zip(reserve_ids(len(valid)), valid):
+                self.transatcions.add_row(uuid, member, amount_paid, payment_date, service)
+                self.revenue.add(member.ID, amount_paid, payment_date, service)
+                self.log("process_payment", uuid, member.ID, amount_paid, to_epoch_us(payment_date), service.value)
+                result.ids.append(uuid)
+        return result
+
+    def enroll_members(self, rows) -> BulkResult:
+        """Books (member, class) rows; rows for full classes are reported as failures. IDs are the class IDs."""
+        result = BulkResult()
+        for index, row in enumerate(rows):
+            try:
+                member, cls = row
+            except (TypeError, ValueError):
+                result.fail(index, row, "Expected (member, class)")
+                continue
+            if not isinstance(member, Member) or not isinstance(cls, FitnessClass):
+                result.fail(index, row, "Unknown member or class")
+            elif not cls.enroll_member(member):
+                result.fail(index, row, "The class is full")
+            else:
+                result.ids.append(cls.ID)
+        return result
+
+    def attach_transaction(self, transaction: Transaction):
+        with self.write_lock:
+            self.index_transaction(transaction)
+
+    def index_transaction(self, transaction: Transaction):
+        # The caller holds the write lock.
+        self.transatcions.append(transaction)
+        self.revenue.add(transaction.member.ID, transaction.amount_paid,
+                         transaction.payment_date, transaction.membership_type)
     
     # Summarizes total earnings from memberships and bookings
     def generate_revenue_report(self): 
-        return sum([transaction.amount_paid for transaction in self.transatcions.values()])
+        return self.revenue.total
+
+    def revenue_by_membership_type(self):
+        return dict(self.revenue.by_type)
+
+    def revenue_by_member(self, member: Member):
+        return self.revenue.by_member.get(member.ID, 0)
+
+    def revenue_by_day(self):
+        return dict(sorted(self.revenue.by_day.items()))
+
+    def revenue_by_month(self):
+        return dict(sorted(self.revenue.by_month.items()))
 
         
     
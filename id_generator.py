@@ -1,8 +1,48 @@
+import threading
+
 _id_counter = 1
+_id_lock = threading.Lock()
+# IDs advance by _id_stride; a shard of a sharded system only hands out IDs congruent to its index.
+_id_stride = 1
+_id_offset = 0
 
 def next_id() -> int:
     global _id_counter
 
-    id = _id_counter
-    _id_counter += 1
-    return id
\ No newline at end of file
+    with _id_lock:
+        id = _id_counter
+        _id_counter += _id_stride
+    return id
+
+def reserve_ids(count: int) -> range:
+    """Hands out `count` consecutive IDs in one step."""
+    global _id_counter
+
+    with _id_lock:
+        start = _id_counter
+        _id_counter += count * _id_stride
+    return range(start, start + count * _id_stride, _id_stride)
+
+def peek_next_id() -> int:
+    """Returns the ID the next call to next_id() will hand out."""
+    return _id_counter
+
+def align(value: int) -> int:
+    """Smallest ID >= value that belongs to this process' shard."""
+    return value + (_id_offset - value) % _id_stride
+
+def set_next_id(value: int):
+    """Moves the counter, e.g. after restoring state that was saved by another process."""
+    global _id_counter
+
+    with _id_lock:
+        _id_counter = align(value)
+
+def configure_shard(shard: int, shard_count: int):
+    """Makes this process hand out only IDs with ID % shard_count == shard, so shards never collide."""
+    global _id_stride, _id_offset, _id_counter
+
+    with _id_lock:
+        _id_stride = shard_count
+        _id_offset = shard
+        _id_counter = align(_id_counter)
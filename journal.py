@@ -0,0 +1,263 @@
+import json
+import os
+import threading
+import time
+
+from data_model import *
+from id_generator import peek_next_id, set_next_id
+from storage import StorageBackend
+
+
+class Journal:
+    """Append-only write-ahead log of FitnessManagementSystem mutations.
+
+    Every record is one JSON line: [sequence number, operation, *arguments].
+    Appends are buffered and fsync'ed in groups: once `group_size` records are
+    pending or `group_interval` seconds have passed since the last sync,
+    whichever comes first. A background thread flushes the tail of a burst
+    that no later append would. sync() forces a flush, e.g. before
+    acknowledging a payment to a client.
+    """
+    def __init__(self, path: str, group_size: int = 256, group_interval: float = 0.05):
+        self.path = path
+        self.group_size = group_size
+        self.group_interval = group_interval
+        self.seq = 0
+        for record in self.records():
+            self.seq = record[0]
+        self.file = open(path, "a", encoding="utf-8")
+        self.pending = 0
+        self.last_sync = time.monotonic()
+        self.lock = threading.RLock()
+        self.closed = threading.Event()
+        self.flusher = threading.Thread(target=self.flush_periodically, daemon=True)
+        self.flusher.start()
+
+    def append(self, op: str, *args):
+        with self.lock:
+            self.seq += 1
+            self.file.write(json.dumps([self.seq, op, *args], separators=(",", ":"), default=str))
+            self.file.write("\n")
+            self.pending += 1
+            if self.pending >= self.group_size or time.monotonic() - self.last_sync >= self.group_interval:
+                self.sync()
+
+    def sync(self):
+        with self.lock:
+            if self.pending:
+                self.file.flush()
+                os.fsync(self.file.fileno())
+                self.pending = 0
+            self.last_sync = time.monotonic()
+
+    def flush_periodically(self):
+        while not self.closed.wait(self.group_interval):
+            with self.lock:
+                if self.pending and time.monotonic() - self.last_sync >= self.group_interval:
+                    self.sync()
+
+    def records(self, after: int = 0):
+        """Yields the logged records with a sequence number greater than `after`."""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, encoding="utf-8") as log_file:
+            for line in log_file:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # A torn final line from a crash mid-write; nothing after it was acknowledged.
+                    return
+                if record[0] > after:
+                    yield record
+
+    def repair(self):
+        """Cuts a torn final line off the file, so new records do not get glued onto it."""
+        with self.lock:
+            self.sync()
+            good = 0
+            with open(self.path, "rb") as log_file:
+                for line in log_file:
+                    try:
+                        json.loads(line)
+                    except ValueError:
+                        break
+                    good += len(line)
+                    if not line.endswith(b"\n"):
+                        # A whole record whose newline was lost; keep it and end the line.
+                        self.file.write("\n")
+                        self.pending += 1
+                        break
+                else:
+                    return
+            if good < os.path.getsize(self.path):
+                self.file.truncate(good)
+            self.sync()
+
+    def truncate(self):
+        with self.lock:
+            self.sync()
+            self.file.truncate(0)
+            self.file.seek(0)
+
+    def close(self):
+        self.closed.set()
+        self.flusher.join()
+        self.sync()
+        self.file.close()
+
+
+# ----- Replay -----
+
+def member_of(fms, member_id):
+    """A member by ID, cancelled ones included: payments and other records may refer to them."""
+    return fms.members.get(member_id) or fms.transatcions.payers.get(member_id)
+
+def replay_register_member(fms, uuid, name, age, mem_type, goal):
+    fms.attach_member(Member(fms, name, age, MEMBERSHIP_TYPE(mem_type), FITNESS_GOAL(goal), uuid=uuid))
+
+def replay_cancel_membership(fms, member_id):
+    member = fms.members.get(member_id)
+    if member is not None:
+        fms.cancel_membership(member)
+
+def replay_rename_member(fms, member_id, name):
+    member = member_of(fms, member_id)
+    if member is not None:
+        member.rename(name)
+
+def replay_update_membership(fms, member_id, mem_type):
+    member_of(fms, member_id).update_membership(MEMBERSHIP_TYPE(mem_type))
+
+def replay_track_progress(fms, member_id, goal, data):
+    member_of(fms, member_id).track_progress(data, FITNESS_GOAL(goal))
+
+def replay_record_measurement(fms, member_id, metric, value, stamp):
+    member_of(fms, member_id).record_measurement(METRIC(metric), value, from_epoch_us(stamp))
+
+def replay_add_trainer(fms, uuid, name, spec):
+    fms.attach_trainer(Trainer(fms, name, SPECIALIZATION(spec), uuid=uuid))
+
+def replay_remove_trainer(fms, trainer_id):
+    trainer = fms.trainers.get(trainer_id)
+    if trainer is not None:
+        fms.remove_trainer(trainer)
+
+def replay_schedule_class(fms, uuid, name, trainer_id, capacity, schedule, duration=0):
+    trainer = fms.trainers.get(trainer_id) if trainer_id is not None else None
+    fms.attach_class(FitnessClass(fms, name, trainer, capacity, parse_schedule(schedule), uuid=uuid,
+                                  duration=datetime.timedelta(seconds=duration)))
+
+def replay_assign_trainer(fms, class_id, trainer_id):
+    fms.classes[class_id].Trainer = fms.trainers.get(trainer_id) if trainer_id is not None else None
+
+def replay_enroll_member(fms, class_id, member_id):
+    fms.classes[class_id].enroll_member(member_of(fms, member_id))
+
+def replay_cancel_booking(fms, class_id, member_id):
+    member = member_of(fms, member_id)
+    if member is not None:
+        fms.classes[class_id].cancel_booking(member)
+
+def replay_join_waitlist(fms, class_id, member_id, lane):
+    fms.classes[class_id].join_waitlist(member_of(fms, member_id), MEMBERSHIP_TYPE(lane))
+
+def replay_leave_waitlist(fms, class_id, member_id):
+    member = member_of(fms, member_id)
+    if member is not None:
+        fms.classes[class_id].leave_waitlist(member)
+
+def replay_schedule_series(fms, uuid, name, trainer_id, capacity, start, frequency, interval, until, exceptions,
+                           duration=0):
+    trainer = fms.trainers.get(trainer_id) if trainer_id is not None else None
+    fms.series[uuid] = ClassSeries(fms, name, trainer, capacity, parse_schedule(start), RECURRENCE(frequency),
+                                   interval, parse_schedule(until) if until is not None else None,
+                                   [parse_schedule(day) for day in exceptions], uuid=uuid,
+                                   duration=datetime.timedelta(seconds=duration))
+
+def replay_materialize_occurrence(fms, series_id, class_id):
+    fms.series[series_id].attach_occurrence(fms.classes[class_id])
+
+def replay_skip_occurrence(fms, series_id, schedule):
+    fms.series[series_id].exceptions.add(parse_schedule(schedule))
+
+def replay_process_payment(fms, uuid, member_id, amount, stamp, mem_type):
+    member = member_of(fms, member_id)
+    fms.attach_transaction(Transaction(fms, member, amount, from_epoch_us(stamp),
+                                       MEMBERSHIP_TYPE(mem_type), uuid=uuid))
+
+
+REPLAY = {
+    "register_member": replay_register_member,
+    "cancel_membership": replay_cancel_membership,
+    "rename_member": replay_rename_member,
+    "update_membership": replay_update_membership,
+    "track_progress": replay_track_progress,
+    "record_measurement": replay_record_measurement,
+    "add_trainer": replay_add_trainer,
+    "remove_trainer": replay_remove_trainer,
+    "schedule_class": replay_schedule_class,
+    "assign_trainer": replay_assign_trainer,
+    "enroll_member": replay_enroll_member,
+    "cancel_booking": replay_cancel_booking,
+    "join_waitlist": replay_join_waitlist,
+    "leave_waitlist": replay_leave_waitlist,
+    "schedule_series": replay_schedule_series,
+    "materialize_occurrence": replay_materialize_occurrence,
+    "skip_occurrence": replay_skip_occurrence,
+    "process_payment": replay_process_payment,
+}
+
+# Operations whose first argument is the ID of the entity they create.
+CREATING_OPS = ("register_member", "add_trainer", "schedule_class", "schedule_series", "process_payment")
+
+
+class DurableStore(StorageBackend):
+    """Combines a snapshot backend with a journal: recover on startup, checkpoint periodically.
+
+    Each snapshot records the journal sequence number it covers, so recovery
+    replays only the log tail even if a crash happened between saving the
+    snapshot and truncating the journal.
+    """
+    def __init__(self, backend, journal: Journal, snapshot_every: int = 100_000):
+        self.backend = backend
+        self.journal = journal
+        self.snapshot_every = snapshot_every
+        self.snapshot_seq = backend.meta("journal_seq") or 0
+        # Keep numbering past the snapshot even when the journal was truncated.
+        self.journal.seq = max(self.journal.seq, self.snapshot_seq)
+
+    def recover(self) -> FitnessManagementSystem:
+        """Loads the last snapshot, replays the journal tail and attaches the journal."""
+        self.journal.repair()
+        fms = self.backend.load()
+        max_id = 0
+        for record in self.journal.records(after=self.snapshot_seq):
+            _, op, *args = record
+            REPLAY[op](fms, *args)
+            if op in CREATING_OPS:
+                max_id = max(max_id, args[0])
+
+        set_next_id(max(peek_next_id(), max_id + 1))
+        fms.journal = self.journal
+        return fms
+
+    def checkpoint(self, fms: FitnessManagementSystem):
+        """Writes a snapshot of `fms` and truncates the journal it supersedes."""
+        self.journal.sync()
+        self.backend.save(fms, extra_meta={"journal_seq": self.journal.seq})
+        self.snapshot_seq = self.journal.seq
+        self.journal.truncate()
+
+    def load(self) -> FitnessManagementSystem:
+        return self.recover()
+
+    def save(self, fms: FitnessManagementSystem):
+        self.checkpoint(fms)
+
+    def maybe_checkpoint(self, fms: FitnessManagementSystem):
+        if self.journal.seq - self.snapshot_seq >= self.snapshot_every:
+            self.checkpoint(fms)
+
+    def close(self):
+        self.journal.close()
+        self.backend.close()
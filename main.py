@@ -1,10 +1,24 @@
+import os
+import sys
+
 from controller import *
+from storage import SQLiteBackend
+from journal import Journal, DurableStore
+from metrics import instrument_controller, serve_metrics
 
 
 def main():
-    system_controller = SystemController()
+    # An optional database path keeps the state between runs: python main.py fitness.db
+    # Changes made since the last snapshot are replayed from the "<path>.journal" log.
+    storage = None
+    if len(sys.argv) > 1:
+        storage = DurableStore(SQLiteBackend(sys.argv[1]), Journal(sys.argv[1] + ".journal"))
+    system_controller = SystemController(storage)
+    # FMS_METRICS_PORT=9108 times the commands and serves the metrics on http://127.0.0.1:9108/metrics.
+    if os.environ.get("FMS_METRICS_PORT"):
+        serve_metrics(instrument_controller(system_controller), port=int(os.environ["FMS_METRICS_PORT"]))
     system_controller.main_interface()
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,305 @@
+import cProfile
+import io
+import json
+import pstats
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from data_model import *
+
+# Operations timed by instrument() / instrument_controller(); missing ones are skipped.
+SYSTEM_OPERATIONS = (
+    "register_member", "register_members", "cancel_membership", "view_member_progress", "members_page",
+    "add_trainer", "remove_trainer", "schedule_class", "schedule_classes", "schedule_series",
+    "classes_between", "occurrences_between", "process_payment", "process_payments", "enroll_members",
+    "generate_revenue_report", "revenue_by_membership_type", "revenue_by_month",
+)
+CONTROLLER_OPERATIONS = (
+    "register_member", "view_members", "register_new_trainer", "schedule_new_class", "view_timetable",
+    "auto_assign_trainers", "assign_member_to_class", "process_payment", "cancel_membership",
+    "generate_revenue_report", "view_member_progress",
+)
+# Counter name -> the journaled mutation it counts (waitlist promotions are not bookings here).
+COUNTED_MUTATIONS = {"bookings": "enroll_member", "payments": "process_payment"}
+QUANTILES = (0.5, 0.9, 0.99, 0.999)
+
+SUB_BITS = 4
+SUB_COUNT = 1 << SUB_BITS
+
+
+class LatencyHistogram:
+    """HDR-style histogram of durations in microseconds.
+
+    Values below 2 * SUB_COUNT get a bucket each; above that every power of
+    two is split into SUB_COUNT linear buckets, so a reported value is never
+    off by more than 1/SUB_COUNT of itself while memory stays logarithmic in
+    the largest value.
+    """
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        self.counts = []
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    @staticmethod
+    def bucket_of(value: int) -> int:
+        if value < SUB_COUNT:
+            return value
+        shift = value.bit_length() - SUB_BITS - 1
+        return (shift + 1) * SUB_COUNT + (value >> shift) - SUB_COUNT
+
+    @staticmethod
+    def bucket_bounds(index: int):
+        """[low, high) of the values in a bucket."""
+        if index < SUB_COUNT:
+            return index, index + 1
+        shift = index // SUB_COUNT - 1
+        mantissa = index % SUB_COUNT + SUB_COUNT
+        return mantissa << shift, (mantissa + 1) << shift
+
+    def record(self, value: int):
+        index = self.bucket_of(value)
+        if index >= len(self.counts):
+            self.counts.extend([0] * (index + 1 - len(self.counts)))
+        self.counts[index] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> int:
+        """Highest value equivalent to the q-quantile (0 when empty)."""
+        rank = max(1, round(q * self.count))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min(self.bucket_bounds(index)[1] - 1, self.max)
+        return self.max
+
+    def summary(self) -> dict:
+        stats = {"count": self.count, "mean_us": self.total / self.count if self.count else 0.0,
+                 "max_us": self.max}
+        for q in QUANTILES:
+            stats[f"p{q * 100:g}_us"] = self.quantile(q)
+        return stats
+
+
+class Metrics:
+    """Latency histograms, counters and gauges for an instrumented system.
+
+    Nothing is measured until instrument() attaches an instance; detached
+    systems pay one `metrics is None` check per mutation and per rejected
+    booking. Gauges are callables evaluated only when a snapshot is taken.
+    """
+    def __init__(self):
+        self.latencies = {}     # (layer, operation) -> LatencyHistogram
+        self.errors = {}        # (layer, operation) -> raised exceptions
+        self.mutations = {}     # journal op -> count
+        self.counters = {}      # name -> count
+        self.gauges = {}        # name -> callable returning a number
+        self.lock = threading.Lock()
+        self.profiler = None
+        self.profile_lock = threading.RLock()
+        self.depth = threading.local()
+
+    # ----- Recording -----
+    def count(self, name: str, n: int = 1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def mutation(self, op: str):
+        with self.lock:
+            self.mutations[op] = self.mutations.get(op, 0) + 1
+
+    def observe(self, layer: str, operation: str, micros: int, failed: bool = False):
+        key = (layer, operation)
+        with self.lock:
+            histogram = self.latencies.get(key)
+            if histogram is None:
+                histogram = self.latencies[key] = LatencyHistogram()
+            histogram.record(micros)
+            if failed:
+                self.errors[key] = self.errors.get(key, 0) + 1
+
+    def timed(self, layer: str, operation: str, method):
+        """Wraps a bound method so each call is timed (and profiled while a capture runs)."""
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter_ns()
+            failed = True
+            try:
+                if self.profiler is None:
+                    result = method(*args, **kwargs)
+                else:
+                    result = self.profiled(method, args, kwargs)
+                failed = False
+                return result
+            finally:
+                self.observe(layer, operation, (time.perf_counter_ns() - started) // 1000, failed)
+        wrapper.__wrapped__ = method
+        return wrapper
+
+    # ----- Reading -----
+    def snapshot(self) -> dict:
+        with self.lock:
+            operations = {f"{layer}.{operation}": dict(histogram.summary(), errors=self.errors.get((layer, operation), 0))
+                          for (layer, operation), histogram in sorted(self.latencies.items())}
+            counters = {name: self.mutations.get(op, 0) for name, op in COUNTED_MUTATIONS.items()}
+            counters.update(self.counters)
+            mutations = dict(self.mutations)
+        return {"operations": operations, "counters": counters, "mutations": mutations,
+                "gauges": {name: gauge() for name, gauge in self.gauges.items()}}
+
+    def prometheus(self) -> str:
+        """The snapshot in the Prometheus text exposition format."""
+        snapshot = self.snapshot()
+        lines = ["# HELP fms_operation_seconds Latency of instrumented operations.",
+                 "# TYPE fms_operation_seconds summary"]
+        for name, stats in snapshot["operations"].items():
+            layer, operation = name.split(".", 1)
+            labels = f'layer="{layer}",op="{operation}"'
+            for q in QUANTILES:
+                lines.append(f'fms_operation_seconds{{{labels},quantile="{q:g}"}} {stats[f"p{q * 100:g}_us"] / 1e6}')
+            lines.append(f"fms_operation_seconds_sum{{{labels}}} {stats['mean_us'] * stats['count'] / 1e6}")
+            lines.append(f"fms_operation_seconds_count{{{labels}}} {stats['count']}")
+        lines += ["# HELP fms_operation_errors_total Instrumented operations that raised.",
+                  "# TYPE fms_operation_errors_total counter"]
+        for name, stats in snapshot["operations"].items():
+            layer, operation = name.split(".", 1)
+            lines.append(f'fms_operation_errors_total{{layer="{layer}",op="{operation}"}} {stats["errors"]}')
+        for name, value in snapshot["counters"].items():
+            lines += [f"# TYPE fms_{name}_total counter", f"fms_{name}_total {value}"]
+        lines += ["# HELP fms_mutations_total Journaled mutations by operation.", "# TYPE fms_mutations_total counter"]
+        lines += [f'fms_mutations_total{{op="{op}"}} {count}' for op, count in sorted(snapshot["mutations"].items())]
+        for name, value in snapshot["gauges"].items():
+            lines += [f"# TYPE fms_{name} gauge", f"fms_{name} {value}"]
+        return "\n".join(lines) + "\n"
+
+    # ----- On demand captures -----
+    def profiled(self, method, args, kwargs):
+        # cProfile follows a single thread, so profiled calls run one at a time; nested
+        # instrumented calls run inside the outer call's profile.
+        with self.profile_lock:
+            profiler = self.profiler
+            depth = getattr(self.depth, "value", 0)
+            if profiler is None or depth:
+                return method(*args, **kwargs)
+            self.depth.value = 1
+            profiler.enable()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                profiler.disable()
+                self.depth.value = 0
+
+    def start_profile(self):
+        """Starts profiling instrumented calls with cProfile."""
+        with self.profile_lock:
+            self.profiler = cProfile.Profile()
+
+    def stop_profile(self, limit: int = 30, sort: str = "cumulative") -> str:
+        """Stops the capture; returns the pstats report of the `limit` most expensive functions."""
+        with self.profile_lock:
+            profiler, self.profiler = self.profiler, None
+        if profiler is None:
+            raise ValueError("No profile capture is running")
+        out = io.StringIO()
+        try:
+            pstats.Stats(profiler, stream=out).sort_stats(sort).print_stats(limit)
+        except TypeError:
+            return "No instrumented calls were profiled.\n"
+        return out.getvalue()
+
+    def start_tracemalloc(self, frames: int = 1):
+        tracemalloc.start(frames)
+
+    def stop_tracemalloc(self, limit: int = 20) -> list:
+        """Stops tracing allocations; returns the `limit` source lines holding the most memory."""
+        if not tracemalloc.is_tracing():
+            raise ValueError("No tracemalloc capture is running")
+        snapshot = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+        return [str(stat) for stat in snapshot.statistics("lineno")[:limit]]
+
+
+def class_fill_ratio(fms: FitnessManagementSystem) -> float:
+    enrolled = capacity = 0
+    for cls in fms.classes.values():
+        enrolled += len(cls.members)
+        capacity += cls.capacity
+    return enrolled / capacity if capacity else 0.0
+
+
+def instrument(fms: FitnessManagementSystem, metrics: Metrics = None) -> Metrics:
+    """Starts measuring a system: times its operations, counts its mutations and registers its gauges."""
+    metrics = metrics if metrics is not None else Metrics()
+    for operation in SYSTEM_OPERATIONS:
+        if hasattr(fms, operation):
+            setattr(fms, operation, metrics.timed("system", operation, getattr(fms, operation)))
+    metrics.gauges["members"] = lambda: len(fms.members)
+    metrics.gauges["class_fill_ratio"] = lambda: class_fill_ratio(fms)
+    fms.metrics = metrics
+    return metrics
+
+
+def uninstrument(fms: FitnessManagementSystem):
+    """Restores the plain methods, so the system runs unmeasured again."""
+    for operation in SYSTEM_OPERATIONS:
+        vars(fms).pop(operation, None)
+    fms.metrics = None
+
+
+def instrument_controller(controller, metrics: Metrics = None) -> Metrics:
+    """Instruments the controller's system and times its menu commands in the same Metrics."""
+    metrics = instrument(controller.system, metrics)
+    for operation in CONTROLLER_OPERATIONS:
+        if hasattr(controller, operation):
+            setattr(controller, operation, metrics.timed("controller", operation, getattr(controller, operation)))
+    return metrics
+
+
+def serve_metrics(metrics: Metrics, host: str = "127.0.0.1", port: int = 9108) -> ThreadingHTTPServer:
+    """Serves the metrics over HTTP from a daemon thread; shut down with server.shutdown().
+
+    GET /metrics is the Prometheus text format and /snapshot the JSON
+    snapshot. GET /profile?seconds=N and /tracemalloc?seconds=N capture for N
+    seconds (default 10) and return the report as text.
+    """
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlparse(self.path)
+            seconds = float(parse_qs(url.query).get("seconds", ["10"])[0])
+            if url.path == "/metrics":
+                self.reply(metrics.prometheus(), "text/plain; version=0.0.4")
+            elif url.path == "/snapshot":
+                self.reply(json.dumps(metrics.snapshot()), "application/json")
+            elif url.path == "/profile":
+                metrics.start_profile()
+                time.sleep(seconds)
+                self.reply(metrics.stop_profile(), "text/plain")
+            elif url.path == "/tracemalloc":
+                metrics.start_tracemalloc()
+                time.sleep(seconds)
+                self.reply("\n".join(metrics.stop_tracemalloc()) + "\n", "text/plain")
+            else:
+                self.send_error(404)
+
+        def reply(self, text: str, content_type: str):
+            body = text.encode()
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
@@ -0,0 +1,116 @@
+import bisect
+
+from data_model import *
+
+# Time charged to a trainer for a class without a start time or duration, so those are balanced too.
+UNTIMED_LOAD = datetime.timedelta(hours=1)
+
+
+def class_specialization(cls: FitnessClass):
+    """Guesses the specialization a class needs from its name ("Morning Yoga" -> YOGA); None if any will do."""
+    name = cls.name.lower()
+    for specialization in SPECIALIZATION:
+        if str(specialization).lower() in name:
+            return specialization
+    return None
+
+
+def class_load(cls: FitnessClass) -> datetime.timedelta:
+    return cls.duration if cls.Timed else UNTIMED_LOAD
+
+
+class TimetablePlan:
+    """Result of assign_trainers: the chosen trainer per class and the classes nobody could take."""
+    def __init__(self):
+        self.assignments = {}   # FitnessClass -> Trainer
+        self.unassigned = []    # (FitnessClass, reason)
+        self.load = {}          # trainer ID -> total time taught (see class_load), existing classes included
+
+    def apply(self):
+        """Assigns the planned trainers; the usual conflict check runs again for each class.
+
+        All or nothing: if a check fails (the timetable changed since
+        planning), the classes assigned so far get their previous trainer
+        back and the ValueError propagates.
+        """
+        done = []
+        try:
+            for cls, trainer in self.assignments.items():
+                previous = cls.trainer
+                cls.Trainer = trainer
+                done.append((cls, previous))
+        except ValueError:
+            for cls, previous in reversed(done):
+                cls.Trainer = previous
+            raise
+
+
+class Availability:
+    """Sorted, non-overlapping working windows of one trainer."""
+    def __init__(self, windows):
+        merged = []
+        for start, end in sorted((schedule_key(start), schedule_key(end)) for start, end in windows):
+            if merged and start <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(end, merged[-1][1]))
+            else:
+                merged.append((start, end))
+        self.windows = merged
+
+    def covers(self, start, end) -> bool:
+        pos = bisect.bisect_right(self.windows, (start, datetime.datetime.max)) - 1
+        return pos >= 0 and self.windows[pos][1] >= end
+
+
+def assign_trainers(fms: FitnessManagementSystem, classes=None, availability: dict = None,
+                    specialization_of=class_specialization, apply: bool = True) -> TimetablePlan:
+    """Plans trainers for classes without one, conflict free and balancing the time each trainer teaches.
+
+    `classes` defaults to every class; those that already have a trainer are
+    skipped. `availability` maps trainer ID -> (start, end) windows; trainers
+    missing from it are always available. A class only goes to a trainer of
+    the specialization `specialization_of` returns for it (any trainer when it
+    returns None).
+
+    Classes are taken in start order and each goes to the least loaded
+    eligible trainer who is free at that time (a class without a start time
+    or duration weighs UNTIMED_LOAD), so the cost is
+    O(classes * eligible trainers * (log(classes per trainer) + series)).
+    """
+    classes = [cls for cls in (fms.classes.values() if classes is None else classes) if cls.trainer is None]
+    windows = {trainer_id: Availability(spans) for trainer_id, spans in (availability or {}).items()}
+
+    plan = TimetablePlan()
+    by_specialization = {}
+    timetables = {}
+    for trainer in fms.trainers.values():
+        by_specialization.setdefault(trainer.specialization, []).append(trainer)
+        timetable = timetables[trainer.ID] = TrainerTimetable()
+        existing = fms.trainer_timetables.get(trainer.ID)
+        if existing is not None:
+            timetable.slots = list(existing.slots)
+        plan.load[trainer.ID] = sum(map(class_load, fms.trainer_classes.get(trainer.ID, {}).values()),
+                                    datetime.timedelta(0))
+    everyone = list(fms.trainers.values())
+
+    for cls in sorted(classes, key=lambda cl: cl.Slot):
+        specialization = specialization_of(cls)
+        candidates = everyone if specialization is None else by_specialization.get(specialization, [])
+        start, end, _ = cls.Slot
+        free = [trainer for trainer in candidates
+                if (trainer.ID not in windows or windows[trainer.ID].covers(start, end))
+                and (not cls.Timed or (timetables[trainer.ID].overlapping(start, end) is None
+                                       and fms.series_conflict(trainer, cls.schedule, cls.duration) is None))]
+        if not free:
+            wanted = f"{specialization} trainer" if specialization is not None else "trainer"
+            plan.unassigned.append((cls, f"No {wanted} is free at {cls.schedule}"))
+            continue
+
+        trainer = min(free, key=lambda t: (plan.load[t.ID], t.ID))
+        plan.assignments[cls] = trainer
+        plan.load[trainer.ID] += class_load(cls)
+        if cls.Timed:
+            timetables[trainer.ID].add(cls.Slot)
+
+    if apply:
+        plan.apply()
+    return plan
@@ -0,0 +1,205 @@
+import multiprocessing
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from data_model import *
+
+# Columns the partial reports read; set in the parent and inherited by forked
+# workers, or shipped once per worker through the pool initializer.
+_columns = None
+
+
+def load_columns(columns: dict):
+    global _columns
+    _columns = columns
+
+
+def report_columns(fms: FitnessManagementSystem) -> dict:
+    """Flattens the system into typed columns that are cheap to share with worker processes."""
+    ledger = fms.transatcions
+    members = dict(ledger.payers)
+    members.update(fms.members)
+    columns = {
+        "payment_members": ledger.member_ids, "payment_amounts": ledger.amounts, "payment_dates": ledger.dates,
+        "member_ids": array('q'), "member_types": array('b'), "member_goals": array('b'), "member_active": array('b'),
+        "class_trainers": array('q'), "class_specs": array('b'), "class_enrolled": array('q'),
+        "class_capacity": array('q'),
+    }
+    for member in members.values():
+        columns["member_ids"].append(member.ID)
+        columns["member_types"].append(member.membership_type.value)
+        columns["member_goals"].append(member.fitness_goals.value)
+        columns["member_active"].append(member.ID in fms.members)
+    for cls in fms.classes.values():
+        columns["class_trainers"].append(cls.trainer.ID if cls.trainer is not None else 0)
+        columns["class_specs"].append(cls.trainer.specialization.value if cls.trainer is not None else 0)
+        columns["class_enrolled"].append(len(cls.members))
+        columns["class_capacity"].append(cls.capacity)
+    return columns
+
+
+# ----- Partial aggregates (run in the workers over a row range or a member bucket) -----
+
+def payments_partial(bucket: int, buckets: int, lapse_before_us: int) -> dict:
+    """("cohort", year, month) -> [members, revenue] and ("lapsed", type code) -> active members whose last
+    payment is before `lapse_before_us`, over the members with ID % buckets == bucket.
+
+    Each member falls in exactly one bucket, so their payments never need
+    merging across workers and only these small totals travel back.
+    """
+    per_member = {}
+    for member_id, amount, stamp in zip(_columns["payment_members"], _columns["payment_amounts"],
+                                        _columns["payment_dates"]):
+        if member_id % buckets != bucket:
+            continue
+        stats = per_member.get(member_id)
+        if stats is None:
+            per_member[member_id] = [stamp, stamp, amount]
+        else:
+            if stamp < stats[0]:
+                stats[0] = stamp
+            elif stamp > stats[1]:
+                stats[1] = stamp
+            stats[2] += amount
+
+    totals = {}
+    for first, _, total in per_member.values():
+        first_day = from_epoch_us(first)
+        key = ("cohort", first_day.year, first_day.month)
+        cohort = totals.get(key)
+        if cohort is None:
+            totals[key] = [1, total]
+        else:
+            cohort[0] += 1
+            cohort[1] += total
+    for member_id, type_code, active in zip(_columns["member_ids"], _columns["member_types"],
+                                            _columns["member_active"]):
+        if active and member_id % buckets == bucket:
+            stats = per_member.get(member_id)
+            if stats is not None and stats[1] < lapse_before_us:
+                key = ("lapsed", type_code)
+                totals[key] = totals.get(key, 0) + 1
+    return totals
+
+
+def members_partial(lo: int, hi: int) -> dict:
+    """(type code, goal code, active) -> member count for member rows lo..hi."""
+    counts = {}
+    for key in zip(_columns["member_types"][lo:hi], _columns["member_goals"][lo:hi],
+                   _columns["member_active"][lo:hi]):
+        counts[key] = counts.get(key, 0) + 1
+    return counts
+
+
+def classes_partial(lo: int, hi: int) -> dict:
+    """("trainer", ID) / ("specialization", code) -> [enrolled, capacity] for class rows lo..hi."""
+    totals = {}
+    for trainer_id, spec, enrolled, capacity in zip(
+            _columns["class_trainers"][lo:hi], _columns["class_specs"][lo:hi],
+            _columns["class_enrolled"][lo:hi], _columns["class_capacity"][lo:hi]):
+        for key in (("trainer", trainer_id), ("specialization", spec)):
+            current = totals.get(key)
+            if current is None:
+                totals[key] = [enrolled, capacity]
+            else:
+                current[0] += enrolled
+                current[1] += capacity
+    return totals
+
+
+# ----- Merging -----
+
+def merge_counts(partials) -> dict:
+    merged = {}
+    for partial in partials:
+        for key, value in partial.items():
+            if isinstance(value, list):
+                current = merged.setdefault(key, [0] * len(value))
+                for i, item in enumerate(value):
+                    current[i] += item
+            else:
+                merged[key] = merged.get(key, 0) + value
+    return merged
+
+
+def ranges(count: int, parts: int):
+    size = max(1, -(-count // max(parts, 1)))
+    return [(lo, min(lo + size, count)) for lo in range(0, count, size)]
+
+
+def analytics_report(fms: FitnessManagementSystem, workers: int = None, as_of=None, lapse_days: int = 60,
+                     partitions: int = None) -> dict:
+    """Churn, class fill rates, revenue per cohort and goal distribution, computed in parallel.
+
+    Member and class rows are split into `partitions` ranges (default 4 per
+    worker) and payments into `partitions` buckets by member ID (default one
+    per worker); a ProcessPoolExecutor computes their partial aggregates and
+    the caller merges them. workers=0 computes everything in this process.
+
+    - "churn": per membership type, active, cancelled and lapsed members
+      (active, but no payment in the `lapse_days` before `as_of`) and the
+      share of cancelled plus lapsed ones.
+    - "fill_rate_by_trainer" / "fill_rate_by_specialization": booked places
+      over capacity; classes without a trainer are under None.
+    - "cohort_revenue": (year, month) of a member's first payment ->
+      {"members": n, "revenue": total paid by them}.
+    - "goal_distribution": fitness goal -> {membership type: active members}.
+    """
+    columns = report_columns(fms)
+    workers = multiprocessing.cpu_count() if workers is None else workers
+    # Every bucket reads the whole payment column, so there are fewer of them than row ranges.
+    buckets = partitions or max(1, workers)
+    partitions = partitions or max(1, workers) * 4
+    as_of_us = to_epoch_us(as_of if as_of is not None else datetime.datetime.now())
+    lapse_before_us = as_of_us - lapse_days * US_PER_DAY
+    jobs = [(payments_partial, [(bucket, buckets, lapse_before_us) for bucket in range(buckets)]),
+            (members_partial, ranges(len(columns["member_ids"]), partitions)),
+            (classes_partial, ranges(len(columns["class_trainers"]), partitions))]
+
+    load_columns(columns)
+    if workers == 0:
+        results = [[job(*args) for args in job_args] for job, job_args in jobs]
+    else:
+        # Forked workers inherit the columns; other start methods get a copy through the initializer.
+        fork = "fork" in multiprocessing.get_all_start_methods()
+        with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("fork") if fork else None,
+                                 initializer=None if fork else load_columns,
+                                 initargs=() if fork else (columns,)) as pool:
+            futures = [[pool.submit(job, *args) for args in job_args] for job, job_args in jobs]
+            results = [[future.result() for future in row_futures] for row_futures in futures]
+    load_columns(None)
+    payment_totals, member_counts, class_totals = map(merge_counts, results)
+
+    churn = {t: {"active": 0, "cancelled": 0, "lapsed": 0} for t in MEMBERSHIP_TYPE}
+    for (type_code, _, active), count in member_counts.items():
+        churn[MEMBERSHIP_TYPE(type_code)]["active" if active else "cancelled"] += count
+    cohorts = {}
+    for key, value in payment_totals.items():
+        if key[0] == "lapsed":
+            churn[MEMBERSHIP_TYPE(key[1])]["lapsed"] += value
+        else:
+            cohorts[key[1:]] = {"members": value[0], "revenue": value[1]}
+    for stats in churn.values():
+        members = stats["active"] + stats["cancelled"]
+        stats["rate"] = (stats["cancelled"] + stats["lapsed"]) / members if members else 0.0
+
+    goals = {goal: {t: 0 for t in MEMBERSHIP_TYPE} for goal in FITNESS_GOAL}
+    for (type_code, goal_code, active), count in member_counts.items():
+        if active:
+            goals[FITNESS_GOAL(goal_code)][MEMBERSHIP_TYPE(type_code)] += count
+
+    by_trainer, by_specialization = {}, {}
+    for (kind, key), (enrolled, capacity) in class_totals.items():
+        rate = enrolled / capacity if capacity else 0.0
+        if kind == "trainer":
+            by_trainer[key or None] = rate
+        else:
+            by_specialization[SPECIALIZATION(key) if key else None] = rate
+
+    return {
+        "churn": churn,
+        "fill_rate_by_trainer": by_trainer,
+        "fill_rate_by_specialization": by_specialization,
+        "cohort_revenue": dict(sorted(cohorts.items())),
+        "goal_distribution": goals,
+    }
@@ -0,0 +1,262 @@
+import argparse
+import asyncio
+import json
+
+from data_model import *
+from storage import SQLiteBackend
+from journal import Journal, DurableStore
+from metrics import instrument, serve_metrics
+
+
+def member_dict(member: Member):
+    return {"id": member.ID, "name": member.Name, "age": member.Age,
+            "membership_type": member.MembershipType.name, "fitness_goal": member.FitnessGoals.name}
+
+
+def trainer_dict(trainer: Trainer):
+    return {"id": trainer.ID, "name": trainer.Name, "specialization": trainer.Specialization.name}
+
+
+def class_dict(cls: FitnessClass):
+    return {"id": cls.ID, "name": cls.Name, "trainer_id": cls.Trainer.ID if cls.Trainer is not None else None,
+            "capacity": cls.Capacity, "enrolled": cls.CurrentEnrollments, "schedule": cls.Schedule.isoformat(),
+            "duration_minutes": cls.Duration / datetime.timedelta(minutes=1)}
+
+
+def enum_value(enum_cls, name: str):
+    try:
+        return enum_cls[name]
+    except KeyError:
+        raise ValueError(f"Invalid {enum_cls.__name__}: {name}") from None
+
+
+class FitnessServer:
+    """Asyncio front-end serving one FitnessManagementSystem to many clients.
+
+    The protocol is one JSON object per line in each direction. A request is
+    {"op": <operation>, "args": {...}} with an optional "id" that is echoed
+    back; the reply is {"ok": true, "result": ...} or {"ok": false, "error": ...}.
+    Enum arguments are passed by name (e.g. "VIP") and dates in ISO format.
+    Operations run on the event loop thread, one at a time.
+    """
+    def __init__(self, system: FitnessManagementSystem = None, storage=None):
+        self.storage = storage
+        if system is None:
+            system = storage.load() if storage is not None else FitnessManagementSystem()
+        self.system = system
+        self.server = None
+        self.operations = {
+            "register": self.register_member,
+            "members": self.view_members,
+            "find_members": self.find_members,
+            "members_page": self.members_page,
+            "add_trainer": self.add_trainer,
+            "schedule": self.schedule_class,
+            "book": self.book_class,
+            "cancel_booking": self.cancel_booking,
+            "pay": self.process_payment,
+            "receipt": self.receipt,
+            "rename": self.rename_member,
+            "cancel_membership": self.cancel_membership,
+            "report": self.generate_revenue_report,
+            "track_progress": self.track_progress,
+            "progress": self.view_member_progress,
+            "measure": self.record_measurement,
+            "trend": self.measurement_trend,
+        }
+
+    # ----- Operations -----
+    def member(self, member_id):
+        member = self.system.Members.get(member_id)
+        if member is None:
+            raise KeyError(f"Member with id: {member_id} doesn't exist")
+        return member
+
+    def fitness_class(self, class_id):
+        cls = self.system.Classes.get(class_id)
+        if cls is None:
+            raise KeyError(f"Class with id: {class_id} doesn't exist")
+        return cls
+
+    def register_member(self, name, age, membership_type, fitness_goal):
+        return member_dict(self.system.register_member(name, age, enum_value(MEMBERSHIP_TYPE, membership_type),
+                                                       enum_value(FITNESS_GOAL, fitness_goal)))
+
+    def view_members(self):
+        return [member_dict(m) for m in self.system.view_members()]
+
+    def members_page(self, limit=100, after=None):
+        page, cursor = self.system.members_page(limit, after)
+        return {"members": [member_dict(m) for m in page], "next": cursor}
+
+    def find_members(self, membership_type=None, fitness_goal=None, min_age=None, max_age=None, name_prefix=None):
+        query = self.system.query_members()
+        if membership_type is not None:
+            query.of_type(enum_value(MEMBERSHIP_TYPE, membership_type))
+        if fitness_goal is not None:
+            query.with_goal(enum_value(FITNESS_GOAL, fitness_goal))
+        if min_age is not None or max_age is not None:
+            query.aged(min_age, max_age)
+        if name_prefix is not None:
+            query.named(name_prefix)
+        return [member_dict(m) for m in query]
+
+    def add_trainer(self, name, specialization):
+        return trainer_dict(self.system.add_trainer(name, enum_value(SPECIALIZATION, specialization)))
+
+    def schedule_class(self, name, trainer_id, capacity, schedule, duration_minutes=0):
+        trainer = self.system.Trainers.get(trainer_id)
+        if trainer is None:
+            raise KeyError(f"Trainer with id: {trainer_id} doesn't exist")
+        return class_dict(self.system.schedule_class(name, trainer, capacity, parse_schedule(schedule),
+                                                     datetime.timedelta(minutes=duration_minutes)))
+
+    def book_class(self, member_id, class_id):
+        return self.member(member_id).book_class(self.fitness_class(class_id))
+
+    def cancel_booking(self, member_id, class_id):
+        self.fitness_class(class_id).cancel_booking(self.member(member_id))
+        return True
+
+    def process_payment(self, member_id, amount, membership_type):
+        txn = self.system.process_payment(self.member(member_id), amount,
+                                          enum_value(MEMBERSHIP_TYPE, membership_type))
+        # A payment is only acknowledged once it is durable.
+        if self.system.journal is not None:
+            self.system.journal.sync()
+        return {"id": txn.ID, "receipt": txn.generate_receipt()}
+
+    def receipt(self, transaction_id):
+        ledger = self.system.transatcions
+        if transaction_id not in ledger:
+            raise KeyError(f"Transaction with id: {transaction_id} doesn't exist")
+        return ledger.receipt(transaction_id)
+
+    def rename_member(self, member_id, name):
+        self.member(member_id).rename(name)
+        return True
+
+    def cancel_membership(self, member_id):
+        self.system.cancel_membership(self.member(member_id))
+        return True
+
+    def generate_revenue_report(self):
+        return {"total": self.system.generate_revenue_report(),
+                "by_membership_type": {t.name: v for t, v in self.system.revenue_by_membership_type().items()}}
+
+    def track_progress(self, member_id, goal, data):
+        self.member(member_id).track_progress(data, enum_value(FITNESS_GOAL, goal))
+        return True
+
+    def view_member_progress(self, member_id):
+        progress = self.system.view_member_progress(member_id) or {}
+        return {goal.name: logs for goal, logs in progress.items()}
+
+    def record_measurement(self, member_id, metric, value, at=None):
+        self.member(member_id).record_measurement(enum_value(METRIC, metric), value,
+                                                  parse_schedule(at) if at is not None else None)
+        return True
+
+    def measurement_trend(self, member_id, metric, start, end, step_days=7):
+        series = self.member(member_id).Measurements.get(enum_value(METRIC, metric))
+        if series is None:
+            return []
+        return [summary._asdict() for summary in series.trend(parse_schedule(start), parse_schedule(end),
+                                                               datetime.timedelta(days=step_days))]
+
+    # ----- Protocol -----
+    def dispatch(self, line: bytes) -> dict:
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            return {"ok": False, "error": str(e)}
+        return self.execute(request)
+
+    def execute(self, request) -> dict:
+        """Runs one decoded request and returns the reply object."""
+        request_id = None
+        try:
+            if not isinstance(request, dict):
+                raise ValueError("A request must be a JSON object")
+            request_id = request.get("id")
+            operation = self.operations.get(request.get("op"))
+            if operation is None:
+                raise ValueError(f"Unknown operation: {request.get('op')}")
+            result = operation(**request.get("args", {}))
+            response = {"ok": True, "result": result}
+            if self.storage is not None:
+                self.storage.maybe_checkpoint(self.system)
+        except KeyError as e:
+            response = {"ok": False, "error": str(e.args[0])}
+        except (ValueError, TypeError) as e:
+            response = {"ok": False, "error": str(e)}
+        except Exception as e:
+            # Any other failure still gets a reply; it must not drop the connection (or a shard worker).
+            response = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+        if request_id is not None:
+            response["id"] = request_id
+        return response
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                writer.write(json.dumps(self.dispatch(line), default=str).encode("utf-8") + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0, path: str = None):
+        """Starts listening on localhost TCP, or on a Unix socket when `path` is given."""
+        if path is not None:
+            self.server = await asyncio.start_unix_server(self.handle_client, path=path)
+        else:
+            self.server = await asyncio.start_server(self.handle_client, host, port)
+        return self.server
+
+    @property
+    def port(self):
+        return self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+        if self.storage is not None:
+            self.storage.save(self.system)
+
+
+async def serve(args):
+    storage = None
+    if args.db:
+        storage = DurableStore(SQLiteBackend(args.db), Journal(args.db + ".journal"))
+
+    server = FitnessServer(storage=storage)
+    if args.metrics_port is not None:
+        serve_metrics(instrument(server.system), args.host, args.metrics_port)
+    await server.start(args.host, args.port, args.unix)
+    print(f"Serving on {args.unix or f'{args.host}:{server.port}'}", flush=True)
+    try:
+        await server.server.serve_forever()
+    finally:
+        await server.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Smart Fitness Management System JSON line server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8701)
+    parser.add_argument("--unix", help="serve on this Unix socket path instead of TCP")
+    parser.add_argument("--db", help="SQLite database (with a .journal log) to keep state in")
+    parser.add_argument("--metrics-port", type=int, help="instrument the system and serve its metrics on this port")
+    try:
+        asyncio.run(serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+import datetime
+import multiprocessing
+import os
+import threading
+from enum import Enum
+
+import id_generator
+from journal import Journal, DurableStore
+from server import FitnessServer
+from storage import SQLiteBackend
+
+
+def shard_worker(shard: int, shard_count: int, conn, db_path: str = None):
+    """Serves one shard: receives lists of requests, replies with the list of reply objects.
+
+    The requests and replies are those of the JSON line server (see
+    FitnessServer), passed as Python objects over a local pipe. None stops
+    the worker after saving its state.
+    """
+    id_generator.configure_shard(shard, shard_count)
+    storage = None
+    if db_path is not None:
+        storage = DurableStore(SQLiteBackend(db_path), Journal(db_path + ".journal"))
+    server = FitnessServer(storage=storage)
+    try:
+        while True:
+            requests = conn.recv()
+            if requests is None:
+                break
+            conn.send([server.execute(request) for request in requests])
+    finally:
+        if storage is not None:
+            storage.save(server.system)
+            storage.close()
+        conn.close()
+
+
+def wire(value):
+    """Converts an argument to its protocol form: enums by name, dates in ISO format."""
+    if isinstance(value, Enum):
+        return value.name
+    if isinstance(value, datetime.date):
+        return value.isoformat()
+    return value
+
+
+class ShardedSystem:
+    """A chain of clubs split across worker processes, each running its own FitnessManagementSystem.
+
+    Every site belongs to shard `site % shard_count` and keeps its members,
+    trainers, classes and transactions there. Each shard hands out IDs with
+    ID % shard_count == shard, so IDs are unique chain-wide and an ID alone
+    routes an operation to its shard. Bookings stay within one site; queries
+    over the whole chain are sent to every shard and the answers merged.
+
+    Arguments and results use the JSON line server's format: enums by name
+    and dates in ISO format (enum and date objects are converted). Failed
+    operations raise ValueError with the shard's error message.
+    """
+    def __init__(self, shard_count: int, db_dir: str = None, start_method: str = None):
+        context = multiprocessing.get_context(start_method)
+        self.shard_count = shard_count
+        self.connections = []
+        self.workers = []
+        self.locks = [threading.Lock() for _ in range(shard_count)]
+        for shard in range(shard_count):
+            db_path = os.path.join(db_dir, f"shard-{shard}.db") if db_dir is not None else None
+            parent, child = context.Pipe()
+            worker = context.Process(target=shard_worker, args=(shard, shard_count, child, db_path), daemon=True)
+            worker.start()
+            child.close()
+            self.connections.append(parent)
+            self.workers.append(worker)
+
+    def close(self):
+        for conn, worker in zip(self.connections, self.workers):
+            conn.send(None)
+            worker.join()
+            conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # ----- Routing -----
+    def shard_of(self, uuid: int) -> int:
+        return uuid % self.shard_count
+
+    def site_shard(self, site: int) -> int:
+        return site % self.shard_count
+
+    def batch(self, requests_by_shard: dict) -> dict:
+        """Sends {shard: [(op, args), ...]} to all shards at once; returns {shard: [reply, ...]}.
+
+        Replies are reply objects ({"ok": ..., "result"/"error": ...}), one
+        per request, so a failed row does not stop the rest of its batch.
+        """
+        shards = sorted(requests_by_shard)
+        for shard in shards:
+            self.locks[shard].acquire()
+        try:
+            for shard in shards:
+                self.connections[shard].send([{"op": op, "args": {key: wire(value) for key, value in args.items()}}
+                                              for op, args in requests_by_shard[shard]])
+            return {shard: self.connections[shard].recv() for shard in shards}
+        finally:
+            for shard in shards:
+                self.locks[shard].release()
+
+    def call(self, shard: int, op: str, **args):
+        (reply,) = self.batch({shard: [(op, args)]})[shard]
+        if not reply["ok"]:
+            raise ValueError(reply["error"])
+        return reply["result"]
+
+    def gather(self, op: str, **args) -> list:
+        """Runs one operation on every shard; returns the results in shard order."""
+        replies = self.batch({shard: [(op, args)] for shard in range(self.shard_count)})
+        results = []
+        for shard in range(self.shard_count):
+            (reply,) = replies[shard]
+            if not reply["ok"]:
+                raise ValueError(reply["error"])
+            results.append(reply["result"])
+        return results
+
+    # ----- Routed operations -----
+    def register_member(self, site: int, name: str, age: int, membership_type, fitness_goal):
+        return self.call(self.site_shard(site), "register", name=name, age=age,
+                         membership_type=membership_type, fitness_goal=fitness_goal)
+
+    def add_trainer(self, site: int, name: str, specialization):
+        return self.call(self.site_shard(site), "add_trainer", name=name, specialization=specialization)
+
+    def schedule_class(self, name: str, trainer_id: int, capacity: int, schedule, duration_minutes: float = 0):
+        # A class is held at its trainer's site.
+        return self.call(self.shard_of(trainer_id), "schedule", name=name, trainer_id=trainer_id,
+                         capacity=capacity, schedule=schedule, duration_minutes=duration_minutes)
+
+    def book_class(self, member_id: int, class_id: int):
+        if self.shard_of(member_id) != self.shard_of(class_id):
+            raise ValueError(f"Member {member_id} and class {class_id} belong to different sites")
+        return self.call(self.shard_of(member_id), "book", member_id=member_id, class_id=class_id)
+
+    def cancel_booking(self, member_id: int, class_id: int):
+        return self.call(self.shard_of(class_id), "cancel_booking", member_id=member_id, class_id=class_id)
+
+    def process_payment(self, member_id: int, amount: float, membership_type):
+        return self.call(self.shard_of(member_id), "pay", member_id=member_id, amount=amount,
+                         membership_type=membership_type)
+
+    def cancel_membership(self, member_id: int):
+        return self.call(self.shard_of(member_id), "cancel_membership", member_id=member_id)
+
+    def track_progress(self, member_id: int, goal, data):
+        return self.call(self.shard_of(member_id), "track_progress", member_id=member_id, goal=goal, data=data)
+
+    def view_member_progress(self, member_id: int):
+        return self.call(self.shard_of(member_id), "progress", member_id=member_id)
+
+    # ----- Scatter-gather queries -----
+    def generate_revenue_report(self):
+        total, by_type = 0, {}
+        for report in self.gather("report"):
+            total += report["total"]
+            for name, amount in report["by_membership_type"].items():
+                by_type[name] = by_type.get(name, 0) + amount
+        return {"total": total, "by_membership_type": by_type}
+
+    def view_members(self):
+        return sorted((m for members in self.gather("members") for m in members), key=lambda m: m["id"])
+
+    def find_members(self, **filters):
+        return sorted((m for members in self.gather("find_members", **filters) for m in members),
+                      key=lambda m: m["id"])
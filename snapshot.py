@@ -0,0 +1,292 @@
+import bisect
+import json
+import mmap
+import struct
+from collections.abc import Mapping
+
+from data_model import *
+from id_generator import peek_next_id
+
+# ------------------------- File format --------------------------------------
+#
+# A snapshot is a header followed by fixed-width, little-endian record tables
+# sorted by their first field, and a pool holding all variable-length strings.
+# Strings are referenced from records as (offset into the pool, byte length).
+
+MAGIC = b"FMSSNAP2"
+
+MEMBER = struct.Struct("<qQIHBBBQI")       # id, name, age, type, goal, active, progress JSON
+TRAINER = struct.Struct("<qQIB")           # id, name, specialization
+CLASS = struct.Struct("<qQIqiqBq")         # id, name, trainer id (0 = none), capacity, schedule us, is date,
+                                           # duration us
+PAIR = struct.Struct("<qq")                # (key id, value id) link tables
+TRANSACTION = struct.Struct("<qqdqb")      # id, member id, amount, payment date us, type code
+KEY = struct.Struct("<q")
+
+TABLES = ("members", "trainers", "classes", "class_members", "member_classes",
+          "trainer_classes", "transactions", "strings")
+HEADER = struct.Struct("<8sQdQ" + "QQ" * len(TABLES))   # magic, next id, revenue total, transaction count, tables
+
+
+def write_snapshot(fms: FitnessManagementSystem, path: str):
+    """Writes `fms` to `path` in the memory-mappable snapshot format."""
+    pool = bytearray()
+
+    def intern(text: str):
+        data = text.encode("utf-8")
+        offset = len(pool)
+        pool.extend(data)
+        return offset, len(data)
+
+    tables = {name: bytearray() for name in TABLES[:-1]}
+
+    members = dict(fms.transatcions.payers)
+    members.update(fms.members)
+    for member_id in sorted(members):
+        m = members[member_id]
+        progress = {goal.value: logs for goal, logs in m.progresses.items()}
+        progress_ref = intern(json.dumps(progress, default=str)) if progress else (0, 0)
+        tables["members"] += MEMBER.pack(m.ID, *intern(m.name), m.age, m.membership_type.value,
+                                         m.fitness_goals.value, m.ID in fms.members, *progress_ref)
+
+    for trainer_id in sorted(fms.trainers):
+        t = fms.trainers[trainer_id]
+        tables["trainers"] += TRAINER.pack(t.ID, *intern(t.name), t.specialization.value)
+
+    class_members, member_classes, trainer_classes = [], [], []
+    for class_id in sorted(fms.classes):
+        cl = fms.classes[class_id]
+        is_date = not isinstance(cl.schedule, datetime.datetime)
+        tables["classes"] += CLASS.pack(cl.ID, *intern(cl.name), cl.trainer.ID if cl.trainer is not None else 0,
+                                        cl.capacity, to_epoch_us(cl.schedule), is_date, cl.duration // MICROSECOND)
+        for m in cl.members:
+            class_members.append((cl.ID, m.ID))
+            member_classes.append((m.ID, cl.ID))
+        if cl.trainer is not None:
+            trainer_classes.append((cl.trainer.ID, cl.ID))
+
+    for name, pairs in (("class_members", class_members), ("member_classes", member_classes),
+                        ("trainer_classes", trainer_classes)):
+        for pair in sorted(pairs):
+            tables[name] += PAIR.pack(*pair)
+
+    ledger = fms.transatcions
+    for row in zip(ledger.uuids, ledger.member_ids, ledger.amounts, ledger.dates, ledger.types):
+        tables["transactions"] += TRANSACTION.pack(*row)
+    tables["strings"] = pool
+
+    sizes = {"members": MEMBER.size, "trainers": TRAINER.size, "classes": CLASS.size, "class_members": PAIR.size,
+             "member_classes": PAIR.size, "trainer_classes": PAIR.size, "transactions": TRANSACTION.size,
+             "strings": 1}
+    directory = []
+    offset = HEADER.size
+    for name in TABLES:
+        directory += [offset, len(tables[name]) // sizes[name]]
+        offset += len(tables[name])
+
+    with open(path, "wb") as snapshot_file:
+        snapshot_file.write(HEADER.pack(MAGIC, peek_next_id(), fms.revenue.total, len(ledger), *directory))
+        for name in TABLES:
+            snapshot_file.write(tables[name])
+
+
+class RecordTable:
+    """Fixed-width records inside the mapped file, sorted by their first field."""
+    def __init__(self, buffer, offset: int, count: int, layout: struct.Struct):
+        self.buffer = buffer
+        self.offset = offset
+        self.count = count
+        self.layout = layout
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, pos: int):
+        # Sequence protocol over the sort keys, so bisect can search the table in place.
+        if not 0 <= pos < self.count:
+            raise IndexError(pos)
+        return KEY.unpack_from(self.buffer, self.offset + pos * self.layout.size)[0]
+
+    def record(self, pos: int):
+        return self.layout.unpack_from(self.buffer, self.offset + pos * self.layout.size)
+
+    def find(self, key: int) -> int:
+        pos = bisect.bisect_left(self, key)
+        if pos < self.count and self[pos] == key:
+            return pos
+        return -1
+
+    def values_for(self, key: int):
+        """Yields the second field of every record whose first field equals `key`."""
+        pos = bisect.bisect_left(self, key)
+        while pos < self.count:
+            first, second = self.record(pos)[:2]
+            if first != key:
+                return
+            yield second
+            pos += 1
+
+
+class LazyEntities(Mapping):
+    """Read-only ID -> entity mapping that materializes entities on first access.
+
+    `visible`, if given, is checked against the raw record and hides rows from
+    the mapping (e.g. cancelled members) while lookup() can still reach them.
+    """
+    def __init__(self, table: RecordTable, materialize, visible=None):
+        self.table = table
+        self.materialize = materialize
+        self.visible = visible
+        self.cache = {}
+
+    def lookup(self, uuid: int):
+        """Returns the entity even if it is hidden from the mapping (e.g. a cancelled member)."""
+        entity = self.cache.get(uuid)
+        if entity is None:
+            pos = self.table.find(uuid)
+            if pos < 0:
+                return None
+            entity = self.cache[uuid] = self.materialize(self.table.record(pos))
+        return entity
+
+    def __getitem__(self, uuid: int):
+        pos = self.table.find(uuid)
+        if pos < 0 or (self.visible is not None and not self.visible(self.table.record(pos))):
+            raise KeyError(uuid)
+        return self.lookup(uuid)
+
+    def __iter__(self):
+        for pos in range(len(self.table)):
+            if self.visible is None or self.visible(self.table.record(pos)):
+                yield self.table[pos]
+
+    def __len__(self):
+        if self.visible is None:
+            return len(self.table)
+        return sum(1 for _ in self)
+
+
+class LazyLinks(Mapping):
+    """Read-only key ID -> {ID: entity} mapping over a sorted link table."""
+    def __init__(self, table: RecordTable, entities: LazyEntities):
+        self.table = table
+        self.entities = entities
+
+    def __getitem__(self, key: int):
+        linked = {uuid: self.entities.lookup(uuid) for uuid in self.table.values_for(key)}
+        if not linked:
+            raise KeyError(key)
+        return linked
+
+    def __iter__(self):
+        last = None
+        for pos in range(len(self.table)):
+            key = self.table[pos]
+            if key != last:
+                yield key
+                last = key
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+
+class MappedSnapshot:
+    """Read-only system view over a memory-mapped snapshot file.
+
+    Opening only maps the file and parses the header; members, trainers,
+    classes and transactions are built on first access by ID and then cached.
+    Exposes the same lookup attributes the entities rely on (members,
+    classes, member_bookings, trainer_classes, ...), so materialized entities
+    keep working properties such as Member.ClassBooking.
+    """
+    def __init__(self, path: str):
+        self.file = open(path, "rb")
+        self.buffer = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.next_id, self.revenue_total, self.transaction_count, *directory = \
+            HEADER.unpack_from(self.buffer, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a fitness management snapshot")
+
+        layouts = (MEMBER, TRAINER, CLASS, PAIR, PAIR, PAIR, TRANSACTION)
+        tables = {name: RecordTable(self.buffer, directory[2 * i], directory[2 * i + 1], layout)
+                  for i, (name, layout) in enumerate(zip(TABLES, layouts))}
+        self.strings_offset = directory[-2]
+
+        self.members = LazyEntities(tables["members"], self.make_member, visible=lambda record: record[6])
+        self.trainers = LazyEntities(tables["trainers"], self.make_trainer)
+        self.classes = LazyEntities(tables["classes"], self.make_class)
+        self.transatcions = LazyEntities(tables["transactions"], self.make_transaction)
+        self.class_members = tables["class_members"]
+        self.member_bookings = LazyLinks(tables["member_classes"], self.classes)
+        self.trainer_classes = LazyLinks(tables["trainer_classes"], self.classes)
+        # Waitlists and recurring series are live scheduling state and are not part of a snapshot,
+        # and neither are typed measurements (materialized members start without any).
+        self.waitlists = {}
+        self.series = {}
+        self.journal = None
+        self.metrics = None
+
+    def close(self):
+        self.buffer.close()
+        self.file.close()
+
+    def text(self, offset: int, length: int) -> str:
+        start = self.strings_offset + offset
+        return self.buffer[start:start + length].decode("utf-8")
+
+    def log(self, op: str, *args):
+        raise TypeError("A mapped snapshot is read-only")
+
+    # ----- Entity materialization -----
+    def make_member(self, record):
+        uuid, name_off, name_len, age, mem_type, goal, _, progress_off, progress_len = record
+        member = Member(self, self.text(name_off, name_len), age, MEMBERSHIP_TYPE(mem_type), FITNESS_GOAL(goal),
+                        uuid=uuid)
+        if progress_len:
+            progress = json.loads(self.text(progress_off, progress_len))
+            member.progresses = {FITNESS_GOAL(int(goal)): logs for goal, logs in progress.items()}
+        return member
+
+    def make_trainer(self, record):
+        uuid, name_off, name_len, spec = record
+        return Trainer(self, self.text(name_off, name_len), SPECIALIZATION(spec), uuid=uuid)
+
+    def make_class(self, record):
+        uuid, name_off, name_len, trainer_id, capacity, stamp, is_date, duration = record
+        schedule = from_epoch_us(stamp)
+        trainer = self.trainers.lookup(trainer_id) if trainer_id else None
+        cls = FitnessClass(self, self.text(name_off, name_len), trainer, capacity,
+                           schedule.date() if is_date else schedule, uuid=uuid,
+                           duration=datetime.timedelta(microseconds=duration))
+        cls.members = {self.members.lookup(member_id) for member_id in self.class_members.values_for(uuid)}
+        return cls
+
+    def make_transaction(self, record):
+        uuid, member_id, amount, stamp, mem_type = record
+        return Transaction(self, self.members.lookup(member_id), int(amount) if amount.is_integer() else amount,
+                           from_epoch_us(stamp), MEMBERSHIP_TYPE(mem_type), uuid=uuid)
+
+    # ----- System API -----
+    @property
+    def Members(self):
+        return self.members
+
+    @property
+    def Trainers(self):
+        return self.trainers
+
+    @property
+    def Classes(self):
+        return self.classes
+
+    def Transactions(self):
+        return self.transatcions
+
+    def view_member_progress(self, member_id):
+        member = self.members.get(member_id)
+        if not member:
+            return None
+        return member.progresses
+
+    def generate_revenue_report(self):
+        return self.revenue_total
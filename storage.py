@@ -0,0 +1,217 @@
+import abc
+import datetime
+import json
+import sqlite3
+from itertools import islice
+
+from data_model import *
+from id_generator import peek_next_id, set_next_id
+
+
+class StorageBackend(abc.ABC):
+    """Interface of a persistence backend for FitnessManagementSystem.
+
+    save() writes a full snapshot of the system, load() rebuilds a system from
+    the last snapshot and restores the ID counter. A backend missing either
+    cannot be instantiated.
+    """
+    @abc.abstractmethod
+    def save(self, fms: FitnessManagementSystem):
+        ...
+
+    @abc.abstractmethod
+    def load(self) -> FitnessManagementSystem:
+        ...
+
+    def maybe_checkpoint(self, fms: FitnessManagementSystem):
+        """Hook for backends that snapshot periodically; called after each operation."""
+        pass
+
+    def close(self):
+        pass
+
+
+def chunked(rows, size: int):
+    """Yields lists of at most `size` rows from an iterable."""
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class SQLiteBackend(StorageBackend):
+    """Reference backend keeping the whole system in a local SQLite database."""
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL);
+        CREATE TABLE IF NOT EXISTS members (
+            id INTEGER PRIMARY KEY, name TEXT NOT NULL, age INTEGER NOT NULL,
+            membership_type INTEGER NOT NULL, fitness_goal INTEGER NOT NULL, active INTEGER NOT NULL);
+        CREATE TABLE IF NOT EXISTS trainers (
+            id INTEGER PRIMARY KEY, name TEXT NOT NULL, specialization INTEGER NOT NULL);
+        CREATE TABLE IF NOT EXISTS classes (
+            id INTEGER PRIMARY KEY, name TEXT NOT NULL, trainer_id INTEGER,
+            capacity INTEGER NOT NULL, schedule TEXT NOT NULL, duration INTEGER NOT NULL DEFAULT 0);
+        CREATE TABLE IF NOT EXISTS bookings (class_id INTEGER NOT NULL, member_id INTEGER NOT NULL);
+        CREATE TABLE IF NOT EXISTS waitlists (
+            class_id INTEGER NOT NULL, member_id INTEGER NOT NULL, lane INTEGER NOT NULL);
+        CREATE TABLE IF NOT EXISTS transactions (
+            id INTEGER PRIMARY KEY, member_id INTEGER NOT NULL, amount REAL NOT NULL,
+            payment_date INTEGER NOT NULL, membership_type INTEGER NOT NULL);
+        CREATE TABLE IF NOT EXISTS series (
+            id INTEGER PRIMARY KEY, name TEXT NOT NULL, trainer_id INTEGER, capacity INTEGER NOT NULL,
+            start TEXT NOT NULL, frequency INTEGER NOT NULL, interval INTEGER NOT NULL, until TEXT,
+            exceptions TEXT NOT NULL, duration INTEGER NOT NULL DEFAULT 0);
+        CREATE TABLE IF NOT EXISTS series_occurrences (series_id INTEGER NOT NULL, class_id INTEGER NOT NULL);
+        CREATE TABLE IF NOT EXISTS progress (
+            member_id INTEGER NOT NULL, goal INTEGER NOT NULL, data TEXT NOT NULL);
+        CREATE TABLE IF NOT EXISTS measurements (
+            member_id INTEGER NOT NULL, metric INTEGER NOT NULL, stamp INTEGER NOT NULL, value REAL NOT NULL);
+        CREATE TABLE IF NOT EXISTS measurement_buckets (
+            member_id INTEGER NOT NULL, metric INTEGER NOT NULL, bucket INTEGER NOT NULL, count INTEGER NOT NULL,
+            total REAL NOT NULL, low REAL NOT NULL, high REAL NOT NULL);
+    """
+    TABLES = ("meta", "members", "trainers", "classes", "bookings", "waitlists", "transactions", "series",
+              "series_occurrences", "progress", "measurements", "measurement_buckets")
+
+    def __init__(self, path: str, batch_size: int = 50_000):
+        self.path = path
+        self.batch_size = batch_size
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(self.SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    # ----- Saving -----
+    def save(self, fms: FitnessManagementSystem, extra_meta: dict = None):
+        """Replaces the stored state with a snapshot of `fms` in a single transaction."""
+        meta = {"next_id": peek_next_id()}
+        meta.update(extra_meta or {})
+
+        with self.connection as conn:
+            for table in self.TABLES:
+                conn.execute(f"DELETE FROM {table}")
+
+            conn.executemany("INSERT INTO meta VALUES (?, ?)", meta.items())
+            self.insert(conn, "INSERT INTO members VALUES (?, ?, ?, ?, ?, ?)", self.member_rows(fms))
+            self.insert(conn, "INSERT INTO trainers VALUES (?, ?, ?)",
+                        ((t.ID, t.name, t.specialization.value) for t in fms.trainers.values()))
+            self.insert(conn, "INSERT INTO classes VALUES (?, ?, ?, ?, ?, ?)",
+                        ((cl.ID, cl.name, cl.trainer.ID if cl.trainer is not None else None,
+                          cl.capacity, cl.schedule.isoformat(), duration_seconds(cl.duration))
+                         for cl in fms.classes.values()))
+            self.insert(conn, "INSERT INTO bookings VALUES (?, ?)",
+                        ((cl.ID, m.ID) for cl in fms.classes.values() for m in cl.members))
+            self.insert(conn, "INSERT INTO waitlists VALUES (?, ?, ?)",
+                        ((class_id, m.ID, lane.value) for class_id, waitlist in fms.waitlists.items()
+                         for m, lane in waitlist.entries()))
+            ledger = fms.transatcions
+            self.insert(conn, "INSERT INTO transactions VALUES (?, ?, ?, ?, ?)",
+                        zip(ledger.uuids, ledger.member_ids, ledger.amounts, ledger.dates, ledger.types))
+            self.insert(conn, "INSERT INTO series VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        ((s.ID, s.name, s.trainer.ID if s.trainer is not None else None, s.capacity,
+                          s.start.isoformat(), s.frequency.value, s.interval,
+                          s.until.isoformat() if s.until is not None else None,
+                          json.dumps(sorted(day.isoformat() for day in s.exceptions)),
+                          duration_seconds(s.duration))
+                         for s in fms.series.values()))
+            self.insert(conn, "INSERT INTO series_occurrences VALUES (?, ?)",
+                        ((s.ID, cl.ID) for s in fms.series.values() for cl in s.occurrences.values()))
+            self.insert(conn, "INSERT INTO progress VALUES (?, ?, ?)",
+                        ((m.ID, goal.value, json.dumps(entry, default=str))
+                         for m in fms.members.values() for goal, logs in m.progresses.items() for entry in logs))
+            self.insert(conn, "INSERT INTO measurements VALUES (?, ?, ?, ?)",
+                        ((m.ID, metric.value, stamp, value) for m in fms.members.values()
+                         for metric, series in m.Measurements.items()
+                         for stamp, value in zip(series.times, series.values)))
+            self.insert(conn, "INSERT INTO measurement_buckets VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        ((m.ID, metric.value, *row) for m in fms.members.values()
+                         for metric, series in m.Measurements.items()
+                         for row in zip(*series.bucket_columns())))
+
+    def insert(self, conn, statement: str, rows):
+        for chunk in chunked(rows, self.batch_size):
+            conn.executemany(statement, chunk)
+
+    @staticmethod
+    def member_rows(fms: FitnessManagementSystem):
+        # Members that left but still own transactions are kept as inactive rows.
+        for m in fms.members.values():
+            yield (m.ID, m.name, m.age, m.membership_type.value, m.fitness_goals.value, 1)
+        for member_id, m in fms.transatcions.payers.items():
+            if member_id not in fms.members:
+                yield (m.ID, m.name, m.age, m.membership_type.value, m.fitness_goals.value, 0)
+
+    # ----- Loading -----
+    def load(self) -> FitnessManagementSystem:
+        """Builds a new system from the stored snapshot and restores the ID counter."""
+        fms = FitnessManagementSystem()
+        conn = self.connection
+
+        all_members = {}
+        active_members = []
+        for uuid, name, age, mem_type, goal, active in conn.execute("SELECT * FROM members ORDER BY id"):
+            member = Member(fms, name, age, MEMBERSHIP_TYPE(mem_type), FITNESS_GOAL(goal), uuid=uuid)
+            all_members[uuid] = member
+            if active:
+                active_members.append(member)
+        fms.attach_members(active_members)
+
+        for uuid, name, spec in conn.execute("SELECT * FROM trainers ORDER BY id"):
+            fms.attach_trainer(Trainer(fms, name, SPECIALIZATION(spec), uuid=uuid))
+
+        classes = []
+        for uuid, name, trainer_id, capacity, schedule, duration \
+                in conn.execute("SELECT * FROM classes ORDER BY id"):
+            trainer = fms.trainers.get(trainer_id) if trainer_id is not None else None
+            classes.append(FitnessClass(fms, name, trainer, capacity, parse_schedule(schedule), uuid=uuid,
+                                        duration=datetime.timedelta(seconds=duration)))
+        fms.attach_classes(classes)
+
+        for class_id, member_id in conn.execute("SELECT * FROM bookings"):
+            fms.classes[class_id].enroll_member(all_members[member_id])
+
+        for class_id, member_id, lane in conn.execute("SELECT * FROM waitlists ORDER BY rowid"):
+            fms.classes[class_id].join_waitlist(all_members[member_id], MEMBERSHIP_TYPE(lane))
+
+        ledger = fms.transatcions
+        for uuid, member_id, amount, stamp, mem_type in conn.execute("SELECT * FROM transactions ORDER BY id"):
+            member = all_members[member_id]
+            ledger.payers[member_id] = member
+            for column, value in zip(ledger.columns(), (uuid, member_id, amount, stamp, mem_type)):
+                column.append(value)
+            fms.revenue.add(member_id, amount, from_epoch_us(stamp), MEMBERSHIP_TYPE(mem_type))
+
+        for uuid, name, trainer_id, capacity, start, frequency, interval, until, exceptions, duration \
+                in conn.execute("SELECT * FROM series ORDER BY id"):
+            trainer = fms.trainers.get(trainer_id) if trainer_id is not None else None
+            fms.series[uuid] = ClassSeries(fms, name, trainer, capacity, parse_schedule(start),
+                                           RECURRENCE(frequency), interval,
+                                           parse_schedule(until) if until is not None else None,
+                                           [parse_schedule(day) for day in json.loads(exceptions)], uuid=uuid,
+                                           duration=datetime.timedelta(seconds=duration))
+
+        for series_id, class_id in conn.execute("SELECT * FROM series_occurrences"):
+            fms.series[series_id].attach_occurrence(fms.classes[class_id])
+
+        for member_id, goal, data in conn.execute("SELECT * FROM progress ORDER BY rowid"):
+            all_members[member_id].track_progress(json.loads(data), FITNESS_GOAL(goal))
+
+        # Series are restored column by column, in stored order, without re-running the downsampling.
+        for table, columns in (("measurements", ProgressSeries.raw_columns),
+                               ("measurement_buckets", ProgressSeries.bucket_columns)):
+            for member_id, metric, *row in conn.execute(f"SELECT * FROM {table} ORDER BY rowid"):
+                series = all_members[member_id].measurement_series(METRIC(metric))
+                for column, value in zip(columns(series), row):
+                    column.append(value)
+
+        stored_next_id = self.meta("next_id")
+        if stored_next_id is not None:
+            set_next_id(max(stored_next_id, peek_next_id()))
+        return fms
+
+    def meta(self, key: str):
+        row = self.connection.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row is not None else None
@@ -65,6 +65,185 @@ class TestFitnessClassManagementSystem(unittest.TestCase):
         assert m2.book_class(class1) == False  # Should be blocked
 
 
+    def test_waitlist_promotes_by_membership_priority(self):
+        fms = FitnessManagementSystem()
+        trainer = fms.add_trainer("Zane", SPECIALIZATION.CARDIO)
+        spin = fms.schedule_class("Spin", trainer, 1, datetime.datetime.now())
+        booked = fms.register_member("Ali", 25, MEMBERSHIP_TYPE.BASIC, FITNESS_GOAL.ENDURANCE)
+        basic = fms.register_member("Bo", 25, MEMBERSHIP_TYPE.BASIC, FITNESS_GOAL.ENDURANCE)
+        premium = fms.register_member("Pia", 25, MEMBERSHIP_TYPE.PREMIUM, FITNESS_GOAL.ENDURANCE)
+        vip1 = fms.register_member("Val", 25, MEMBERSHIP_TYPE.VIP, FITNESS_GOAL.ENDURANCE)
+        vip2 = fms.register_member("Vic", 25, MEMBERSHIP_TYPE.VIP, FITNESS_GOAL.ENDURANCE)
+
+        assert spin.join_waitlist(basic) == False  # Class still has room
+        assert booked.book_class(spin) == True
+        for member in (basic, premium, vip1, vip2):
+            assert spin.join_waitlist(member) == True
+        assert spin.join_waitlist(vip1) == False
+        assert spin.join_waitlist(booked) == False
+        assert spin.Waitlisted == 4
+
+        promoted = []
+        current = booked
+        for _ in range(4):
+            spin.cancel_booking(current)
+            (current,) = spin.members
+            promoted.append(current)
+        assert promoted == [vip1, vip2, premium, basic]
+        assert spin.Waitlisted == 0
+        assert spin in basic.ClassBooking
+
+    def test_cancel_membership_leaves_waitlists_and_promotes(self):
+        fms = FitnessManagementSystem()
+        trainer = fms.add_trainer("Zane", SPECIALIZATION.CARDIO)
+        spin = fms.schedule_class("Spin", trainer, 1, datetime.datetime.now())
+        yoga = fms.schedule_class("Yoga", trainer, 1, datetime.datetime.now())
+        ali = fms.register_member("Ali", 25, MEMBERSHIP_TYPE.BASIC, FITNESS_GOAL.ENDURANCE)
+        sara = fms.register_member("Sara", 25, MEMBERSHIP_TYPE.VIP, FITNESS_GOAL.ENDURANCE)
+        tom = fms.register_member("Tom", 25, MEMBERSHIP_TYPE.BASIC, FITNESS_GOAL.ENDURANCE)
+
+        ali.book_class(spin)
+        sara.book_class(yoga)
+        spin.join_waitlist(sara)
+        spin.join_waitlist(tom)
+        yoga.join_waitlist(ali)
+
+        fms.cancel_membership(sara)
+        assert yoga.members == {ali}
+        assert spin.members == {ali}
+        assert spin.Waitlisted == 1
+
+        spin.leave_waitlist(tom)
+        assert spin.Waitlisted == 0
+        assert tom.ID not in fms.member_waitlists
+
+    def test_series_dates_cover_whole_days(self):
+        fms = FitnessManagementSystem()
+        trainer = fms.add_trainer("Zane", SPECIALIZATION.YOGA)
+        daily = fms.schedule_series("Stretch", trainer, 10, datetime.datetime(2025, 1, 5, 9), RECURRENCE.DAILY,
+                                    until=datetime.date(2025, 1, 7), exceptions=[datetime.date(2025, 1, 8)])
+        daily.skip(datetime.date(2025, 1, 6))
+        start, end = datetime.date(2025, 1, 1), datetime.date(2025, 2, 1)
+        assert [o.schedule.strftime("%m-%d %H:%M") for o in daily.occurrences_between(start, end)] == \
+            ["01-05 09:00", "01-07 09:00"]
+
+        weekly = fms.schedule_series("Yoga", trainer, 10, datetime.datetime(2025, 1, 6, 18), RECURRENCE.WEEKLY,
+                                     exceptions=[datetime.date(2025, 1, 13)])
+        assert [o.schedule.day for o in weekly.occurrences_between(start, end)] == [6, 20, 27]
+        with self.assertRaises(ValueError):
+            weekly.book(fms.register_member("Ali", 25, MEMBERSHIP_TYPE.BASIC, FITNESS_GOAL.ENDURANCE),
+                        datetime.datetime(2025, 1, 13, 18))
+
+    def test_series_expands_lazily_and_materializes_booked_occurrences(self):
+        fms = FitnessManagementSystem()
+        trainer = fms.add_trainer("Zane", SPECIALIZATION.YOGA)
+        member = fms.register_member("Ali", 25, MEMBERSHIP_TYPE.BASIC, FITNESS_GOAL.ENDURANCE)
+        yoga = fms.schedule_series("Yoga", trainer, 10, datetime.datetime(2025, 1, 6, 7), RECURRENCE.WEEKLY,
+                                   exceptions=[datetime.datetime(2025, 1, 20, 7)])
+        daily = fms.schedule_series("Stretch", trainer, 10, datetime.date(2025, 1, 1), RECURRENCE.DAILY,
+                                    interval=2, until=datetime.date(2025, 1, 9))
+        one_off = fms.schedule_class("Spin", trainer, 10, datetime.datetime(2025, 1, 13, 9))
+        assert len(fms.classes) == 1
+
+        start, end = datetime.date(2025, 1, 7), datetime.date(2025, 2, 1)
+        assert [o.schedule.day for o in yoga.occurrences_between(start, end)] == [13, 27]
+        assert [o.schedule.day for o in daily.occurrences_between(start, end)] == [7, 9]
+
+        assert yoga.book(member, datetime.datetime(2025, 1, 13, 7)) == True
+        with self.assertRaises(ValueError):
+            yoga.book(member, datetime.datetime(2025, 1, 14, 7))
+        assert len(fms.classes) == 2
+        yoga.skip(datetime.datetime(2025, 1, 27, 7))
+
+        timetable = fms.occurrences_between(start, end)
+        assert [(o.schedule.day, o.series.Name if o.series else o.fitness_class.Name) for o in timetable] == \
+            [(7, "Stretch"), (9, "Stretch"), (13, "Yoga"), (13, "Spin")]
+        booked = timetable[2].fitness_class
+        assert booked.members == {member} and booked in member.ClassBooking
+        assert timetable[3].fitness_class == one_off
+
+        fms.remove_trainer(trainer)
+        assert yoga.Trainer is None and booked.Trainer is None
+
+    def test_concurrent_bookings_never_exceed_capacity(self):
+        import sys
+        import threading
+
+        fms = FitnessManagementSystem()
+        trainer = fms.add_trainer("Zane", SPECIALIZATION.CARDIO)
+        popular = fms.schedule_class("Popular Spin", trainer, 20, datetime.datetime.now())
+        members = [fms.register_member(f"M{i}", 30, MEMBERSHIP_TYPE.BASIC, FITNESS_GOAL.ENDURANCE)
+                   for i in range(200)]
+        start = threading.Barrier(len(members))
+        results = []
+
+        def book(member):
+            start.wait()
+            results.append(member.book_class(popular))
+
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            threads = [threading.Thread(target=book, args=(m,)) for m in members]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        finally:
+            sys.setswitchinterval(switch_interval)
+
+        assert results.count(True) == 20
+        assert popular.CurrentEnrollments == 20
+        assert sum(len(m.ClassBooking) for m in members) == 20
+
+    def test_concurrent_first_bookings_of_an_occurrence(self):
+        import sys
+        import threading
+
+        fms = FitnessManagementSystem()
+        trainer = fms.add_trainer("Zane", SPECIALIZATION.YOGA)
+        series = fms.schedule_series("Yoga", trainer, 10, datetime.datetime(2025, 1, 6, 7), RECURRENCE.WEEKLY,
+                                     duration=datetime.timedelta(hours=1))
+        members = [fms.register_member(f"M{i}", 30, MEMBERSHIP_TYPE.BASIC, FITNESS_GOAL.ENDURANCE)
+                   for i in range(8)]
+        start = threading.Barrier(len(members))
+        results = []
+
+        def book(member):
+            start.wait()
+            results.append(series.book(member, datetime.datetime(2025, 1, 13, 7)))
+
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            threads = [threading.Thread(target=book, args=(m,)) for m in members]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        finally:
+            sys.setswitchinterval(switch_interval)
+
+        assert results == [True] * 8
+        assert len(fms.classes) == 1
+
+    def test_concurrent_ids_are_unique(self):
+        import threading
+        from id_generator import next_id
+
+        ids = []
+
+        def allocate():
+            ids.extend(next_id() for _ in range(2000))
+
+        threads = [threading.Thread(target=allocate) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(set(ids)) == len(ids) == 16000
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,9 +1,11 @@
 import unittest
 from data_model import (
-    FitnessManagementSystem, MEMBERSHIP_TYPE, FITNESS_GOAL, SPECIALIZATION
+    FitnessManagementSystem, FitnessClass, RevenueAggregates, MEMBERSHIP_TYPE, FITNESS_GOAL, SPECIALIZATION, RECURRENCE
 )
 import datetime
 
+MINUTE = datetime.timedelta(minutes=1)
+
 class TestFitnessManagementSystem(unittest.TestCase):
 
     def setUp(self):
@@ -24,6 +26,113 @@ class TestFitnessManagementSystem(unittest.TestCase):
         self.assertEqual(scheduled_class.Trainer.Name, "John")
         self.assertIn(scheduled_class.ID, self.fms.classes)
 
+    def test_trainer_assigned_classes_follow_reassignment(self):
+        john = self.fms.add_trainer("John", SPECIALIZATION.YOGA)
+        kate = self.fms.add_trainer("Kate", SPECIALIZATION.CARDIO)
+        yoga_class = self.fms.schedule_class("Yoga", john, 5, datetime.datetime.now())
+        hiit_class = self.fms.schedule_class("HIIT", john, 5, datetime.datetime.now())
+        self.assertEqual(john.AssignedClasses, [yoga_class, hiit_class])
+
+        kate.assign_class(hiit_class)
+        self.assertEqual(john.AssignedClasses, [yoga_class])
+        self.assertEqual(kate.AssignedClasses, [hiit_class])
+
+        yoga_class.Trainer = kate
+        self.assertEqual(john.AssignedClasses, [])
+
+        self.fms.remove_trainer(kate)
+        self.assertIsNone(yoga_class.Trainer)
+        self.assertIsNone(hiit_class.Trainer)
+        self.assertEqual(kate.AssignedClasses, [])
+
+    def test_classes_between_and_upcoming(self):
+        john = self.fms.add_trainer("John", SPECIALIZATION.YOGA)
+        kate = self.fms.add_trainer("Kate", SPECIALIZATION.CARDIO)
+        day = datetime.datetime(2025, 6, 2)
+        late = self.fms.schedule_class("Evening Yoga", john, 5, day.replace(hour=18))
+        early = self.fms.schedule_class("Morning HIIT", kate, 5, day.replace(hour=7))
+        noon = self.fms.schedule_class("Lunch Yoga", john, 5, day.replace(hour=12))
+        next_day = self.fms.schedule_class("Yoga", john, 5, datetime.date(2025, 6, 3))
+
+        self.assertEqual(self.fms.classes_between(day, day + datetime.timedelta(days=1)), [early, noon, late])
+        self.assertEqual(self.fms.classes_between(day.replace(hour=12), day.replace(hour=18)), [noon])
+        self.assertEqual(self.fms.upcoming(2, after=day.replace(hour=8)), [noon, late])
+        self.assertEqual(self.fms.upcoming(5, after=day.replace(hour=13), trainer=john), [late, next_day])
+
+    def test_trainer_conflicts_are_rejected(self):
+        john = self.fms.add_trainer("John", SPECIALIZATION.YOGA)
+        kate = self.fms.add_trainer("Kate", SPECIALIZATION.CARDIO)
+        hour = datetime.timedelta(hours=1)
+        nine = datetime.datetime(2025, 6, 2, 9)
+        yoga = self.fms.schedule_class("Yoga", john, 5, nine, hour)
+        spin = self.fms.schedule_class("Spin", kate, 5, nine + hour / 2, hour)
+        after = self.fms.schedule_class("Stretch", john, 5, nine + hour)  # Starts as yoga ends
+        self.assertIs(self.fms.trainer_conflict(john, nine + hour / 2, hour), yoga)
+        self.assertIsNone(self.fms.trainer_conflict(john, nine - hour, hour))
+
+        with self.assertRaises(ValueError):
+            self.fms.schedule_class("Pilates", john, 5, nine - hour / 2, hour)
+        with self.assertRaises(ValueError):
+            john.assign_class(spin)
+        self.assertEqual(spin.Trainer, kate)
+        self.assertEqual(john.AssignedClasses, [yoga, after])
+
+        result = self.fms.schedule_classes([("Core", john, 5, nine + 2 * hour, hour),
+                                            ("Core", john, 5, nine + 2.5 * hour, hour)])
+        self.assertEqual([index for index, _, _ in result.failures], [1])
+        self.assertEqual(self.fms.schedule_conflicts(), [])
+
+    def test_series_conflicts_are_rejected(self):
+        john = self.fms.add_trainer("John", SPECIALIZATION.YOGA)
+        hour = datetime.timedelta(hours=1)
+        monday = datetime.datetime(2025, 6, 2, 9)
+        one_off = self.fms.schedule_class("Yoga", john, 5, monday + 7 * datetime.timedelta(days=1), hour)
+        with self.assertRaises(ValueError):
+            self.fms.schedule_series("Weekly", john, 5, monday + hour / 2, RECURRENCE.WEEKLY, duration=hour)
+        weekly = self.fms.schedule_series("Weekly", john, 5, monday + hour, RECURRENCE.WEEKLY, duration=hour)
+
+        # Every other day from Tuesday meets the weekly class on the second Monday, unless that day is skipped.
+        with self.assertRaises(ValueError):
+            self.fms.schedule_series("Daily", john, 5, monday + datetime.timedelta(days=1, minutes=30),
+                                     RECURRENCE.DAILY, interval=2, duration=hour)
+        self.fms.schedule_series("Daily", john, 5, monday + datetime.timedelta(days=1, minutes=30),
+                                 RECURRENCE.DAILY, interval=2, until=monday + datetime.timedelta(days=6),
+                                 duration=hour)
+
+        with self.assertRaises(ValueError):
+            self.fms.schedule_class("Stretch", john, 5, monday + 70 * datetime.timedelta(days=1) + hour / 2, hour)
+        self.assertEqual(len(john.AssignedClasses), 1)
+
+        member = self.fms.register_member("Ali", 25, MEMBERSHIP_TYPE.BASIC, FITNESS_GOAL.WEIGHT_LOSS)
+        self.assertTrue(weekly.book(member, monday + 14 * datetime.timedelta(days=1) + hour))
+        self.assertIn(one_off, john.AssignedClasses)
+
+    def test_untimed_classes_never_conflict(self):
+        # The controller schedules classes by date only, and several can share a trainer and a day.
+        john = self.fms.add_trainer("John", SPECIALIZATION.YOGA)
+        day = datetime.date(2025, 6, 2)
+        first = self.fms.schedule_class("Morning Yoga", john, 5, day)
+        second = self.fms.schedule_class("Evening Yoga", john, 5, day, datetime.timedelta(hours=1))
+        at_nine = self.fms.schedule_class("Yoga", john, 5, datetime.datetime(2025, 6, 2, 9))
+        timed = self.fms.schedule_class("Yoga", john, 5, datetime.datetime(2025, 6, 2, 9), datetime.timedelta(hours=1))
+        self.assertFalse(first.Timed or second.Timed or at_nine.Timed)
+        self.assertTrue(timed.Timed)
+        self.assertEqual(len(john.AssignedClasses), 4)
+
+    def test_schedule_conflicts_report(self):
+        # Classes attached without checks, e.g. loaded from data kept before classes had durations.
+        john = self.fms.add_trainer("John", SPECIALIZATION.YOGA)
+        nine = datetime.datetime(2025, 6, 2, 9)
+        hour = datetime.timedelta(hours=1)
+        classes = [FitnessClass(self.fms, name, john, 5, start, duration=length) for name, start, length in (
+            ("Long", nine, 3 * hour), ("A", nine + hour, hour), ("B", nine + 90 * MINUTE, hour),
+            ("Later", nine + 4 * hour, hour))]
+        for cls in classes:
+            self.fms.attach_class(cls)
+        long, a, b, _ = classes
+        self.assertEqual(sorted(self.fms.schedule_conflicts(), key=lambda pair: (pair[0].ID, pair[1].ID)),
+                         [(long, a), (long, b), (a, b)])
+
     def test_book_class(self):
         member = self.fms.register_member("Ali", 25, MEMBERSHIP_TYPE.BASIC, FITNESS_GOAL.WEIGHT_LOSS)
         trainer = self.fms.add_trainer("John", SPECIALIZATION.YOGA)
@@ -66,10 +175,96 @@ class TestFitnessManagementSystem(unittest.TestCase):
         total = self.fms.generate_revenue_report()
         self.assertEqual(total, 3000)
 
+    def test_revenue_breakdowns(self):
+        ali = self.fms.register_member("Ali", 25, MEMBERSHIP_TYPE.BASIC, FITNESS_GOAL.WEIGHT_LOSS)
+        sara = self.fms.register_member("Sara", 30, MEMBERSHIP_TYPE.VIP, FITNESS_GOAL.MUSCLE_GAIN)
+        self.fms.process_payment(ali, 100, MEMBERSHIP_TYPE.BASIC, datetime.datetime(2025, 1, 31, 9))
+        self.fms.process_payment(sara, 300, MEMBERSHIP_TYPE.VIP, datetime.datetime(2025, 1, 31, 18))
+        self.fms.process_payment(ali, 150, MEMBERSHIP_TYPE.PREMIUM, datetime.datetime(2025, 2, 1, 8))
+
+        self.assertEqual(self.fms.generate_revenue_report(), 550)
+        self.assertEqual(self.fms.revenue_by_membership_type(),
+                         {MEMBERSHIP_TYPE.BASIC: 100, MEMBERSHIP_TYPE.VIP: 300, MEMBERSHIP_TYPE.PREMIUM: 150})
+        self.assertEqual(self.fms.revenue_by_member(ali), 250)
+        self.assertEqual(self.fms.revenue_by_day(),
+                         {datetime.date(2025, 1, 31): 400, datetime.date(2025, 2, 1): 150})
+        self.assertEqual(self.fms.revenue_by_month(), {(2025, 1): 400, (2025, 2): 150})
+
+    def test_revenue_aggregates_match_rebuild(self):
+        members = [self.fms.register_member(f"M{i}", 20 + i, MEMBERSHIP_TYPE(i % 3 + 1), FITNESS_GOAL.ENDURANCE)
+                   for i in range(5)]
+        start = datetime.datetime(2024, 12, 30)
+        for i in range(200):
+            self.fms.process_payment(members[i % 5], 10 + i % 7 * 2.5, MEMBERSHIP_TYPE(i % 3 + 1),
+                                     start + datetime.timedelta(hours=7 * i))
+        self.fms.cancel_membership(members[0])
+
+        rebuilt = RevenueAggregates.rebuild(self.fms.transatcions.values())
+        self.assertEqual(self.fms.revenue, rebuilt)
+
+    def test_bulk_register_and_schedule(self):
+        trainer = self.fms.add_trainer("John", SPECIALIZATION.YOGA)
+        members = self.fms.register_members([
+            ("Ali", 25, MEMBERSHIP_TYPE.BASIC, FITNESS_GOAL.WEIGHT_LOSS),
+            ("", 30, MEMBERSHIP_TYPE.VIP, FITNESS_GOAL.MUSCLE_GAIN),
+            ("Sara", 30, MEMBERSHIP_TYPE.VIP, FITNESS_GOAL.MUSCLE_GAIN),
+            ("Tom", 300, MEMBERSHIP_TYPE.VIP, FITNESS_GOAL.MUSCLE_GAIN),
+        ])
+        self.assertEqual([index for index, _, _ in members.failures], [1, 3])
+        self.assertEqual(members.ids[1], members.ids[0] + 1)
+        self.assertEqual([self.fms.members[i].Name for i in members.ids], ["Ali", "Sara"])
+
+        day = datetime.datetime(2025, 6, 2)
+        classes = self.fms.schedule_classes([
+            ("Late", trainer, 1, day.replace(hour=18)),
+            ("Early", trainer, 1, day.replace(hour=7)),
+            ("Broken", trainer, -1, day),
+        ])
+        self.assertEqual(len(classes.failures), 1)
+        self.assertEqual([cl.Name for cl in self.fms.classes_between(day, day.replace(hour=23))], ["Early", "Late"])
+        self.assertEqual(len(trainer.AssignedClasses), 2)
+
+    def test_bulk_payments_and_bookings_report_failures(self):
+        ali = self.fms.register_member("Ali", 25, MEMBERSHIP_TYPE.BASIC, FITNESS_GOAL.WEIGHT_LOSS)
+        sara = self.fms.register_member("Sara", 30, MEMBERSHIP_TYPE.VIP, FITNESS_GOAL.MUSCLE_GAIN)
+        trainer = self.fms.add_trainer("John", SPECIALIZATION.YOGA)
+        small = self.fms.schedule_class("Small", trainer, 1, datetime.datetime(2025, 6, 2))
+
+        payments = self.fms.process_payments([
+            (ali, 100, MEMBERSHIP_TYPE.BASIC),
+            (sara, -5, MEMBERSHIP_TYPE.VIP),
+            (sara, 0, MEMBERSHIP_TYPE.VIP),
+            (sara, 250, MEMBERSHIP_TYPE.VIP, datetime.datetime(2025, 1, 1)),
+        ])
+        self.assertEqual([(i, error) for i, _, error in payments.failures],
+                         [(1, "The paiment should be positive value"), (2, "The paiment should be positive value")])
+        self.assertEqual(self.fms.generate_revenue_report(), 350)
+        self.assertEqual(self.fms.transatcions[payments.ids[1]].payment_date, datetime.datetime(2025, 1, 1))
+
+        bookings = self.fms.enroll_members([(ali, small), (sara, small)])
+        self.assertEqual(bookings.ids, [small.ID])
+        self.assertEqual(bookings.failures, [(1, (sara, small), "The class is full")])
+
     def test_cancel_membership(self):
         member = self.fms.register_member("Ali", 25, MEMBERSHIP_TYPE.BASIC, FITNESS_GOAL.WEIGHT_LOSS)
         self.fms.cancel_membership(member)
         self.assertNotIn(member.ID, self.fms.members)
 
+    def test_cancel_membership_releases_bookings(self):
+        member = self.fms.register_member("Ali", 25, MEMBERSHIP_TYPE.BASIC, FITNESS_GOAL.WEIGHT_LOSS)
+        other = self.fms.register_member("Sara", 30, MEMBERSHIP_TYPE.VIP, FITNESS_GOAL.MUSCLE_GAIN)
+        trainer = self.fms.add_trainer("John", SPECIALIZATION.YOGA)
+        yoga_class = self.fms.schedule_class("Yoga", trainer, 5, datetime.datetime.now())
+        hiit_class = self.fms.schedule_class("HIIT", trainer, 5, datetime.datetime.now())
+        member.book_class(yoga_class)
+        member.book_class(hiit_class)
+        other.book_class(yoga_class)
+
+        self.fms.cancel_membership(member)
+        self.assertNotIn(member, yoga_class.members)
+        self.assertNotIn(member, hiit_class.members)
+        self.assertEqual(member.ClassBooking, [])
+        self.assertEqual(other.ClassBooking, [yoga_class])
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,212 @@
+import os
+import tempfile
+import time
+import unittest
+import datetime
+
+from data_model import *
+from storage import SQLiteBackend
+from journal import Journal, DurableStore
+
+
+class TestJournal(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp.name, "fms.db")
+        self.log_path = os.path.join(self.tmp.name, "fms.journal")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def open_store(self, snapshot_every=100_000):
+        return DurableStore(SQLiteBackend(self.db_path), Journal(self.log_path, group_size=4),
+                            snapshot_every=snapshot_every)
+
+    def mutate(self, fms):
+        ali = fms.register_member("Ali", 25, MEMBERSHIP_TYPE.BASIC, FITNESS_GOAL.WEIGHT_LOSS)
+        sara = fms.register_member("Sara", 30, MEMBERSHIP_TYPE.VIP, FITNESS_GOAL.MUSCLE_GAIN)
+        john = fms.add_trainer("John", SPECIALIZATION.YOGA)
+        kate = fms.add_trainer("Kate", SPECIALIZATION.CARDIO)
+        yoga = fms.schedule_class("Yoga", john, 5, datetime.datetime(2025, 6, 2, 7, 30))
+        spin = fms.schedule_class("Spin", john, 5, datetime.date(2025, 6, 3))
+        ali.book_class(yoga)
+        sara.book_class(yoga)
+        sara.book_class(spin)
+        yoga.cancel_booking(sara)
+        tiny = fms.schedule_class("Tiny", kate, 1, datetime.datetime(2025, 6, 4, 9), datetime.timedelta(minutes=45))
+        ali.book_class(tiny)
+        sara.book_class(tiny)
+        tiny.join_waitlist(sara)
+        tiny.cancel_booking(ali)
+        tiny.join_waitlist(ali)
+        kate.assign_class(spin)
+        pilates = fms.schedule_series("Pilates", john, 2, datetime.datetime(2025, 6, 2, 18), RECURRENCE.WEEKLY,
+                                      until=datetime.date(2025, 8, 1))
+        pilates.book(ali, datetime.datetime(2025, 6, 16, 18))
+        pilates.skip(datetime.datetime(2025, 6, 23, 18))
+        pilates.skip(datetime.date(2025, 6, 30))
+        fms.remove_trainer(john)
+        ali.update_membership(MEMBERSHIP_TYPE.PREMIUM)
+        ali.rename("Ali Khan")
+        ali.track_progress({"weight": 70}, FITNESS_GOAL.WEIGHT_LOSS)
+        for day in range(200):
+            ali.record_measurement(METRIC.WEIGHT, 70 - day / 50,
+                                   datetime.datetime(2024, 6, 1) + datetime.timedelta(days=day))
+        fms.process_payment(ali, 100, MEMBERSHIP_TYPE.PREMIUM, datetime.datetime(2025, 1, 5, 10))
+        fms.process_payment(sara, 49.5, MEMBERSHIP_TYPE.VIP, datetime.datetime(2025, 1, 6))
+        fms.cancel_membership(sara)
+
+    def assert_same_state(self, restored, fms):
+        self.assertEqual(sorted(restored.members), sorted(fms.members))
+        self.assertEqual(sorted(restored.trainers), sorted(fms.trainers))
+        for class_id, cls in fms.classes.items():
+            copy = restored.classes[class_id]
+            self.assertEqual((copy.Name, copy.Schedule, copy.Duration, copy.members, copy.Trainer, copy.Waitlisted),
+                             (cls.Name, cls.Schedule, cls.Duration, cls.members, cls.Trainer, cls.Waitlisted))
+        for member_id, member in fms.members.items():
+            copy = restored.members[member_id]
+            self.assertEqual((copy.Name, copy.MembershipType, copy.progresses),
+                             (member.Name, member.MembershipType, member.progresses))
+            self.assertEqual({metric: (series.raw_columns(), series.bucket_columns())
+                              for metric, series in copy.Measurements.items()},
+                             {metric: (series.raw_columns(), series.bucket_columns())
+                              for metric, series in member.Measurements.items()})
+        for series_id, series in fms.series.items():
+            copy = restored.series[series_id]
+            self.assertEqual((copy.Name, copy.Trainer, copy.exceptions, copy.until, copy.occurrences),
+                             (series.Name, series.Trainer, series.exceptions, series.until, series.occurrences))
+        self.assertEqual(list(restored.transatcions), list(fms.transatcions))
+        self.assertEqual(restored.revenue, fms.revenue)
+
+    def test_recover_from_journal_only(self):
+        store = self.open_store()
+        fms = store.recover()
+        self.mutate(fms)
+        store.close()
+
+        store = self.open_store()
+        restored = store.recover()
+        store.close()
+        self.assert_same_state(restored, fms)
+
+    def test_recover_from_snapshot_and_tail(self):
+        store = self.open_store()
+        fms = store.recover()
+        fms.register_member("Before", 40, MEMBERSHIP_TYPE.BASIC, FITNESS_GOAL.ENDURANCE)
+        store.checkpoint(fms)
+        self.assertEqual(list(store.journal.records()), [])
+
+        self.mutate(fms)
+        store.close()
+
+        store = self.open_store()
+        self.assertGreater(store.snapshot_seq, 0)
+        tail = list(store.journal.records(after=store.snapshot_seq))
+        self.assertTrue(tail)
+        self.assertGreater(tail[0][0], store.snapshot_seq)
+        restored = store.recover()
+        store.close()
+        self.assert_same_state(restored, fms)
+
+    def test_recover_records_of_cancelled_members(self):
+        store = self.open_store()
+        fms = store.recover()
+        ali = fms.register_member("Ali", 25, MEMBERSHIP_TYPE.BASIC, FITNESS_GOAL.WEIGHT_LOSS)
+        yoga = fms.schedule_class("Yoga", None, 5, datetime.date(2025, 6, 2))
+        fms.process_payment(ali, 50, MEMBERSHIP_TYPE.BASIC, datetime.datetime(2025, 5, 1))
+        fms.cancel_membership(ali)
+        # The live system still takes payments and records for a cancelled member.
+        fms.process_payment(ali, 30, MEMBERSHIP_TYPE.BASIC, datetime.datetime(2025, 6, 1))
+        ali.track_progress("Last run", FITNESS_GOAL.WEIGHT_LOSS)
+        ali.book_class(yoga)
+        store.close()
+
+        store = self.open_store()
+        restored = store.recover()
+        store.close()
+        self.assertEqual(list(restored.transatcions), list(fms.transatcions))
+        self.assertEqual(restored.transatcions.payers[ali.ID].progresses, ali.progresses)
+        self.assertEqual(restored.classes[yoga.ID].CurrentEnrollments, 1)
+
+    def test_periodic_checkpoint_truncates_log(self):
+        store = self.open_store(snapshot_every=5)
+        fms = store.recover()
+        for i in range(6):
+            fms.register_member(f"M{i}", 20, MEMBERSHIP_TYPE.BASIC, FITNESS_GOAL.ENDURANCE)
+        store.maybe_checkpoint(fms)
+        self.assertEqual(list(store.journal.records()), [])
+        fms.register_member("Last", 20, MEMBERSHIP_TYPE.BASIC, FITNESS_GOAL.ENDURANCE)
+        store.close()
+
+        store = self.open_store()
+        restored = store.recover()
+        store.close()
+        self.assertEqual(sorted(restored.members), sorted(fms.members))
+
+    def test_tail_of_a_burst_is_flushed(self):
+        journal = Journal(self.log_path, group_size=100, group_interval=0.01)
+        journal.append("register_member", 1, "Ali", 25, 1, 1)
+        deadline = time.monotonic() + 5
+        while journal.pending and time.monotonic() < deadline:
+            time.sleep(0.01)
+        with open(self.log_path, encoding="utf-8") as log_file:
+            self.assertEqual(len(log_file.readlines()), 1)
+        journal.close()
+
+    def test_torn_last_record_is_ignored(self):
+        store = self.open_store()
+        fms = store.recover()
+        fms.register_member("Ali", 25, MEMBERSHIP_TYPE.BASIC, FITNESS_GOAL.WEIGHT_LOSS)
+        store.close()
+        with open(self.log_path, "a", encoding="utf-8") as log_file:
+            log_file.write('[99,"register_member",12')
+
+        store = self.open_store()
+        restored = store.recover()
+        store.close()
+        self.assertEqual(sorted(restored.members), sorted(fms.members))
+
+
+    def test_writes_after_recovering_a_torn_log_survive_a_restart(self):
+        store = self.open_store()
+        fms = store.recover()
+        fms.register_member("Ali", 25, MEMBERSHIP_TYPE.BASIC, FITNESS_GOAL.WEIGHT_LOSS)
+        store.close()
+        with open(self.log_path, "a", encoding="utf-8") as log_file:
+            log_file.write('[99,"register_member",12')
+
+        store = self.open_store()
+        fms = store.recover()
+        sara = fms.register_member("Sara", 30, MEMBERSHIP_TYPE.VIP, FITNESS_GOAL.MUSCLE_GAIN)
+        store.close()
+
+        store = self.open_store()
+        restored = store.recover()
+        store.close()
+        self.assertEqual(sorted(restored.members), sorted(fms.members))
+        self.assertEqual(restored.members[sara.ID].Name, "Sara")
+
+
+    def test_member_index_changes_are_journaled_under_the_write_lock(self):
+        fms = FitnessManagementSystem()
+        locked = {}
+
+        class Recorder:
+            def append(self, op, *args):
+                locked[op] = fms.write_lock.locked()
+
+        fms.journal = Recorder()
+        ali = fms.register_member("Ali", 25, MEMBERSHIP_TYPE.BASIC, FITNESS_GOAL.WEIGHT_LOSS)
+        fms.register_members([("Sara", 30, MEMBERSHIP_TYPE.VIP, FITNESS_GOAL.MUSCLE_GAIN)])
+        fms.schedule_class("Yoga", None, 5, datetime.datetime(2025, 6, 2, 7, 30))
+        fms.schedule_series("Pilates", None, 2, datetime.datetime(2025, 6, 2, 18), RECURRENCE.WEEKLY)
+        fms.process_payment(ali, 100, MEMBERSHIP_TYPE.BASIC)
+        fms.process_payments([(ali, 50, MEMBERSHIP_TYPE.BASIC)])
+        ali.rename("Ali Khan")
+        ali.update_membership(MEMBERSHIP_TYPE.VIP)
+        self.assertEqual(locked, {"register_member": True, "schedule_class": True, "schedule_series": True,
+                                  "process_payment": True, "rename_member": True, "update_membership": True})
+
+
+if __name__ == '__main__':
+    unittest.main()
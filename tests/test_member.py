@@ -38,6 +38,9 @@ class TestFitnessMemberSystem(unittest.TestCase):
         assert member in fit_class.members
         assert fit_class in member.ClassBooking
 
+        fit_class.cancel_booking(member)
+        assert member.ClassBooking == []
+
 
     def test_member_track_progress(self):
         fms = FitnessManagementSystem()
@@ -51,5 +54,101 @@ class TestFitnessMemberSystem(unittest.TestCase):
         assert member.progresses[FITNESS_GOAL.WEIGHT_LOSS][0]["weight"] == 70
 
 
+    def test_measurements_are_downsampled_and_queryable(self):
+        from datetime import datetime, timedelta
+        from data_model import METRIC, RAW_RETENTION
+
+        fms = FitnessManagementSystem()
+        member = fms.register_member("Erin", 35, MEMBERSHIP_TYPE.BASIC, FITNESS_GOAL.WEIGHT_LOSS)
+        assert dict(member.Measurements) == {} and member.measurements is None
+        start = datetime(2023, 1, 2, 7)  # A Monday
+        for day in range(730):
+            member.record_measurement(METRIC.WEIGHT, 90 - day / 100, start + timedelta(days=day))
+        series = member.Measurements[METRIC.WEIGHT]
+
+        assert len(series) == 730
+        assert len(series.times) <= RAW_RETENTION.days + 7
+        assert series.latest() == (start + timedelta(days=729), 90 - 729 / 100)
+
+        monday = start.replace(hour=0)
+        weeks = series.trend(monday, monday + timedelta(weeks=4))
+        assert [(w.start.day, w.count, w.low, w.high) for w in weeks] == \
+            [(2, 7, 89.94, 90.0), (9, 7, 89.87, 89.93), (16, 7, 89.8, 89.86), (23, 7, 89.73, 89.79)]
+        assert abs(weeks[0].mean - 89.97) < 1e-9
+
+        recent = start + timedelta(days=720)
+        assert [value for _, value in series.points(recent, recent + timedelta(days=3))] == [82.8, 82.79, 82.78]
+        (_, mean), = series.rolling_mean(timedelta(days=3), recent, recent + timedelta(hours=1))
+        assert abs(mean - 82.81) < 1e-9
+        for window in (timedelta(0), timedelta(days=-1)):
+            with self.assertRaises(ValueError):
+                series.rolling_mean(window, recent, recent + timedelta(hours=1))
+        assert series.points(start, start + timedelta(days=7)) == []  # Downsampled
+
+        member.record_measurement(METRIC.WEIGHT, 100, start + timedelta(days=1, hours=5))
+        january = series.summary(monday, monday + timedelta(weeks=1))
+        assert (january.count, january.high) == (8, 100)
+
+    def test_member_queries_use_maintained_indexes(self):
+        fms = FitnessManagementSystem()
+        rows = [("Alice", 34, MEMBERSHIP_TYPE.VIP, FITNESS_GOAL.ENDURANCE),
+                ("alan", 41, MEMBERSHIP_TYPE.VIP, FITNESS_GOAL.ENDURANCE),
+                ("Bob", 30, MEMBERSHIP_TYPE.VIP, FITNESS_GOAL.ENDURANCE),
+                ("Albert", 35, MEMBERSHIP_TYPE.BASIC, FITNESS_GOAL.ENDURANCE),
+                ("Cleo", 38, MEMBERSHIP_TYPE.VIP, FITNESS_GOAL.MUSCLE_GAIN)]
+        alice, alan, bob, albert, cleo = (fms.members[uuid] for uuid in fms.register_members(rows).ids)
+        dora = fms.register_member("Dora", 40, MEMBERSHIP_TYPE.PREMIUM, FITNESS_GOAL.ENDURANCE)
+
+        query = fms.query_members().of_type(MEMBERSHIP_TYPE.VIP).with_goal(FITNESS_GOAL.ENDURANCE).aged(30, 40)
+        assert list(query) == [alice, bob]
+        assert list(fms.query_members().named("AL")) == [alice, alan, albert]
+        assert fms.query_members().named("al").aged(high=35).ids() == [alice.ID, albert.ID]
+        assert fms.query_members().count() == 6
+
+        dora.update_membership(MEMBERSHIP_TYPE.VIP)
+        fms.cancel_membership(bob)
+        assert list(query) == [alice, dora]
+        assert fms.query_members().named("bob").count() == 0
+
+    def test_members_pages_are_stable_by_id(self):
+        fms = FitnessManagementSystem()
+        ids = fms.register_members((f"Member {i}", 20 + i % 3, MEMBERSHIP_TYPE(i % 3 + 1), FITNESS_GOAL.ENDURANCE)
+                                   for i in range(10)).ids
+
+        page, cursor = fms.members_page(4)
+        assert [m.ID for m in page] == ids[:4] and cursor == ids[3]
+        fms.cancel_membership(fms.members[ids[4]])
+        late = fms.register_member("Late", 30, MEMBERSHIP_TYPE.BASIC, FITNESS_GOAL.ENDURANCE)
+        page, cursor = fms.members_page(4, cursor)
+        assert [m.ID for m in page] == ids[5:9]
+        page, cursor = fms.members_page(4, cursor)
+        assert [m.ID for m in page] == [ids[9], late.ID] and cursor is None
+
+        vip = fms.query_members().of_type(MEMBERSHIP_TYPE.VIP)
+        page, cursor = fms.members_page(2, query=vip)
+        assert [m.ID for m in page] == [ids[2], ids[5]]
+        assert [m.ID for m in fms.iter_members(vip, page_size=2)] == [ids[2], ids[5], ids[8]]
+        assert len(list(fms.iter_members(page_size=3))) == 10
+        for limit in (0, -1, "4"):
+            with self.assertRaises(ValueError):
+                fms.members_page(limit)
+
+    def test_entities_are_slotted(self):
+        from datetime import datetime
+        from data_model import SPECIALIZATION
+
+        fms = FitnessManagementSystem()
+        member = fms.register_member("Dan", 41, MEMBERSHIP_TYPE.VIP, FITNESS_GOAL.ENDURANCE)
+        trainer = fms.add_trainer("Sam", SPECIALIZATION.CARDIO)
+        fit_class = fms.schedule_class("Spin", trainer, 10, datetime(2025, 5, 1, 9))
+        txn = fms.process_payment(member, 100, MEMBERSHIP_TYPE.VIP, datetime(2025, 5, 1))
+
+        for entity in (member, trainer, fit_class, txn):
+            assert not hasattr(entity, "__dict__")
+        assert fit_class.Schedule == datetime(2025, 5, 1, 9)
+        assert txn.AmountPaid == 100
+        assert txn.PaymantDate == datetime(2025, 5, 1)
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,79 @@
+import json
+import unittest
+import urllib.request
+from datetime import datetime
+
+from data_model import FitnessManagementSystem, MEMBERSHIP_TYPE, FITNESS_GOAL, SPECIALIZATION
+from metrics import LatencyHistogram, instrument, uninstrument, serve_metrics
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    def test_buckets_are_contiguous(self):
+        for value in range(5000):
+            low, high = LatencyHistogram.bucket_bounds(LatencyHistogram.bucket_of(value))
+            self.assertTrue(low <= value < high)
+            self.assertLessEqual(high - low, max(1, low / 16))
+
+    def test_quantiles(self):
+        histogram = LatencyHistogram()
+        for value in range(1, 1001):
+            histogram.record(value)
+        self.assertEqual(histogram.quantile(0.0001), 1)
+        self.assertAlmostEqual(histogram.quantile(0.5), 500, delta=500 / 16)
+        self.assertAlmostEqual(histogram.quantile(0.99), 990, delta=990 / 16)
+        self.assertEqual(histogram.quantile(1), 1000)
+
+
+class TestInstrumentation(unittest.TestCase):
+    def setUp(self):
+        self.fms = FitnessManagementSystem()
+        self.metrics = instrument(self.fms)
+        trainer = self.fms.add_trainer("Lena", SPECIALIZATION.YOGA)
+        self.cls = self.fms.schedule_class("Yoga", trainer, 1, datetime(2025, 1, 1, 9))
+        self.ali = self.fms.register_member("Ali", 25, MEMBERSHIP_TYPE.BASIC, FITNESS_GOAL.WEIGHT_LOSS)
+        self.sara = self.fms.register_member("Sara", 30, MEMBERSHIP_TYPE.VIP, FITNESS_GOAL.MUSCLE_GAIN)
+        self.cls.enroll_member(self.ali)
+        self.cls.enroll_member(self.sara)
+        self.fms.process_payment(self.ali, 50, MEMBERSHIP_TYPE.BASIC)
+
+    def test_snapshot(self):
+        snapshot = self.metrics.snapshot()
+        self.assertEqual(snapshot["counters"], {"bookings": 1, "payments": 1, "bookings_rejected_full": 1})
+        self.assertEqual(snapshot["gauges"], {"members": 2, "class_fill_ratio": 1.0})
+        self.assertEqual(snapshot["operations"]["system.register_member"]["count"], 2)
+        self.assertEqual(snapshot["mutations"]["register_member"], 2)
+
+    def test_errors_are_counted(self):
+        self.fms.cancel_membership(self.ali)
+        with self.assertRaises(KeyError):
+            self.fms.cancel_membership(self.ali)
+        operation = self.metrics.snapshot()["operations"]["system.cancel_membership"]
+        self.assertEqual((operation["count"], operation["errors"]), (2, 1))
+
+    def test_uninstrument(self):
+        uninstrument(self.fms)
+        self.fms.register_member("Omar", 40, MEMBERSHIP_TYPE.BASIC, FITNESS_GOAL.ENDURANCE)
+        self.assertEqual(self.metrics.snapshot()["operations"]["system.register_member"]["count"], 2)
+        self.assertNotIn("register_member", vars(self.fms))
+
+    def test_profile_capture(self):
+        self.metrics.start_profile()
+        self.fms.register_member("Omar", 40, MEMBERSHIP_TYPE.BASIC, FITNESS_GOAL.ENDURANCE)
+        self.assertIn("register_member", self.metrics.stop_profile())
+
+    def test_endpoint(self):
+        server = serve_metrics(self.metrics, port=0)
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+        try:
+            text = urllib.request.urlopen(base + "/metrics").read().decode()
+            snapshot = json.loads(urllib.request.urlopen(base + "/snapshot").read())
+        finally:
+            server.shutdown()
+            server.server_close()
+        self.assertIn("fms_bookings_total 1", text)
+        self.assertIn('fms_operation_seconds_count{layer="system",op="register_member"} 2', text)
+        self.assertEqual(snapshot["gauges"]["members"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import datetime
+import unittest
+
+from data_model import *
+from optimizer import assign_trainers, class_specialization
+
+HOUR = datetime.timedelta(hours=1)
+
+
+class TestTimetableOptimizer(unittest.TestCase):
+    def setUp(self):
+        self.fms = FitnessManagementSystem()
+        self.ana = self.fms.add_trainer("Ana", SPECIALIZATION.YOGA)
+        self.ben = self.fms.add_trainer("Ben", SPECIALIZATION.YOGA)
+        self.cy = self.fms.add_trainer("Cy", SPECIALIZATION.CARDIO)
+        self.nine = datetime.datetime(2025, 6, 2, 9)
+
+    def test_class_specialization_from_name(self):
+        yoga = self.fms.schedule_class("Morning Yoga", None, 5, self.nine)
+        lift = self.fms.schedule_class("Strength Training 101", None, 5, self.nine)
+        open_gym = self.fms.schedule_class("Open Gym", None, 5, self.nine)
+        self.assertEqual(class_specialization(yoga), SPECIALIZATION.YOGA)
+        self.assertEqual(class_specialization(lift), SPECIALIZATION.STRENGTH_TRAINING)
+        self.assertIsNone(class_specialization(open_gym))
+
+    def test_assignment_is_conflict_free_and_balanced(self):
+        busy = self.fms.schedule_class("Yoga Flow", self.ana, 5, self.nine, HOUR)
+        yoga = [self.fms.schedule_class("Yoga", None, 5, self.nine + i * HOUR / 2, HOUR) for i in range(4)]
+        spin = self.fms.schedule_class("Cardio Spin", None, 5, self.nine, HOUR)
+        strength = self.fms.schedule_class("Strength", None, 5, self.nine, HOUR)
+
+        plan = assign_trainers(self.fms)
+        self.assertEqual(spin.Trainer, self.cy)
+        self.assertEqual([cls for cls, _ in plan.unassigned], [strength, yoga[1]])
+        self.assertEqual([yoga[0].Trainer, yoga[2].Trainer, yoga[3].Trainer], [self.ben, self.ana, self.ben])
+        self.assertEqual((plan.load[self.ana.ID], plan.load[self.ben.ID]), (2 * HOUR, 2 * HOUR))
+        self.assertEqual(self.fms.schedule_conflicts(), [])
+        self.assertIn(busy, self.ana.AssignedClasses)
+
+    def test_untimed_classes_are_balanced(self):
+        days = [self.fms.schedule_class("Yoga", None, 5, datetime.date(2025, 6, day)) for day in range(2, 8)]
+        plan = assign_trainers(self.fms)
+        self.assertEqual([len(self.ana.AssignedClasses), len(self.ben.AssignedClasses)], [3, 3])
+        self.assertEqual(plan.load[self.ana.ID], 3 * HOUR)
+        self.assertTrue(all(cls.Trainer is not None for cls in days))
+
+    def test_recurring_classes_of_a_trainer_are_respected(self):
+        self.fms.schedule_series("Yoga Series", self.ana, 5, self.nine - 14 * HOUR * 24, RECURRENCE.WEEKLY,
+                                 duration=HOUR)
+        yoga = self.fms.schedule_class("Yoga", None, 5, self.nine + HOUR / 2, HOUR)
+        plan = assign_trainers(self.fms)
+        self.assertEqual(plan.assignments, {yoga: self.ben})
+        self.assertEqual(yoga.Trainer, self.ben)
+
+    def test_apply_is_all_or_nothing(self):
+        first = self.fms.schedule_class("Yoga", None, 5, self.nine, HOUR)
+        second = self.fms.schedule_class("Yoga", None, 5, self.nine + 2 * HOUR, HOUR)
+        plan = assign_trainers(self.fms, availability={self.ben.ID: []}, apply=False)
+        self.assertEqual(plan.assignments, {first: self.ana, second: self.ana})
+        self.fms.schedule_class("Yoga Flow", self.ana, 5, self.nine + 2 * HOUR, HOUR)
+        with self.assertRaises(ValueError):
+            plan.apply()
+        self.assertEqual((first.Trainer, second.Trainer), (None, None))
+        self.assertEqual(self.fms.trainer_classes.get(self.ana.ID, {}).get(first.ID), None)
+
+    def test_availability_windows_and_dry_run(self):
+        cls = self.fms.schedule_class("Yoga", None, 5, self.nine, HOUR)
+        availability = {self.ana.ID: [(self.nine - HOUR, self.nine + HOUR / 2)],
+                        self.ben.ID: [(self.nine - HOUR, self.nine), (self.nine, self.nine + HOUR)]}
+        plan = assign_trainers(self.fms, availability=availability, apply=False)
+        self.assertEqual(plan.assignments, {cls: self.ben})
+        self.assertIsNone(cls.Trainer)
+        plan.apply()
+        self.assertEqual(cls.Trainer, self.ben)
@@ -12,5 +12,70 @@ class TestTransaction(unittest.TestCase):
         self.assertEqual(payment.member, member)
         self.assertEqual(payment.payment_date, datetime(2023, 5, 1))
 
+
+class TestTransactionLedger(unittest.TestCase):
+    def setUp(self):
+        self.fms = FitnessManagementSystem()
+        self.ali = self.fms.register_member("Ali", 25, MEMBERSHIP_TYPE.BASIC, FITNESS_GOAL.WEIGHT_LOSS)
+        self.sara = self.fms.register_member("Sara", 30, MEMBERSHIP_TYPE.VIP, FITNESS_GOAL.MUSCLE_GAIN)
+
+    def test_ledger_materializes_transactions(self):
+        txn = self.fms.process_payment(self.ali, 99.5, MEMBERSHIP_TYPE.PREMIUM, datetime(2025, 3, 4, 5, 6, 7, 89))
+
+        stored = self.fms.transatcions[txn.ID]
+        self.assertEqual(stored, txn)
+        self.assertEqual(stored.member, self.ali)
+        self.assertEqual(stored.amount_paid, 99.5)
+        self.assertEqual(stored.payment_date, datetime(2025, 3, 4, 5, 6, 7, 89))
+        self.assertEqual(stored.membership_type, MEMBERSHIP_TYPE.PREMIUM)
+        self.assertEqual(stored.generate_receipt(), txn.generate_receipt())
+        self.assertIn(txn.ID, self.fms.transatcions)
+        self.assertEqual(len(self.fms.transatcions), 1)
+
+    def test_ledger_keeps_rows_of_cancelled_members(self):
+        txn = self.fms.process_payment(self.ali, 100, MEMBERSHIP_TYPE.BASIC)
+        self.fms.cancel_membership(self.ali)
+        self.assertEqual(self.fms.transatcions[txn.ID].member.Name, "Ali")
+
+    def test_column_reports(self):
+        ledger = self.fms.transatcions
+        self.fms.process_payment(self.ali, 100, MEMBERSHIP_TYPE.BASIC, datetime(2025, 1, 31, 23, 59))
+        self.fms.process_payment(self.sara, 300, MEMBERSHIP_TYPE.VIP, datetime(2025, 2, 1))
+        self.fms.process_payment(self.ali, 50, MEMBERSHIP_TYPE.BASIC, datetime(2025, 2, 14))
+
+        self.assertEqual(ledger.total(), 450)
+        self.assertEqual(ledger.revenue_by_type(), {MEMBERSHIP_TYPE.BASIC: 150, MEMBERSHIP_TYPE.VIP: 300})
+        self.assertEqual(ledger.revenue_by_month(), {(2025, 1): 100, (2025, 2): 350})
+        self.assertEqual(ledger.top_payers(1), [(self.sara, 300)])
+        self.assertEqual(ledger.revenue_by_month(), self.fms.revenue_by_month())
+
+    def test_cached_and_batch_receipts(self):
+        ledger = self.fms.transatcions
+        ledger.receipt_cache_size = 2
+        first = self.fms.process_payment(self.ali, 100, MEMBERSHIP_TYPE.BASIC, datetime(2025, 1, 31, 23, 59))
+        second = self.fms.process_payment(self.sara, 49.5, MEMBERSHIP_TYPE.VIP, datetime(2025, 2, 1))
+        third = self.fms.process_payment(self.ali, 50, MEMBERSHIP_TYPE.BASIC, datetime(2025, 2, 14))
+
+        for txn in (first, second, third):
+            self.assertEqual(ledger.receipt(txn.ID), ledger[txn.ID].generate_receipt())
+        self.assertEqual(list(ledger.receipt_cache), [second.ID, third.ID])
+        self.assertIn("Member: Ali\n", ledger.receipt(third.ID))
+
+        self.ali.rename("Ali Khan")
+        self.assertIn("Member: Ali Khan\n", ledger.receipt(third.ID))
+        self.assertEqual(self.fms.query_members().named("ali k").ids(), [self.ali.ID])
+
+        february = list(ledger.receipts(datetime(2025, 2, 1), datetime(2025, 3, 1)))
+        self.assertEqual([uuid for uuid, _ in february], [second.ID, third.ID])
+        self.assertEqual(february[0][1], ledger[second.ID].generate_receipt())
+        self.assertEqual([uuid for uuid, _ in ledger.receipts(member_ids=[self.ali.ID])], [first.ID, third.ID])
+        with self.assertRaises(KeyError):
+            ledger.receipt(-1)
+
+    def test_float_amount_receipt_matches_ledger(self):
+        txn = self.fms.process_payment(self.ali, 100.0, MEMBERSHIP_TYPE.BASIC, datetime(2025, 1, 31))
+        self.assertTrue(txn.generate_receipt().endswith("Amount Paid: $100"))
+        self.assertEqual(self.fms.transatcions.receipt(txn.ID), txn.generate_receipt())
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
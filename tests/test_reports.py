@@ -0,0 +1,55 @@
+import unittest
+from datetime import datetime
+
+from data_model import FitnessManagementSystem, MEMBERSHIP_TYPE, FITNESS_GOAL, SPECIALIZATION
+from reports import analytics_report
+
+
+class TestAnalyticsReport(unittest.TestCase):
+    def setUp(self):
+        fms = self.fms = FitnessManagementSystem()
+        ali = fms.register_member("Ali", 25, MEMBERSHIP_TYPE.BASIC, FITNESS_GOAL.WEIGHT_LOSS)
+        sara = fms.register_member("Sara", 30, MEMBERSHIP_TYPE.VIP, FITNESS_GOAL.MUSCLE_GAIN)
+        omar = fms.register_member("Omar", 40, MEMBERSHIP_TYPE.BASIC, FITNESS_GOAL.WEIGHT_LOSS)
+        fms.process_payment(ali, 50, MEMBERSHIP_TYPE.BASIC, datetime(2024, 1, 5))
+        fms.process_payment(ali, 50, MEMBERSHIP_TYPE.BASIC, datetime(2024, 6, 5))
+        fms.process_payment(sara, 200, MEMBERSHIP_TYPE.VIP, datetime(2024, 2, 1))
+        fms.process_payment(omar, 40, MEMBERSHIP_TYPE.BASIC, datetime(2024, 1, 20))
+        fms.cancel_membership(omar)
+
+        yoga = fms.add_trainer("Lena", SPECIALIZATION.YOGA)
+        self.yoga = yoga
+        first = fms.schedule_class("Yoga", yoga, 4, datetime(2024, 6, 1, 9))
+        fms.schedule_class("Yoga", yoga, 4, datetime(2024, 6, 2, 9))
+        fms.schedule_class("Open Gym", None, 2, datetime(2024, 6, 1, 9))
+        first.enroll_member(ali)
+        first.enroll_member(sara)
+
+    def report(self, workers):
+        return analytics_report(self.fms, workers=workers, as_of=datetime(2024, 6, 30), partitions=2)
+
+    def test_report_contents(self):
+        report = self.report(0)
+        self.assertEqual(report["churn"][MEMBERSHIP_TYPE.BASIC],
+                         {"active": 1, "cancelled": 1, "lapsed": 0, "rate": 0.5})
+        self.assertEqual(report["churn"][MEMBERSHIP_TYPE.VIP],
+                         {"active": 1, "cancelled": 0, "lapsed": 1, "rate": 1.0})
+        self.assertEqual(report["fill_rate_by_trainer"], {self.yoga.ID: 0.25, None: 0.0})
+        self.assertEqual(report["fill_rate_by_specialization"], {SPECIALIZATION.YOGA: 0.25, None: 0.0})
+        self.assertEqual(report["cohort_revenue"], {(2024, 1): {"members": 2, "revenue": 140},
+                                                    (2024, 2): {"members": 1, "revenue": 200}})
+        self.assertEqual(report["goal_distribution"][FITNESS_GOAL.WEIGHT_LOSS][MEMBERSHIP_TYPE.BASIC], 1)
+        self.assertEqual(report["goal_distribution"][FITNESS_GOAL.MUSCLE_GAIN][MEMBERSHIP_TYPE.VIP], 1)
+
+    def test_process_pool_matches_serial(self):
+        self.assertEqual(self.report(2), self.report(0))
+
+    def test_partition_count_does_not_change_the_report(self):
+        single = analytics_report(self.fms, workers=0, as_of=datetime(2024, 6, 30), partitions=1)
+        for partitions in (3, 7):
+            self.assertEqual(analytics_report(self.fms, workers=0, as_of=datetime(2024, 6, 30),
+                                              partitions=partitions), single)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import asyncio
+import json
+import unittest
+
+from server import FitnessServer
+
+
+class TestFitnessServer(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.server = FitnessServer()
+        await self.server.start(port=0)
+
+    async def asyncTearDown(self):
+        await self.server.stop()
+
+    async def connect(self):
+        reader, writer = await asyncio.open_connection("127.0.0.1", self.server.port)
+
+        async def call(op, **args):
+            writer.write(json.dumps({"op": op, "args": args}).encode() + b"\n")
+            await writer.drain()
+            return json.loads(await reader.readline())
+
+        return call, writer
+
+    async def test_operations_round_trip(self):
+        call, writer = await self.connect()
+        member = (await call("register", name="Ali", age=25, membership_type="VIP", fitness_goal="ENDURANCE"))["result"]
+        trainer = (await call("add_trainer", name="John", specialization="YOGA"))["result"]
+        cls = (await call("schedule", name="Yoga", trainer_id=trainer["id"], capacity=1,
+                          schedule="2025-06-02T07:30:00"))["result"]
+
+        self.assertEqual(await call("book", member_id=member["id"], class_id=cls["id"]), {"ok": True, "result": True})
+        payment = await call("pay", member_id=member["id"], amount=120, membership_type="VIP")
+        self.assertIn("Amount Paid: $120", payment["result"]["receipt"])
+        report = await call("report")
+        self.assertEqual(report["result"], {"total": 120, "by_membership_type": {"VIP": 120}})
+        self.assertEqual([m["name"] for m in (await call("members"))["result"]], ["Ali"])
+        writer.close()
+
+    async def test_errors_are_reported(self):
+        call, writer = await self.connect()
+        self.assertEqual(await call("teleport"), {"ok": False, "error": "Unknown operation: teleport"})
+        self.assertFalse((await call("book", member_id=1, class_id=2))["ok"])
+        self.assertFalse((await call("register", name="Ali", age=25, membership_type="GOLD",
+                                     fitness_goal="ENDURANCE"))["ok"])
+        writer.close()
+
+    async def test_invalid_arguments_leave_no_trace(self):
+        call, writer = await self.connect()
+        self.assertFalse((await call("register", name="Ali", age="old", membership_type="VIP",
+                                     fitness_goal="ENDURANCE"))["ok"])
+        self.assertFalse((await call("register", name=123, age=25, membership_type="VIP",
+                                     fitness_goal="ENDURANCE"))["ok"])
+        member = (await call("register", name="Ali", age=25, membership_type="VIP", fitness_goal="ENDURANCE"))
+        self.assertFalse((await call("rename", member_id=member["result"]["id"], name=7))["ok"])
+        self.assertFalse((await call("find_members", min_age="x"))["ok"])
+        system = self.server.system
+        self.assertEqual(list(system.members), [member["result"]["id"]])
+        self.assertEqual(system.member_index.ids, list(system.members))
+        self.assertEqual([m["name"] for m in (await call("members"))["result"]], ["Ali"])
+        writer.close()
+
+    async def test_malformed_line_keeps_connection_open(self):
+        reader, writer = await asyncio.open_connection("127.0.0.1", self.server.port)
+        writer.write(b"not json\n")
+        writer.write(json.dumps({"op": "report", "id": 7}).encode() + b"\n")
+        await writer.drain()
+        self.assertFalse(json.loads(await reader.readline())["ok"])
+        self.assertEqual(json.loads(await reader.readline())["id"], 7)
+        writer.close()
+
+    async def test_many_concurrent_clients(self):
+        async def client(i):
+            call, writer = await self.connect()
+            reply = await call("register", name=f"M{i}", age=30, membership_type="BASIC", fitness_goal="WEIGHT_LOSS")
+            writer.close()
+            return reply["ok"]
+
+        results = await asyncio.gather(*(client(i) for i in range(50)))
+        self.assertTrue(all(results))
+        self.assertEqual(len(self.server.system.members), 50)
+
+
+if __name__ == '__main__':
+    unittest.main()
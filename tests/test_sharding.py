@@ -0,0 +1,57 @@
+import datetime
+import os
+import tempfile
+import unittest
+
+import id_generator
+from data_model import MEMBERSHIP_TYPE, FITNESS_GOAL, SPECIALIZATION
+from sharding import ShardedSystem
+
+
+class TestIdSharding(unittest.TestCase):
+    def tearDown(self):
+        id_generator.configure_shard(0, 1)
+
+    def test_shard_ids_never_collide(self):
+        id_generator.configure_shard(2, 3)
+        ids = [id_generator.next_id() for _ in range(3)] + list(id_generator.reserve_ids(3))
+        self.assertTrue(all(uuid % 3 == 2 for uuid in ids))
+        self.assertEqual(len(set(ids)), 6)
+        id_generator.set_next_id(100)
+        self.assertEqual(id_generator.next_id(), 101)
+
+
+class TestShardedSystem(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_routing_and_scatter_gather(self):
+        with ShardedSystem(2, db_dir=self.tmp.name) as chain:
+            ali = chain.register_member(0, "Ali", 25, MEMBERSHIP_TYPE.VIP, FITNESS_GOAL.ENDURANCE)
+            sara = chain.register_member(1, "Sara", 30, MEMBERSHIP_TYPE.BASIC, FITNESS_GOAL.MUSCLE_GAIN)
+            self.assertEqual((chain.shard_of(ali["id"]), chain.shard_of(sara["id"])), (0, 1))
+
+            john = chain.add_trainer(0, "John", SPECIALIZATION.YOGA)
+            yoga = chain.schedule_class("Yoga", john["id"], 5, datetime.datetime(2025, 6, 2, 7, 30))
+            self.assertTrue(chain.book_class(ali["id"], yoga["id"]))
+            with self.assertRaises(ValueError):
+                chain.book_class(sara["id"], yoga["id"])
+            with self.assertRaises(ValueError):
+                chain.cancel_membership(ali["id"] + 2)
+
+            chain.process_payment(ali["id"], 100, MEMBERSHIP_TYPE.VIP)
+            chain.process_payment(sara["id"], 40, MEMBERSHIP_TYPE.BASIC)
+            self.assertEqual(chain.generate_revenue_report(),
+                             {"total": 140, "by_membership_type": {"VIP": 100, "BASIC": 40}})
+            self.assertEqual([m["name"] for m in chain.view_members()], ["Ali", "Sara"])
+            self.assertEqual([m["name"] for m in chain.find_members(min_age=28)], ["Sara"])
+
+        self.assertTrue(os.path.exists(os.path.join(self.tmp.name, "shard-1.db")))
+        with ShardedSystem(2, db_dir=self.tmp.name) as chain:
+            self.assertEqual(chain.generate_revenue_report()["total"], 140)
+            tom = chain.register_member(1, "Tom", 41, MEMBERSHIP_TYPE.BASIC, FITNESS_GOAL.ENDURANCE)
+            self.assertEqual(chain.shard_of(tom["id"]), 1)
+            self.assertGreater(tom["id"], sara["id"])
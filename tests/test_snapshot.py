@@ -0,0 +1,61 @@
+import os
+import tempfile
+import unittest
+import datetime
+
+from data_model import *
+from snapshot import write_snapshot, MappedSnapshot
+
+
+class TestMappedSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "fms.snap")
+
+        fms = FitnessManagementSystem()
+        self.ali = fms.register_member("Ali", 25, MEMBERSHIP_TYPE.BASIC, FITNESS_GOAL.WEIGHT_LOSS)
+        self.sara = fms.register_member("Sára", 30, MEMBERSHIP_TYPE.VIP, FITNESS_GOAL.MUSCLE_GAIN)
+        self.gone = fms.register_member("Tom", 41, MEMBERSHIP_TYPE.PREMIUM, FITNESS_GOAL.ENDURANCE)
+        self.john = fms.add_trainer("John", SPECIALIZATION.YOGA)
+        self.yoga = fms.schedule_class("Yoga", self.john, 5, datetime.datetime(2025, 6, 2, 7, 30))
+        self.spin = fms.schedule_class("Spin", None, 3, datetime.date(2025, 6, 3))
+        self.ali.book_class(self.yoga)
+        self.sara.book_class(self.yoga)
+        self.sara.book_class(self.spin)
+        self.ali.track_progress({"weight": 70}, FITNESS_GOAL.WEIGHT_LOSS)
+        self.txn = fms.process_payment(self.gone, 250.5, MEMBERSHIP_TYPE.PREMIUM, datetime.datetime(2025, 2, 5))
+        fms.process_payment(self.ali, 100, MEMBERSHIP_TYPE.BASIC, datetime.datetime(2025, 2, 6))
+        fms.cancel_membership(self.gone)
+        self.fms = fms
+
+        write_snapshot(fms, self.path)
+        self.snapshot = MappedSnapshot(self.path)
+
+    def tearDown(self):
+        self.snapshot.close()
+        self.tmp.cleanup()
+
+    def test_entities_materialize_by_id(self):
+        member = self.snapshot.Members.get(self.sara.ID)
+        self.assertEqual((member.Name, member.Age, member.MembershipType), ("Sára", 30, MEMBERSHIP_TYPE.VIP))
+        self.assertIs(self.snapshot.Members.get(self.sara.ID), member)
+        self.assertEqual(sorted(cl.Name for cl in member.ClassBooking), ["Spin", "Yoga"])
+        self.assertEqual(self.snapshot.view_member_progress(self.ali.ID), {FITNESS_GOAL.WEIGHT_LOSS: [{"weight": 70}]})
+
+        yoga = self.snapshot.Classes.get(self.yoga.ID)
+        self.assertEqual((yoga.Name, yoga.Schedule, yoga.Trainer.Name), ("Yoga", self.yoga.Schedule, "John"))
+        self.assertEqual({m.ID for m in yoga.members}, {self.ali.ID, self.sara.ID})
+        self.assertEqual(self.snapshot.Classes[self.spin.ID].Schedule, datetime.date(2025, 6, 3))
+        self.assertEqual(self.snapshot.Trainers[self.john.ID].AssignedClasses, [yoga])
+        self.assertIsNone(self.snapshot.Classes.get(10 ** 9))
+
+    def test_cancelled_members_are_hidden_but_keep_transactions(self):
+        self.assertIsNone(self.snapshot.Members.get(self.gone.ID))
+        self.assertEqual(sorted(self.snapshot.Members), sorted(self.fms.members))
+        self.assertEqual(len(self.snapshot.Members), 2)
+        self.assertEqual(self.snapshot.transatcions[self.txn.ID].generate_receipt(), self.txn.generate_receipt())
+        self.assertEqual(self.snapshot.generate_revenue_report(), 350.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+import os
+import tempfile
+import unittest
+import datetime
+
+from data_model import *
+from storage import SQLiteBackend, StorageBackend
+import id_generator
+
+
+class TestSQLiteBackend(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "fms.db")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def build_system(self):
+        fms = FitnessManagementSystem()
+        ali = fms.register_member("Ali", 25, MEMBERSHIP_TYPE.BASIC, FITNESS_GOAL.WEIGHT_LOSS)
+        sara = fms.register_member("Sara", 30, MEMBERSHIP_TYPE.VIP, FITNESS_GOAL.MUSCLE_GAIN)
+        gone = fms.register_member("Tom", 41, MEMBERSHIP_TYPE.PREMIUM, FITNESS_GOAL.ENDURANCE)
+        john = fms.add_trainer("John", SPECIALIZATION.YOGA)
+        yoga = fms.schedule_class("Yoga", john, 5, datetime.datetime(2025, 6, 2, 7, 30))
+        spin = fms.schedule_class("Spin", None, 3, datetime.date(2025, 6, 3))
+        ali.book_class(yoga)
+        sara.book_class(yoga)
+        sara.book_class(spin)
+        bea = fms.register_member("Bea", 35, MEMBERSHIP_TYPE.BASIC, FITNESS_GOAL.ENDURANCE)
+        tiny = fms.schedule_class("Tiny", john, 1, datetime.datetime(2025, 6, 4, 9), datetime.timedelta(minutes=45))
+        fms.schedule_class("Early", john, 5, datetime.datetime(2025, 6, 4, 7), datetime.timedelta(hours=1))
+        ali.book_class(tiny)
+        tiny.join_waitlist(gone)
+        tiny.join_waitlist(bea)
+        tiny.join_waitlist(sara)
+        sara.update_membership(MEMBERSHIP_TYPE.BASIC)  # Keeps the VIP lane it joined in
+        ali.track_progress({"weight": 70}, FITNESS_GOAL.WEIGHT_LOSS)
+        ali.track_progress("Lost 2kg", FITNESS_GOAL.WEIGHT_LOSS)
+        fms.process_payment(ali, 100, MEMBERSHIP_TYPE.BASIC, datetime.datetime(2025, 1, 5, 10, 0, 0, 5))
+        fms.process_payment(gone, 250.5, MEMBERSHIP_TYPE.PREMIUM, datetime.datetime(2025, 2, 5))
+        fms.cancel_membership(gone)
+        return fms
+
+    def test_round_trip(self):
+        fms = self.build_system()
+        backend = SQLiteBackend(self.path)
+        backend.save(fms)
+        backend.close()
+
+        backend = SQLiteBackend(self.path)
+        restored = backend.load()
+        backend.close()
+
+        self.assertEqual(sorted(restored.members), sorted(fms.members))
+        self.assertEqual(sorted(restored.trainers), sorted(fms.trainers))
+        self.assertEqual(sorted(restored.classes), sorted(fms.classes))
+        for class_id, cls in fms.classes.items():
+            copy = restored.classes[class_id]
+            self.assertEqual((copy.Name, copy.Capacity, copy.Schedule, copy.members),
+                             (cls.Name, cls.Capacity, cls.Schedule, cls.members))
+            self.assertEqual(copy.Trainer, cls.Trainer)
+            self.assertEqual(copy.Waitlisted, cls.Waitlisted)
+
+        ali = next(m for m in restored.members.values() if m.Name == "Ali")
+        self.assertEqual(ali.progresses[FITNESS_GOAL.WEIGHT_LOSS], [{"weight": 70}, "Lost 2kg"])
+        self.assertEqual(len(ali.ClassBooking), 2)
+        self.assertEqual(restored.schedule_index, fms.schedule_index)
+        self.assertEqual({trainer_id: timetable.slots for trainer_id, timetable in restored.trainer_timetables.items()},
+                         {trainer_id: timetable.slots for trainer_id, timetable in fms.trainer_timetables.items()})
+
+        self.assertEqual(list(restored.transatcions), list(fms.transatcions))
+        for txn_id in fms.transatcions:
+            self.assertEqual(restored.transatcions[txn_id].generate_receipt(),
+                             fms.transatcions[txn_id].generate_receipt())
+        self.assertEqual(restored.revenue, fms.revenue)
+
+        tiny = next(cl for cl in restored.classes.values() if cl.Name == "Tiny")
+        restored_ali = restored.members[ali.ID]
+        tiny.cancel_booking(restored_ali)
+        self.assertEqual([m.Name for m in tiny.members], ["Sara"])
+
+    def test_id_counter_is_persisted(self):
+        fms = self.build_system()
+        backend = SQLiteBackend(self.path)
+        backend.save(fms)
+        saved_next_id = id_generator.peek_next_id()
+
+        id_generator.set_next_id(1)
+        restored = backend.load()
+        backend.close()
+        self.assertEqual(id_generator.peek_next_id(), saved_next_id)
+        member = restored.register_member("New", 20, MEMBERSHIP_TYPE.BASIC, FITNESS_GOAL.ENDURANCE)
+        self.assertNotIn(member.ID, fms.members)
+        self.assertGreaterEqual(member.ID, saved_next_id)
+
+    def test_backend_missing_a_method_cannot_be_created(self):
+        class SaveOnly(StorageBackend):
+            def save(self, fms):
+                pass
+
+        with self.assertRaises(TypeError):
+            SaveOnly()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import io
+import unittest
+import datetime
+
+from data_model import *
+from transfer import (export_members, export_trainers, export_classes, export_transactions,
+                      import_members, import_trainers, import_classes, import_transactions, parse_enum)
+
+
+class TestTransfer(unittest.TestCase):
+    def setUp(self):
+        fms = FitnessManagementSystem()
+        ali = fms.register_member("Ali, Jr.", 25, MEMBERSHIP_TYPE.BASIC, FITNESS_GOAL.WEIGHT_LOSS)
+        sara = fms.register_member("Sara", 30, MEMBERSHIP_TYPE.VIP, FITNESS_GOAL.MUSCLE_GAIN)
+        john = fms.add_trainer("John", SPECIALIZATION.STRENGTH_TRAINING)
+        fms.schedule_class("Lift", john, 8, datetime.datetime(2025, 6, 2, 7, 30))
+        fms.schedule_class("Open Gym", None, 20, datetime.date(2025, 6, 3))
+        fms.process_payment(ali, 100, MEMBERSHIP_TYPE.BASIC, datetime.datetime(2025, 1, 5, 10))
+        fms.process_payment(sara, 49.5, MEMBERSHIP_TYPE.VIP, datetime.datetime(2025, 2, 1))
+        self.fms = fms
+
+    def round_trip(self, fmt):
+        files = {}
+        for name, export in (("members", export_members), ("trainers", export_trainers),
+                             ("classes", export_classes), ("transactions", export_transactions)):
+            files[name] = io.StringIO()
+            export(self.fms, files[name], fmt)
+            files[name].seek(0)
+
+        target = FitnessManagementSystem()
+        id_map = {}
+        for name, load in (("members", import_members), ("trainers", import_trainers),
+                           ("classes", import_classes), ("transactions", import_transactions)):
+            result = load(target, files[name], fmt, id_map=id_map, chunk_size=1)
+            self.assertTrue(result.ok, result.failures)
+
+        self.assertEqual(sorted((m.Name, m.Age, m.MembershipType, m.FitnessGoals) for m in target.members.values()),
+                         sorted((m.Name, m.Age, m.MembershipType, m.FitnessGoals) for m in self.fms.members.values()))
+        self.assertEqual(sorted((cl.Name, cl.Capacity, cl.Schedule, cl.Trainer.Name if cl.Trainer else None)
+                                for cl in target.classes.values()),
+                         sorted((cl.Name, cl.Capacity, cl.Schedule, cl.Trainer.Name if cl.Trainer else None)
+                                for cl in self.fms.classes.values()))
+        self.assertEqual(target.revenue_by_month(), self.fms.revenue_by_month())
+        self.assertEqual({m.Name: target.revenue_by_member(m) for m in target.members.values()},
+                         {m.Name: self.fms.revenue_by_member(m) for m in self.fms.members.values()})
+
+    def test_csv_round_trip(self):
+        self.round_trip("csv")
+
+    def test_jsonl_round_trip(self):
+        self.round_trip("jsonl")
+
+    def test_bad_records_are_reported_by_position(self):
+        source = io.StringIO(
+            "id,name,age,membership_type,fitness_goal\n"
+            "1,Ali,25,vip,endurance\n"
+            "2,Bob,old,BASIC,ENDURANCE\n"
+            "3,Cid,40,GOLD,ENDURANCE\n"
+            "4,,40,BASIC,ENDURANCE\n"
+            "5,Dee,33,2,1\n")
+        target = FitnessManagementSystem()
+        result = import_members(target, source, chunk_size=2)
+        self.assertEqual([index for index, _, _ in result.failures], [1, 2, 3])
+        self.assertEqual(sorted(m.Name for m in target.members.values()), ["Ali", "Dee"])
+        dee = target.members[result.ids[1]]
+        self.assertEqual((dee.MembershipType, dee.FitnessGoals), (MEMBERSHIP_TYPE.PREMIUM, FITNESS_GOAL.WEIGHT_LOSS))
+
+    def test_malformed_jsonl_lines_are_reported(self):
+        source = io.StringIO(
+            '{"name": "Ali", "age": 25, "membership_type": "VIP", "fitness_goal": "ENDURANCE"}\n'
+            '\n'
+            '{"name": "Bob", "age": 3\n'
+            '[1, 2]\n'
+            '{"name": "Dee", "age": 33, "membership_type": "BASIC", "fitness_goal": "ENDURANCE"}\n')
+        target = FitnessManagementSystem()
+        result = import_members(target, source, fmt="jsonl", chunk_size=1)
+        self.assertEqual([index for index, _, _ in result.failures], [1, 2])
+        self.assertIn("line 3", result.failures[0][2])
+        self.assertEqual(sorted(m.Name for m in target.members.values()), ["Ali", "Dee"])
+
+    def test_parse_enum(self):
+        self.assertEqual(parse_enum(SPECIALIZATION, "Strength Training"), SPECIALIZATION.STRENGTH_TRAINING)
+        self.assertEqual(parse_enum(MEMBERSHIP_TYPE, "3"), MEMBERSHIP_TYPE.VIP)
+        with self.assertRaises(ValueError):
+            parse_enum(FITNESS_GOAL, "flexibility")
+
+
+if __name__ == '__main__':
+    unittest.main()
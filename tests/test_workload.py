@@ -0,0 +1,31 @@
+import unittest
+
+from benchmarks.workload import WorkloadSpec, build_workload
+
+
+def describe(workload):
+    fms = workload.fms
+    return ([(m.Name, m.Age, m.MembershipType, m.FitnessGoals, [c.Name for c in m.ClassBooking], m.progresses)
+             for m in workload.members],
+            [(c.Name, c.Schedule, c.Trainer.Name, c.CurrentEnrollments) for c in workload.classes],
+            list(fms.transatcions.amounts), list(fms.transatcions.dates))
+
+
+class TestWorkload(unittest.TestCase):
+    def test_same_seed_same_workload(self):
+        spec = WorkloadSpec.scaled(300, seed=4)
+        first, second = build_workload(spec), build_workload(spec)
+        self.assertEqual(describe(first), describe(second))
+        self.assertNotEqual(describe(first), describe(build_workload(spec._replace(seed=5))))
+
+    def test_scaled_counts(self):
+        workload = build_workload(WorkloadSpec.scaled(200, seed=1))
+        self.assertEqual(len(workload.fms.members), 200)
+        self.assertEqual(len(workload.trainers), 2)
+        self.assertEqual(len(workload.classes), 20)
+        self.assertEqual(len(workload.fms.transatcions), 600)
+        self.assertEqual(sum(len(logs) for m in workload.members for logs in m.progresses.values()), 200)
+
+
+if __name__ == "__main__":
+    unittest.main()
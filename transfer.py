@@ -0,0 +1,207 @@
+import csv
+import json
+from collections import namedtuple
+
+from data_model import *
+from storage import chunked
+
+# Column layouts shared by the CSV and JSONL formats. Enums are written by name.
+MEMBER_FIELDS = ("id", "name", "age", "membership_type", "fitness_goal")
+TRAINER_FIELDS = ("id", "name", "specialization")
+CLASS_FIELDS = ("id", "name", "trainer_id", "capacity", "schedule", "duration_minutes")
+TRANSACTION_FIELDS = ("id", "member_id", "amount", "payment_date", "membership_type")
+
+FORMATS = ("csv", "jsonl")
+
+
+def to_minutes(duration: datetime.timedelta):
+    minutes = duration / datetime.timedelta(minutes=1)
+    return int(minutes) if minutes.is_integer() else minutes
+
+
+def parse_minutes(value) -> datetime.timedelta:
+    """Reads an optional duration column; a missing or empty value means no duration."""
+    if value in (None, ""):
+        return DEFAULT_DURATION
+    return datetime.timedelta(minutes=float(value))
+
+
+def parse_enum(enum_cls, value):
+    """Accepts an enum name ("VIP", "strength training") or its numeric value."""
+    if isinstance(value, enum_cls):
+        return value
+    text = str(value).strip()
+    if text.isdigit():
+        return enum_cls(int(text))
+    try:
+        return enum_cls[text.upper().replace(" ", "_")]
+    except KeyError:
+        raise ValueError(f"Invalid {enum_cls.__name__}: {value}") from None
+
+
+# ----- Writing -----
+
+def write_rows(out, fields, rows, fmt: str = "csv"):
+    """Streams tuples to a text file as CSV (with header) or JSON lines; returns the row count."""
+    count = 0
+    if fmt == "csv":
+        writer = csv.writer(out)
+        writer.writerow(fields)
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    elif fmt == "jsonl":
+        for row in rows:
+            out.write(json.dumps(dict(zip(fields, row))))
+            out.write("\n")
+            count += 1
+    else:
+        raise ValueError(f"Unknown format: {fmt}")
+    return count
+
+
+def export_members(fms: FitnessManagementSystem, out, fmt: str = "csv"):
+    return write_rows(out, MEMBER_FIELDS, ((m.ID, m.name, m.age, m.membership_type.name, m.fitness_goals.name)
+                                           for m in fms.members.values()), fmt)
+
+
+def export_trainers(fms: FitnessManagementSystem, out, fmt: str = "csv"):
+    return write_rows(out, TRAINER_FIELDS, ((t.ID, t.name, t.specialization.name)
+                                            for t in fms.trainers.values()), fmt)
+
+
+def export_classes(fms: FitnessManagementSystem, out, fmt: str = "csv"):
+    return write_rows(out, CLASS_FIELDS, ((cl.ID, cl.name, cl.trainer.ID if cl.trainer is not None else "",
+                                           cl.capacity, cl.schedule.isoformat(), to_minutes(cl.duration))
+                                          for cl in fms.classes.values()), fmt)
+
+
+def export_transactions(fms: FitnessManagementSystem, out, fmt: str = "csv"):
+    # Reads the ledger columns directly; no Transaction objects are materialized.
+    ledger = fms.transatcions
+    return write_rows(out, TRANSACTION_FIELDS,
+                      ((uuid, member_id, amount, from_epoch_us(stamp).isoformat(), MEMBERSHIP_TYPE(code).name)
+                       for uuid, member_id, amount, stamp, code
+                       in zip(ledger.uuids, ledger.member_ids, ledger.amounts, ledger.dates, ledger.types)), fmt)
+
+
+def write_receipts(fms: FitnessManagementSystem, out, start=None, end=None, member_ids=None):
+    """Streams the receipts of payments in [start, end) (optionally of some members only); returns the count."""
+    count = 0
+    for _, receipt in fms.transatcions.receipts(start, end, member_ids):
+        if count:
+            out.write("\n")
+        out.write(receipt)
+        out.write("\n")
+        count += 1
+    return count
+
+
+# ----- Reading -----
+
+# A JSONL line that is not valid JSON, yielded in place of its record.
+UnreadableLine = namedtuple("UnreadableLine", "line text error")
+
+
+def read_rows(source, fmt: str = "csv"):
+    """Yields one dict per record of a CSV (with header) or JSONL text stream.
+
+    Malformed JSONL lines are yielded as UnreadableLine, so one bad line does
+    not end the import.
+    """
+    if fmt == "csv":
+        yield from csv.DictReader(source)
+    elif fmt == "jsonl":
+        for number, line in enumerate(source, start=1):
+            if line.strip():
+                try:
+                    yield json.loads(line)
+                except ValueError as e:
+                    yield UnreadableLine(number, line.rstrip("\n"), str(e))
+    else:
+        raise ValueError(f"Unknown format: {fmt}")
+
+
+def import_rows(source, fmt: str, convert, apply, id_map: dict, chunk_size: int) -> BulkResult:
+    """Converts records chunk by chunk and hands each chunk to a bulk API; memory stays O(chunk_size).
+
+    Records that fail to convert or to apply are reported with their position
+    in the source. When `id_map` is given it is filled with source ID -> new ID.
+    """
+    result = BulkResult()
+    offset = 0
+    for chunk in chunked(read_rows(source, fmt), chunk_size):
+        rows, positions, source_ids = [], [], []
+        for index, record in enumerate(chunk, start=offset):
+            if isinstance(record, UnreadableLine):
+                result.fail(index, record.text, f"Invalid JSON on line {record.line}: {record.error}")
+                continue
+            try:
+                rows.append(convert(record))
+            except (KeyError, TypeError, ValueError) as e:
+                result.fail(index, record, f"Invalid record: {e}")
+                continue
+            positions.append(index)
+            source_ids.append(record.get("id"))
+
+        applied = apply(rows)
+        failed = {index for index, _, _ in applied.failures}
+        for index, row, error in applied.failures:
+            result.fail(positions[index], row, error)
+        for new_id, source_id in zip(applied.ids, (sid for i, sid in enumerate(source_ids) if i not in failed)):
+            if id_map is not None and source_id not in (None, ""):
+                id_map[int(source_id)] = new_id
+            result.ids.append(new_id)
+        offset += len(chunk)
+    return result
+
+
+def resolve(id_map: dict, value) -> int:
+    uuid = int(value)
+    return id_map.get(uuid, uuid) if id_map is not None else uuid
+
+
+def import_members(fms: FitnessManagementSystem, source, fmt: str = "csv", id_map: dict = None,
+                   chunk_size: int = 10_000) -> BulkResult:
+    def convert(record):
+        return (record["name"], int(record["age"]), parse_enum(MEMBERSHIP_TYPE, record["membership_type"]),
+                parse_enum(FITNESS_GOAL, record["fitness_goal"]))
+    return import_rows(source, fmt, convert, fms.register_members, id_map, chunk_size)
+
+
+def import_trainers(fms: FitnessManagementSystem, source, fmt: str = "csv", id_map: dict = None,
+                    chunk_size: int = 10_000) -> BulkResult:
+    def convert(record):
+        return record["name"], parse_enum(SPECIALIZATION, record["specialization"])
+
+    def apply(rows):
+        result = BulkResult()
+        for name, specialization in rows:
+            result.ids.append(fms.add_trainer(name, specialization).ID)
+        return result
+    return import_rows(source, fmt, convert, apply, id_map, chunk_size)
+
+
+def import_classes(fms: FitnessManagementSystem, source, fmt: str = "csv", id_map: dict = None,
+                   chunk_size: int = 10_000) -> BulkResult:
+    """Trainer IDs are resolved through `id_map` (filled by import_trainers) or against the system."""
+    def convert(record):
+        trainer = None
+        if record["trainer_id"] not in (None, ""):
+            trainer = fms.trainers[resolve(id_map, record["trainer_id"])]
+        schedule = record["schedule"]
+        return (record["name"], trainer, int(record["capacity"]),
+                parse_schedule(schedule) if isinstance(schedule, str) else schedule,
+                parse_minutes(record.get("duration_minutes")))
+    return import_rows(source, fmt, convert, fms.schedule_classes, id_map, chunk_size)
+
+
+def import_transactions(fms: FitnessManagementSystem, source, fmt: str = "csv", id_map: dict = None,
+                        chunk_size: int = 10_000) -> BulkResult:
+    """Member IDs are resolved through `id_map` (filled by import_members) or against the system."""
+    def convert(record):
+        member_id = resolve(id_map, record["member_id"])
+        member = fms.members.get(member_id) or fms.transatcions.payers[member_id]
+        return (member, float(record["amount"]), parse_enum(MEMBERSHIP_TYPE, record["membership_type"]),
+                parse_schedule(record["payment_date"]))
+    return import_rows(source, fmt, convert, fms.process_payments, id_map, chunk_size)
@@ -12,6 +12,17 @@ class SystemView:
             if len(res_str) > 0:
                 return res_str
     
+    @staticmethod
+    def get_optional_string(prompt: str):
+        """Prompts for a string that may be left empty."""
+        print(prompt)
+        return input("Input a string or press Enter to skip: ").strip()
+
+    @staticmethod
+    def get_next_page():
+        """Asks whether to show another page; False once the user enters q."""
+        return input("Press Enter for the next page or q to stop: ").strip().lower() != "q"
+
     @staticmethod
     def get_int_input(min_v: int, max_v: int, prompt: str):
         """Prompts the user for an integer input within a specified range."""